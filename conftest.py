@@ -0,0 +1,9 @@
+# Плагины проекта подключаются здесь, чтобы работать для всех тестов
+pytest_plugins = [
+    'plugins.scheduler',
+    'plugins.timing',
+    'plugins.changed',
+    'plugins.perf_history',
+    'plugins.marker_prefilter',
+    'plugins.cases',
+]
@@ -0,0 +1,173 @@
+from selenium.common.exceptions import (NoSuchElementException,
+                                        TimeoutException)
+from selenium.webdriver.common.by import By
+
+from utils.utils import percentile
+
+from .base_page import BasePage
+from .round_trips import action
+
+# Вопрос ассистенту и замер ответа одним async-скриптом внутри iframe.
+# MutationObserver ставится до отправки, так что ни одно изменение
+# текста ответа не пропускается и опрашивать DOM не нужно. Ответ —
+# новое сообщение ассистента (сообщений стало больше, чем до вопроса).
+# Ответ закончен, когда у сообщения aria-busy="false", а если такого
+# атрибута нет — когда текст не меняется idleMs. Времена — миллисекунды
+# от нажатия "отправить"
+_ASK_SCRIPT = """
+const [inputSelector, sendSelector, messageSelector, prompt, timeoutMs,
+       idleMs, done] = arguments;
+const input = document.querySelector(inputSelector);
+const send = document.querySelector(sendSelector);
+if (!input || !send) {
+    done({error: input ? sendSelector : inputSelector});
+    return;
+}
+const before = document.querySelectorAll(messageSelector).length;
+let start = null, first = null, last = null, length = 0, updates = 0;
+let message = null, finished = false, idleTimer = null, timer = null;
+const finish = (reason) => {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    clearTimeout(idleTimer);
+    done({
+        reason,
+        ttft: first === null ? null : first - start,
+        total: last === null ? null : last - start,
+        stream: first === null ? null : last - first,
+        updates,
+        text: message ? message.textContent.trim() : null,
+    });
+};
+const check = () => {
+    const messages = document.querySelectorAll(messageSelector);
+    if (messages.length <= before) return;
+    message = messages[messages.length - 1];
+    const text = message.textContent.trim();
+    if (text.length !== length) {
+        length = text.length;
+        if (length) {
+            last = performance.now();
+            if (first === null) first = last;
+            updates += 1;
+        }
+    }
+    if (!length) return;
+    if (message.hasAttribute('aria-busy')) {
+        if (message.getAttribute('aria-busy') === 'false') finish('done');
+    } else {
+        clearTimeout(idleTimer);
+        idleTimer = setTimeout(() => finish('idle'), idleMs);
+    }
+};
+const observer = new MutationObserver(check);
+observer.observe(document.body, {childList: true, subtree: true,
+                                 characterData: true, attributes: true,
+                                 attributeFilter: ['aria-busy']});
+timer = setTimeout(() => finish('timeout'), timeoutMs);
+const proto = input instanceof HTMLTextAreaElement
+    ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+Object.getOwnPropertyDescriptor(proto, 'value').set.call(input, prompt);
+input.dispatchEvent(new Event('input', {bubbles: true}));
+start = performance.now();
+send.click();
+"""
+
+
+class AssistantPage(BasePage):
+    """
+    Чат ассистента внутри ASSISTANT_IFRAME. Драйвер должен быть уже
+    переключён в iframe (DashboardPage.switch_to_assistant_iframe).
+    """
+
+    # --- Locators (только CSS: по ним ищет скрипт в браузере) ---
+    PROMPT_INPUT = (By.CSS_SELECTOR, 'textarea')
+    SEND_BUTTON = (By.CSS_SELECTOR, 'button[type="submit"]')
+    ASSISTANT_MESSAGES = (By.CSS_SELECTOR, '.message.assistant')
+
+    # Сколько текст ответа не меняется, чтобы считать его законченным,
+    # если ассистент не отмечает конец ответа атрибутом aria-busy
+    IDLE_MS = 1500
+
+    @action
+    def ask(self, prompt, timeout=60):
+        """
+        Отправляет вопрос и ждёт ответ целиком. Возвращает замер:
+        ttft_ms — до первого текста ответа, total_ms — до последнего
+        изменения текста, tokens — слов в ответе, tokens_per_s —
+        скорость потока после первого слова.
+        """
+        self.waiter.ensure_script_timeout(timeout)
+        result = self.driver.execute_async_script(
+            _ASK_SCRIPT, self.PROMPT_INPUT[1], self.SEND_BUTTON[1],
+            self.ASSISTANT_MESSAGES[1], prompt, int(timeout * 1000),
+            self.IDLE_MS)
+        if result.get('error'):
+            raise NoSuchElementException(
+                f"Не найден элемент чата {result['error']}")
+        if result['reason'] == 'timeout':
+            raise TimeoutException(
+                f"Ассистент не ответил на {prompt!r} за {timeout} с")
+        tokens = len((result['text'] or '').split())
+        stream = result['stream'] or 0
+        return {
+            'ttft_ms': round(result['ttft']),
+            'total_ms': round(result['total']),
+            'tokens': tokens,
+            'tokens_per_s': (round((tokens - 1) / (stream / 1000), 1)
+                             if stream > 0 and tokens > 1 else None),
+            'updates': result['updates'],
+        }
+
+
+class AssistantBenchmark:
+    """
+    Повторяет вопросы ассистенту и считает перцентили по каждому.
+    Первые warmup ответов на вопрос в статистику не идут (холодный кеш).
+    """
+
+    METRICS = ('ttft_ms', 'total_ms', 'tokens_per_s')
+    PERCENTILES = (('p50', 50), ('p90', 90), ('p95', 95))
+
+    def __init__(self, page, repeat=5, warmup=1, timeout=60):
+        self.page = page
+        self.repeat = repeat
+        self.warmup = warmup
+        self.timeout = timeout
+        self.samples = {}
+
+    def run(self, prompts):
+        for prompt in prompts:
+            for attempt in range(self.warmup + self.repeat):
+                sample = self.page.ask(prompt, timeout=self.timeout)
+                if attempt >= self.warmup:
+                    self.samples.setdefault(prompt, []).append(sample)
+        return self.summary()
+
+    def summary(self):
+        """{вопрос: {метрика: {'p50': .., 'p90': .., 'p95': .., 'max': ..}}}"""
+        result = {}
+        for prompt, samples in self.samples.items():
+            result[prompt] = {}
+            for metric in self.METRICS:
+                values = sorted(sample[metric] for sample in samples
+                                if sample[metric] is not None)
+                if not values:
+                    continue
+                stats = {name: percentile(values, q)
+                         for name, q in self.PERCENTILES}
+                stats['max'] = values[-1]
+                result[prompt][metric] = stats
+        return result
+
+    def report(self):
+        lines = []
+        for prompt, metrics in self.summary().items():
+            lines.append(f"{prompt[:60]} ({len(self.samples[prompt])} runs)")
+            for metric, stats in metrics.items():
+                values = '  '.join(f"{name}={value}"
+                                   for name, value in stats.items())
+                lines.append(f"  {metric:13} {values}")
+        return '\n'.join(lines)
@@ -0,0 +1,111 @@
+from selenium.common.exceptions import (NoSuchElementException,
+                                        StaleElementReferenceException)
+from selenium.webdriver.common.by import By
+
+from utils.settings import settings
+
+from .round_trips import RoundTrips
+from .waits import Waiter
+
+# Заполнение формы и отправка одним вызовом execute_script. Значение
+# ставится через сеттер value из прототипа, а не el.value = ...:
+# React и похожие фреймворки подменяют сеттер у самого элемента и без
+# этого не заметят изменения. Потом шлются input и change, как при вводе.
+# Возвращает локатор, который не нашёлся, или null
+_FILL_AND_SUBMIT_SCRIPT = """
+const [fields, submit] = arguments;
+const find = ([strategy, selector]) => {
+    if (strategy === 'id') return document.getElementById(selector);
+    if (strategy === 'css selector') return document.querySelector(selector);
+    return document.evaluate(selector, document, null,
+        XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+};
+for (const [locator, value] of fields) {
+    const el = find(locator);
+    if (!el) return locator;
+    const proto = el instanceof HTMLTextAreaElement
+        ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+    Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+}
+if (submit) {
+    const button = find(submit);
+    if (!button) return submit;
+    // click(), а не form.submit(): так проходит проверка полей формы
+    // и срабатывают обработчики приложения
+    button.click();
+}
+return null;
+"""
+
+_JS_STRATEGIES = {By.ID, By.CSS_SELECTOR, By.XPATH}
+
+
+class BasePage:
+    """Общая часть всех page objects."""
+
+    TIMEOUT = 10
+
+    def __init__(self, driver, metrics=None, action_mode=None):
+        self.driver = driver
+        # PageMetrics теста; без него страницы ничего не замеряют
+        self.metrics = metrics
+        # native — настоящий ввод с клавиатуры и клики через WebDriver,
+        # batch — формы заполняются одним скриптом (UI_ACTION_MODE)
+        self.action_mode = action_mode or settings.ui_action_mode
+        self.round_trips = RoundTrips.install(driver)
+        self.waiter = Waiter(self.driver, self.TIMEOUT)
+        self._elements = {}
+
+    # --- Elements ---
+
+    def find(self, locator):
+        """Элемент по локатору; найденный раз элемент переиспользуется."""
+        element = self._elements.get(locator)
+        if element is None:
+            element = self.driver.find_element(*locator)
+            self._elements[locator] = element
+        return element
+
+    def forget_elements(self):
+        """Сбрасывает найденные элементы (после перехода на другую страницу)."""
+        self._elements.clear()
+
+    def type_into(self, locator, text):
+        self._on_element(locator, lambda element: element.send_keys(text))
+
+    def click(self, locator):
+        self._on_element(locator, lambda element: element.click())
+
+    def fill_and_submit(self, fields, submit=None):
+        """
+        Заполняет поля [(локатор, значение)] и нажимает submit одним
+        вызовом execute_script. Настоящих событий клавиатуры нет — для
+        тестов, которым они нужны, есть режим native.
+        """
+        locators = [locator for locator, _ in fields]
+        if submit:
+            locators.append(submit)
+        if any(strategy not in _JS_STRATEGIES for strategy, _ in locators):
+            for locator, value in fields:
+                self.type_into(locator, value)
+            if submit:
+                self.click(submit)
+            return
+        missing = self.driver.execute_script(
+            _FILL_AND_SUBMIT_SCRIPT,
+            [[list(locator), value] for locator, value in fields],
+            list(submit) if submit else None)
+        if missing:
+            raise NoSuchElementException(f"Не найден элемент {missing}")
+
+    # --- Helpers ---
+
+    def _on_element(self, locator, do):
+        try:
+            return do(self.find(locator))
+        except StaleElementReferenceException:
+            # Страница перерисовала элемент: ищем заново один раз
+            self._elements.pop(locator, None)
+            return do(self.find(locator))
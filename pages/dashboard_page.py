@@ -1,9 +1,10 @@
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 
+from .base_page import BasePage
+from .round_trips import action
 
-class DashboardPage:
+
+class DashboardPage(BasePage):
 
     # --- Locators ---
     ASSISTANT_IFRAME = (
@@ -12,25 +13,25 @@ class DashboardPage:
         By.XPATH, "//*[normalize-space()='QA Testing Assistant']")
 
     # --- Actions ---
-    def __init__(self, driver):
-        self.driver = driver
-        # Создаем объект ожидания прямо здесь для удобства
-        self.wait = WebDriverWait(self.driver, 10)
-
+    @action
     def switch_to_assistant_iframe(self):
         """Ожидает iframe и переключается на него."""
-        self.wait.until(
-            EC.frame_to_be_available_and_switch_to_it(self.ASSISTANT_IFRAME)
-        )
+        self.waiter.frame_and_switch(self.ASSISTANT_IFRAME)
 
+    @action
     def get_assistant_header(self):
         """Ожидает и возвращает элемент заголовка ассистента."""
-        return self.wait.until(
-            EC.visibility_of_element_located(self.ASSISTANT_HEADER)
-        )
+        header = self.waiter.visible(self.ASSISTANT_HEADER)
+        if self.metrics:
+            # От нажатия "Войти" (или логина токеном) до видимого ассистента
+            self.metrics.measure('time_to_assistant', since='login',
+                                 page='dashboard')
+        return header
 
+    @action
     def wait_for_url_contain(self, text):
         '''Проверяет содержит ли адрес текст'''
-        return self.wait.until(
-            EC.url_contains(text)
-        )
+        result = self.waiter.url_contains(text)
+        if self.metrics:
+            self.metrics.visit('dashboard')
+        return result
@@ -1,41 +1,114 @@
+import json
+
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
 
+from utils.settings import setting
+
+from .base_page import BasePage
+from .round_trips import action
+
+
+class LoginPage(BasePage):
+    BASE_URL = setting('ui_base_url')
+    DASHBOARD_URL = setting('ui_dashboard_url')
+    # Куда фронтенд кладёт токен после логина
+    AUTH_STORAGE_KEY = setting('ui_auth_storage_key')
+    AUTH_COOKIE_NAME = setting('ui_auth_cookie_name')
 
-class LoginPage:
     # -- All lockators --
     email_input = (By.ID, 'email')
     password_input = (By.ID, 'password')
     login_button = (By.CSS_SELECTOR, 'button[type="submit"]')
     error_message = (By.XPATH, '//*[contains(., "Invalid email or password")]')
 
-    def __init__(self, driver):
-        self.driver = driver
-        self.wait = WebDriverWait(self.driver, 10)
-
     # Open page
 
+    @action
     def open(self):
-        self.driver.get('https://app.aifromspace.com/')
+        self.driver.get(self.BASE_URL)
+        self.forget_elements()
+        if self.metrics:
+            self.metrics.visit('login')
 
+    @action
     def enter_email(self, email):
-        self.driver.find_element(*self.email_input).send_keys(email)
+        self.type_into(self.email_input, email)
 
+    @action
     def enter_password(self, password):
-        self.driver.find_element(*self.password_input).send_keys(password)
+        self.type_into(self.password_input, password)
 
+    @action
     def click_login_button(self):
-        self.driver.find_element(*self.login_button).click()
+        self.find(self.login_button)
+        self._before_submit()
+        self.click(self.login_button)
 
-    def login(self, email, password):
+    @action
+    def login(self, email, password, mode=None):
+        """
+        mode=native (по умолчанию, UI_ACTION_MODE) — посимвольный ввод
+        и клик через WebDriver, с настоящими событиями фокуса и клика;
+        batch — форма заполняется и отправляется одним скриптом, когда
+        вход лишь подготовка к тесту, а не то, что он проверяет.
+        """
+        if (mode or self.action_mode) == 'batch':
+            self._before_submit()
+            self.fill_and_submit(
+                [(self.email_input, email), (self.password_input, password)],
+                submit=self.login_button)
+            return
         self.enter_email(email)
         self.enter_password(password)
         self.click_login_button()
 
+    @action
+    def login_with_token(self, token):
+        """
+        Логин без формы: токен, полученный через API, кладётся в браузер
+        до загрузки приложения, и сразу открывается дашборд.
+        Подходит для тестов, которым нужен залогиненный пользователь,
+        а не сама форма входа.
+        """
+        origin = self.BASE_URL.rstrip('/')
+        if self.metrics:
+            self.metrics.mark('login')
+        if self.AUTH_COOKIE_NAME:
+            self.driver.execute_cdp_cmd('Network.setCookie', {
+                'name': self.AUTH_COOKIE_NAME,
+                'value': token,
+                'url': origin,
+            })
+        # Скрипт выполнится до кода приложения, поэтому оно стартует
+        # уже авторизованным, без лишней загрузки страницы логина
+        script = self.driver.execute_cdp_cmd(
+            'Page.addScriptToEvaluateOnNewDocument', {
+                'source': (
+                    f'if (location.origin === {json.dumps(origin)}) {{'
+                    f'localStorage.setItem('
+                    f'{json.dumps(self.AUTH_STORAGE_KEY)}, '
+                    f'{json.dumps(token)});}}'
+                ),
+            })
+        try:
+            self.driver.get(self.DASHBOARD_URL)
+            self.forget_elements()
+            if self.metrics:
+                self.metrics.visit('dashboard')
+        finally:
+            self.driver.execute_cdp_cmd(
+                'Page.removeScriptToEvaluateOnNewDocument',
+                {'identifier': script['identifier']})
+
+    @action
     def get_error_message(self, error_text):
-        return self.wait.until(
-            EC.visibility_of_element_located(
-                (By.XPATH, f'//*[contains(., "{error_text}")]')
-            ))
-        pass
+        return self.waiter.visible(
+            (By.XPATH, f'//*[contains(., "{error_text}")]'))
+
+    # --- Helpers ---
+
+    def _before_submit(self):
+        if self.metrics:
+            # Метрики страницы логина — до того, как она сменится
+            self.metrics.collect('login')
+            self.metrics.mark('login')
@@ -0,0 +1,152 @@
+import time
+
+from selenium.common.exceptions import WebDriverException
+
+# Все метрики страницы одним async-скриптом: Navigation Timing, Paint
+# Timing, Resource Timing и LCP. LCP доступен только через
+# PerformanceObserver, буферизованные записи приходят асинхронно,
+# поэтому скрипт ждёт один такт и забирает то, что не успело прийти.
+# Времена — миллисекунды от начала навигации документа
+_METRICS_SCRIPT = """
+const [top, done] = arguments;
+const ms = (value) => value > 0 ? Math.round(value) : null;
+const result = {url: location.href};
+const [nav] = performance.getEntriesByType('navigation');
+if (nav) {
+    result.ttfb = ms(nav.responseStart);
+    result.dom_content_loaded = ms(nav.domContentLoadedEventEnd);
+    result.load = ms(nav.loadEventEnd);
+    result.document_bytes = nav.transferSize || 0;
+}
+for (const paint of performance.getEntriesByType('paint')) {
+    result[paint.name.replace(/-/g, '_')] = ms(paint.startTime);
+}
+const resources = performance.getEntriesByType('resource');
+result.resources = resources.length;
+result.resource_bytes = resources.reduce(
+    (sum, entry) => sum + (entry.transferSize || 0), 0);
+result.slowest_resources = resources.slice()
+    .sort((a, b) => b.duration - a.duration).slice(0, top)
+    .map((entry) => [entry.name, Math.round(entry.duration)]);
+
+const types = PerformanceObserver.supportedEntryTypes || [];
+if (!types.includes('largest-contentful-paint')) {
+    done(result);
+} else {
+    let lcp = null;
+    const take = (entries) => {
+        for (const entry of entries) lcp = ms(entry.startTime);
+    };
+    const observer = new PerformanceObserver((list) => take(list.getEntries()));
+    observer.observe({type: 'largest-contentful-paint', buffered: true});
+    setTimeout(() => {
+        take(observer.takeRecords());
+        observer.disconnect();
+        result.lcp = lcp;
+        done(result);
+    }, 0);
+}
+"""
+
+
+class PageMetrics:
+    """
+    Метрики производительности страниц за один тест.
+
+    Page objects сообщают, на какой странице они сейчас (visit), и
+    снимают метрики документа перед уходом с него (collect) — один
+    вызов execute_async_script на страницу. Свои метрики считаются по
+    часам теста: mark() запоминает момент, measure() пишет время от него.
+
+        metrics.pages == {'login': {'ttfb': 120, 'lcp': 480, ...},
+                          'dashboard': {..., 'time_to_assistant': 2300}}
+    """
+
+    SLOWEST_RESOURCES = 5
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = {}
+        self.current = None
+        self._marks = {}
+
+    def visit(self, page):
+        self.current = page
+
+    def collect(self, page=None):
+        """Снимает метрики текущего документа, если ещё не сняты."""
+        page = page or self.current
+        if page is None or 'url' in self.pages.get(page, {}):
+            return
+        try:
+            values = self.driver.execute_async_script(
+                _METRICS_SCRIPT, self.SLOWEST_RESOURCES)
+        except WebDriverException:
+            # Документ ушёл во время замера — метрики страницы теряем,
+            # но тест из-за этого не падает
+            return
+        self.pages.setdefault(page, {}).update(values or {})
+
+    def mark(self, name):
+        self._marks[name] = time.perf_counter()
+
+    def measure(self, name, since, page=None):
+        """Записывает миллисекунды от mark(since) до сейчас."""
+        if since not in self._marks:
+            return None
+        value = round((time.perf_counter() - self._marks[since]) * 1000)
+        self.pages.setdefault(page or self.current, {})[name] = value
+        return value
+
+    def add(self, page, **values):
+        """Свои метрики страницы (например, перцентили бенчмарка)."""
+        self.pages.setdefault(page, {}).update(values)
+
+    def finish(self):
+        """Снимает метрики последней страницы теста."""
+        if self.current is None:
+            return
+        try:
+            # Тест мог закончиться внутри iframe ассистента
+            self.driver.switch_to.default_content()
+        except WebDriverException:
+            return
+        self.collect()
+
+    def over_budget(self, budgets):
+        """
+        Нарушения бюджетов {метрика: мс}. Метрика вида 'dashboard.lcp'
+        относится к одной странице, просто 'lcp' — ко всем страницам,
+        где она есть. Метрика, которую не удалось измерить ни на одной
+        странице, тоже считается нарушением.
+        """
+        violations = []
+        for metric, limit in budgets.items():
+            page, _, name = metric.rpartition('.')
+            pages = [page] if page else list(self.pages)
+            measured = [(p, self.pages.get(p, {}).get(name)) for p in pages]
+            measured = [(p, value) for p, value in measured
+                        if value is not None]
+            if not measured:
+                violations.append(f"{metric}: не измерено (бюджет {limit} мс)")
+            for p, value in measured:
+                if value > limit:
+                    violations.append(
+                        f"{p}.{name}: {value} мс > бюджета {limit} мс")
+        return violations
+
+    def summary(self):
+        lines = []
+        for page, values in self.pages.items():
+            numbers = ', '.join(
+                f"{name}={value}" for name, value in values.items()
+                if isinstance(value, (int, float)) and name != 'resources'
+                and not name.endswith('_bytes'))
+            lines.append(f"{page}: {numbers}")
+            if 'resources' in values:
+                lines.append(
+                    f"  {values['resources']} resources, "
+                    f"{values.get('resource_bytes', 0) / 1024:.0f} KiB")
+            for url, duration in values.get('slowest_resources', []):
+                lines.append(f"  {duration:6d} ms  {url}")
+        return '\n'.join(lines)
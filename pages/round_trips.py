@@ -0,0 +1,80 @@
+import functools
+from collections import defaultdict
+
+
+class RoundTripStats:
+    """Сколько команд WebDriver ушло на каждое действие page objects."""
+
+    def __init__(self):
+        self.counts = defaultdict(list)
+
+    def record(self, action, commands):
+        self.counts[action].append(commands)
+
+    def summary(self, top=10):
+        """[(действие, вызовов, команд всего, команд за вызов)]."""
+        rows = [(action, len(values), sum(values), sum(values) / len(values))
+                for action, values in self.counts.items()]
+        return sorted(rows, key=lambda row: row[2], reverse=True)[:top]
+
+    def clear(self):
+        self.counts.clear()
+
+
+ROUND_TRIP_STATS = RoundTripStats()
+
+
+class RoundTrips:
+    """
+    Счётчик команд WebDriver (HTTP-запросов к chromedriver) одного
+    браузера. Ставится на driver.execute, через который проходят все
+    команды Selenium, в том числе find_element, click и execute_script.
+    """
+
+    def __init__(self, execute, stats=ROUND_TRIP_STATS):
+        self._execute = execute
+        self.stats = stats
+        self.total = 0
+        # Последнее число команд по каждому действию
+        self.last = {}
+        self._active = []
+
+    @classmethod
+    def install(cls, driver):
+        """Счётчик браузера; ставится один раз на драйвер."""
+        counter = getattr(driver, '_round_trips', None)
+        if not isinstance(counter, cls):
+            counter = cls(driver.execute)
+            driver.execute = counter.execute
+            driver._round_trips = counter
+        return counter
+
+    def execute(self, command, params=None):
+        self.total += 1
+        for frame in self._active:
+            frame[1] += 1
+        return self._execute(command, params)
+
+    def start(self, action):
+        self._active.append([action, 0])
+
+    def stop(self):
+        action, commands = self._active.pop()
+        self.last[action] = commands
+        if self.stats is not None:
+            self.stats.record(action, commands)
+        return commands
+
+
+def action(method):
+    """Считает команды WebDriver, которые ушли на метод page object."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        counter = self.round_trips
+        counter.start(f"{type(self).__name__}.{method.__name__}")
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            counter.stop()
+    return wrapper
@@ -0,0 +1,183 @@
+import time
+from collections import defaultdict
+
+from selenium.common.exceptions import (JavascriptException, TimeoutException,
+                                        WebDriverException)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from utils.settings import settings
+
+# Интервал опроса WebDriverWait (по умолчанию в Selenium 0.5 с) задаёт
+# UI_WAIT_POLL, режим ожиданий — UI_WAIT_MODE: js — ждать внутри
+# браузера одним вызовом, webdriver — обычный опрос
+
+# Ожидание внутри страницы: сначала проверяем условие сразу, потом
+# на каждое изменение DOM (MutationObserver) и по таймеру — для условий,
+# которые меняются без мутаций (URL в SPA, CSS-анимации)
+_WAIT_SCRIPT = """
+const [kind, strategy, selector, timeoutMs, done] = arguments;
+const find = () => {
+    if (strategy === 'id') return document.getElementById(selector);
+    if (strategy === 'css selector') return document.querySelector(selector);
+    return document.evaluate(selector, document, null,
+        XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+};
+const visible = (el) => el.checkVisibility
+    ? el.checkVisibility({checkOpacity: true, checkVisibilityCSS: true})
+    : el.getClientRects().length > 0;
+const check = () => {
+    if (kind === 'url') return location.href.includes(selector) ? true : null;
+    const el = find();
+    if (!el) return null;
+    return kind === 'present' || visible(el) ? el : null;
+};
+let finished = false;
+let observer = null;
+let timer = null;
+let ticker = null;
+const finish = (value) => {
+    if (finished) return;
+    finished = true;
+    if (observer) observer.disconnect();
+    clearTimeout(timer);
+    clearInterval(ticker);
+    done(value);
+};
+const probe = () => {
+    try {
+        const value = check();
+        if (value !== null) finish(value);
+    } catch (e) {}
+};
+probe();
+if (!finished) {
+    observer = new MutationObserver(probe);
+    observer.observe(document, {childList: true, subtree: true,
+                                attributes: true, characterData: true});
+    ticker = setInterval(probe, 50);
+    timer = setTimeout(() => finish(null), timeoutMs);
+}
+"""
+
+_JS_STRATEGIES = {By.ID, By.CSS_SELECTOR, By.XPATH}
+
+
+class WaitStats:
+    """Время, потраченное на ожидания, по каждому локатору."""
+
+    def __init__(self):
+        self.durations = defaultdict(list)
+
+    def record(self, key, seconds):
+        self.durations[key].append(seconds)
+
+    def summary(self, top=10):
+        """[(ключ, вызовов, всего сек., максимум сек.)] по убыванию суммы."""
+        rows = [(key, len(values), sum(values), max(values))
+                for key, values in self.durations.items()]
+        return sorted(rows, key=lambda row: row[2], reverse=True)[:top]
+
+    def clear(self):
+        self.durations.clear()
+
+
+WAIT_STATS = WaitStats()
+
+
+class Waiter:
+    """
+    Ожидания для page objects.
+
+    В режиме js условие проверяется в браузере одним async-скриптом,
+    который возвращается сразу, как только условие выполнилось. Если
+    скрипт выполнить нельзя (например, страница перезагрузилась во время
+    ожидания), ожидание продолжается обычным опросом WebDriverWait.
+    """
+
+    def __init__(self, driver, timeout=10, poll_interval=None, mode=None,
+                 stats=WAIT_STATS):
+        self.driver = driver
+        self.timeout = timeout
+        self.poll_interval = poll_interval or settings.ui_wait_poll
+        self.mode = mode or settings.ui_wait_mode
+        self.stats = stats
+
+    def visible(self, locator):
+        """Ждёт и возвращает видимый элемент."""
+        return self._wait('visible', locator,
+                          EC.visibility_of_element_located(locator))
+
+    def present(self, locator):
+        """Ждёт и возвращает элемент, который есть в DOM."""
+        return self._wait('present', locator,
+                          EC.presence_of_element_located(locator))
+
+    def url_contains(self, text):
+        return self._wait('url', ('url', text), EC.url_contains(text))
+
+    def frame_and_switch(self, locator):
+        """Ждёт iframe и переключается на него."""
+        start = time.perf_counter()
+        try:
+            if self.mode == 'js' and locator[0] in _JS_STRATEGIES:
+                frame = self._js_wait('present', locator, self.timeout)
+                if frame is not None:
+                    self.driver.switch_to.frame(frame)
+                    return True
+            return self._webdriver_wait(
+                EC.frame_to_be_available_and_switch_to_it(locator),
+                self._remaining(start), locator)
+        finally:
+            self._record('frame', locator, start)
+
+    def ensure_script_timeout(self, timeout):
+        """Таймаут async-скриптов не меньше timeout + 1 с."""
+        # Ставится один раз на драйвер, чтобы не тратить на него лишний
+        # запрос в каждом ожидании
+        wanted = timeout + 1
+        if getattr(self.driver, '_waits_script_timeout', None) != wanted:
+            self.driver.set_script_timeout(wanted)
+            self.driver._waits_script_timeout = wanted
+
+    # --- Helpers ---
+
+    def _wait(self, kind, locator, condition):
+        start = time.perf_counter()
+        try:
+            if self.mode == 'js' and locator[0] in _JS_STRATEGIES | {'url'}:
+                result = self._js_wait(kind, locator, self.timeout)
+                if result is not None:
+                    return result
+            return self._webdriver_wait(condition, self._remaining(start),
+                                        locator)
+        finally:
+            self._record(kind, locator, start)
+
+    def _js_wait(self, kind, locator, timeout):
+        strategy, selector = locator
+        self.ensure_script_timeout(timeout)
+        try:
+            return self.driver.execute_async_script(
+                _WAIT_SCRIPT, kind, strategy, selector, int(timeout * 1000))
+        except (JavascriptException, TimeoutException):
+            return None
+        except WebDriverException as error:
+            # Страница ушла на другой документ во время ожидания
+            if 'unload' in str(error) or 'navigat' in str(error):
+                return None
+            raise
+
+    def _webdriver_wait(self, condition, timeout, locator):
+        return WebDriverWait(
+            self.driver, max(timeout, 0), poll_frequency=self.poll_interval
+        ).until(condition, f"Не дождались {locator} за {self.timeout} с")
+
+    def _remaining(self, start):
+        return self.timeout - (time.perf_counter() - start)
+
+    def _record(self, kind, locator, start):
+        if self.stats is not None:
+            self.stats.record(f"{kind} {locator[0]}={locator[1]}",
+                              time.perf_counter() - start)
@@ -0,0 +1,210 @@
+"""
+Параметризация тестов из файлов с кейсами (CSV и JSON lines).
+
+    @pytest.mark.cases('cases/emails.csv', id_field='email',
+                       types={'expected': bool})
+    def test_is_email_valid(case):
+        assert is_email_valid(case.email) == case.expected
+
+Путь считается от папки тестового модуля и может быть шаблоном
+('cases/emails*.csv') — тогда кейсы берутся из всех подходящих файлов
+по порядку. Одна строка файла — один кейс и один отчёт pytest; у CSV
+первая строка — заголовок.
+
+При сборе файл читается потоком: от каждой строки в памяти остаются
+только смещение в файле и id теста, сами данные читаются перед запуском
+теста и отпускаются после него. Так можно гонять корпуса в сотни тысяч
+кейсов без того, чтобы держать их в памяти.
+
+`--case-shard=K/N` оставляет каждый N-й кейс начиная с K-го (K от 1):
+разбиение зависит только от порядка строк, поэтому N CI-задач с разными
+K вместе проходят каждый кейс ровно один раз. Внутри одной задачи кейсы
+раздаёт по воркерам xdist как обычно.
+"""
+import csv
+import glob
+import json
+import os
+
+import pytest
+
+_TRUE = {'1', 'true', 'yes', 'y', 'да'}
+_FALSE = {'0', 'false', 'no', 'n', 'нет', ''}
+ID_LENGTH = 40
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('cases')
+    group.addoption(
+        '--case-shard', metavar='K/N', default=None,
+        help='запускать только K-ю из N долей кейсов из файлов')
+
+
+def pytest_configure(config):
+    shard = config.getoption('case_shard')
+    if shard:
+        # Ошибка в опции — сразу, а не при сборе первого модуля
+        parse_shard(shard)
+
+
+def parse_shard(value):
+    """'2/4' -> (1, 4): индекс доли с нуля и число долей."""
+    try:
+        index, total = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise pytest.UsageError(f"--case-shard ожидает K/N, а не {value!r}")
+    if not 1 <= index <= total:
+        raise pytest.UsageError(f"--case-shard: K должно быть от 1 до N, "
+                                f"получено {value}")
+    return index - 1, total
+
+
+def _to_bool(value):
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
+        return False
+    raise ValueError(f"Не похоже на bool: {value!r}")
+
+
+class CaseFile:
+    """Файл с кейсами: формат, заголовок CSV и приведение типов."""
+
+    def __init__(self, path, types=None):
+        self.path = path
+        self.name = os.path.splitext(os.path.basename(path))[0]
+        self.format = 'jsonl' if path.endswith('.jsonl') else 'csv'
+        self.types = {field: _to_bool if cast is bool else cast
+                      for field, cast in (types or {}).items()}
+        self.fields = None
+
+    def scan(self):
+        """Идёт по файлу и отдаёт (номер строки, смещение, строка)."""
+        with open(self.path, 'rb') as f:
+            lineno = 0
+            while True:
+                offset = f.tell()
+                raw = f.readline()
+                if not raw:
+                    return
+                lineno += 1
+                line = raw.decode('utf-8-sig' if offset == 0 else 'utf-8')
+                if not line.strip() or line.lstrip().startswith('#'):
+                    continue
+                if self.format == 'csv' and self.fields is None:
+                    self.fields = next(csv.reader([line]))
+                    continue
+                yield lineno, offset, line
+
+    def parse(self, line):
+        if self.format == 'jsonl':
+            data = json.loads(line)
+        else:
+            data = dict(zip(self.fields, next(csv.reader([line]))))
+        for field, cast in self.types.items():
+            if field in data:
+                data[field] = cast(data[field])
+        return data
+
+    def read(self, offset):
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            return self.parse(f.readline().decode('utf-8-sig'))
+
+
+class Case:
+    """
+    Кейс из файла. Поля доступны как case.email или case['email'] и
+    читаются из файла при первом обращении.
+    """
+    __slots__ = ('file', 'line', 'offset', '_data')
+
+    def __init__(self, file, line, offset):
+        self.file = file
+        self.line = line
+        self.offset = offset
+        self._data = None
+
+    @property
+    def data(self):
+        if self._data is None:
+            self._data = self.file.read(self.offset)
+        return self._data
+
+    def release(self):
+        self._data = None
+
+    def __getitem__(self, name):
+        return self.data[name]
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            # Служебные атрибуты спрашивают pytest и отладчик — из-за
+            # них файл читать не нужно
+            raise AttributeError(name)
+        try:
+            return self.data[name]
+        except KeyError:
+            raise AttributeError(
+                f"В кейсе {self!r} нет поля {name!r}") from None
+
+    def __repr__(self):
+        return f"<Case {self.file.path}:{self.line}>"
+
+
+def _case_id(file, line, text, id_field):
+    if id_field is None:
+        return f"{file.name}:{line}"
+    value = str(file.parse(text).get(id_field, line))
+    if len(value) > ID_LENGTH:
+        value = value[:ID_LENGTH - 3] + '...'
+    return value
+
+
+def iter_cases(paths, id_field=None, types=None, shard=None):
+    """(Case, id) по всем файлам; shard — (индекс, всего) или None."""
+    number = -1
+    for path in paths:
+        file = CaseFile(path, types)
+        for line, offset, text in file.scan():
+            number += 1
+            if shard and number % shard[1] != shard[0]:
+                continue
+            yield Case(file, line, offset), _case_id(file, line, text,
+                                                     id_field)
+
+
+def pytest_generate_tests(metafunc):
+    marker = metafunc.definition.get_closest_marker('cases')
+    if marker is None:
+        return
+    if 'case' not in metafunc.fixturenames:
+        raise pytest.UsageError(
+            f"{metafunc.definition.nodeid}: маркер cases передаёт данные "
+            f"через аргумент case")
+    pattern = os.path.join(os.path.dirname(str(metafunc.definition.path)),
+                           marker.args[0])
+    paths = sorted(glob.glob(pattern))
+    if not paths:
+        raise pytest.UsageError(f"Нет файлов с кейсами: {pattern}")
+    shard = metafunc.config.getoption('case_shard')
+    cases, ids = [], []
+    for case, case_id in iter_cases(
+            paths, id_field=marker.kwargs.get('id_field'),
+            types=marker.kwargs.get('types'),
+            shard=parse_shard(shard) if shard else None):
+        cases.append(case)
+        ids.append(case_id)
+    # Пустая доля — обычный случай при шардировании маленьких файлов
+    metafunc.parametrize('case', cases, ids=ids)
+
+
+def pytest_runtest_teardown(item):
+    callspec = getattr(item, 'callspec', None)
+    case = callspec.params.get('case') if callspec else None
+    if isinstance(case, Case):
+        # Данные кейса больше не нужны: в памяти остаётся только смещение
+        case.release()
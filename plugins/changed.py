@@ -0,0 +1,242 @@
+"""
+Запуск только тех тестов, на которые могли повлиять изменения.
+
+Для каждого тестового модуля строится замыкание его зависимостей внутри
+проекта: импорты (в том числе относительные и `pytest_plugins`),
+conftest.py по пути к тесту, __init__.py пакетов и файлы данных рядом
+с модулями (например, bot_rules.json). От содержимого всех этих файлов
+и pytest.ini считается хеш. Прошедший тест запоминается в .pytest_cache
+вместе с хешем, и при `pytest --changed-only` тесты, у которых хеш не
+изменился с последнего успешного прогона, не запускаются:
+
+    pytest -m unit --changed-only
+
+Тесты с маркерами из ini-опции `changed_external` (по умолчанию
+api, telega и ui) зависят не только от кода, поэтому их можно
+принудительно прогнать флагом `--changed-external`.
+"""
+import ast
+import hashlib
+import os
+
+import pytest
+
+PASSED_KEY = 'changed/passed'
+# Файлы данных, которые модули читают с диска
+DATA_SUFFIXES = ('.json', '.jsonl', '.csv', '.html')
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('changed')
+    group.addoption(
+        '--changed-only', action='store_true', default=False,
+        help='не запускать тесты, чьи зависимости не менялись '
+             'с последнего успешного прогона')
+    group.addoption(
+        '--changed-external', action='store_true', default=False,
+        help='вместе с --changed-only всегда запускать тесты '
+             'внешних систем (маркеры из changed_external)')
+    parser.addini(
+        'changed_external', type='args', default=['api', 'telega', 'ui'],
+        help='маркеры тестов, которые ходят во внешние системы')
+
+
+class DependencyGraph:
+    """Граф импортов между файлами проекта с хешами их содержимого."""
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self._deps = {}
+        self._hashes = {}
+        self._fingerprints = {}
+
+    def closure(self, path):
+        """Все файлы проекта, от которых зависит модуль path."""
+        path = os.path.abspath(path)
+        seen = set()
+        stack = [path] + self._conftests(path)
+        while stack:
+            current = stack.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            stack.extend(self._dependencies(current))
+        return seen
+
+    def fingerprint(self, path, extra=()):
+        """Хеш содержимого замыкания модуля (и файлов extra)."""
+        path = os.path.abspath(path)
+        if path not in self._fingerprints:
+            digest = hashlib.sha1()
+            for dep in sorted(self.closure(path) | set(extra)):
+                digest.update(os.path.relpath(dep, self.root).encode())
+                digest.update(self._hash(dep).encode())
+            self._fingerprints[path] = digest.hexdigest()
+        return self._fingerprints[path]
+
+    # --- Helpers ---
+
+    def _hash(self, path):
+        if path not in self._hashes:
+            try:
+                with open(path, 'rb') as f:
+                    self._hashes[path] = hashlib.sha1(f.read()).hexdigest()
+            except OSError:
+                self._hashes[path] = 'missing'
+        return self._hashes[path]
+
+    def _conftests(self, path):
+        found = []
+        directory = os.path.dirname(path)
+        while directory.startswith(self.root):
+            conftest = os.path.join(directory, 'conftest.py')
+            if os.path.isfile(conftest):
+                found.append(conftest)
+            if directory == self.root:
+                break
+            directory = os.path.dirname(directory)
+        return found
+
+    def _dependencies(self, path):
+        if path in self._deps:
+            return self._deps[path]
+        deps = set()
+        if path.endswith('.py'):
+            # В корне лежат отчёты прогонов, их данными не считаем
+            if os.path.dirname(path) != self.root:
+                deps.update(self._data_files(os.path.dirname(path)))
+            # Файлы кейсов маркера cases (plugins/cases.py)
+            deps.update(self._data_files(
+                os.path.join(os.path.dirname(path), 'cases')))
+            try:
+                with open(path, 'rb') as f:
+                    tree = ast.parse(f.read(), filename=path)
+            except (OSError, SyntaxError, ValueError):
+                tree = None
+            if tree is not None:
+                for module in self._imported_modules(tree, path):
+                    deps.update(self._resolve(module))
+        deps.discard(path)
+        self._deps[path] = deps
+        return deps
+
+    def _imported_modules(self, tree, path):
+        package = os.path.relpath(os.path.dirname(path), self.root)
+        package = [] if package == '.' else package.split(os.sep)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    yield alias.name
+            elif isinstance(node, ast.ImportFrom):
+                if node.level:
+                    base = package[:len(package) - node.level + 1]
+                    parts = base + (node.module.split('.')
+                                    if node.module else [])
+                else:
+                    parts = node.module.split('.')
+                module = '.'.join(parts)
+                if module:
+                    yield module
+                # from pkg import submodule
+                for alias in node.names:
+                    yield '.'.join(parts + [alias.name])
+            elif isinstance(node, ast.Assign) and any(
+                    isinstance(t, ast.Name) and t.id == 'pytest_plugins'
+                    for t in node.targets):
+                if isinstance(node.value, (ast.List, ast.Tuple)):
+                    for element in node.value.elts:
+                        if isinstance(element, ast.Constant):
+                            yield element.value
+
+    def _resolve(self, module):
+        """Файлы проекта для модуля и его пакетов; чужие модули — пусто."""
+        files = []
+        parts = module.split('.')
+        for i in range(1, len(parts) + 1):
+            base = os.path.join(self.root, *parts[:i])
+            for candidate in (base + '.py',
+                              os.path.join(base, '__init__.py')):
+                if os.path.isfile(candidate):
+                    files.append(candidate)
+        return files
+
+    def _data_files(self, directory):
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return []
+        return [os.path.join(directory, name) for name in names
+                if name.endswith(DATA_SUFFIXES)]
+
+
+class ChangedSelector:
+
+    def __init__(self, config):
+        self.config = config
+        self.graph = DependencyGraph(str(config.rootpath))
+        self.extra = [str(config.inipath)] if config.inipath else []
+        self.results = {}
+        self.deselected = 0
+
+    def fingerprint(self, nodeid):
+        path = os.path.join(str(self.config.rootpath),
+                            nodeid.split('::')[0])
+        return self.graph.fingerprint(path, self.extra)
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, config, items):
+        if not config.getoption('changed_only'):
+            return
+        passed = config.cache.get(PASSED_KEY, {})
+        external = set(config.getini('changed_external'))
+        force_external = config.getoption('changed_external')
+        selected, deselected = [], []
+        for item in items:
+            names = {mark.name for mark in item.iter_markers()}
+            if force_external and names & external:
+                selected.append(item)
+            elif passed.get(item.nodeid) == self.fingerprint(item.nodeid):
+                deselected.append(item)
+            else:
+                selected.append(item)
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+        self.deselected = len(deselected)
+
+    def pytest_runtest_logreport(self, report):
+        # Под xdist отчёты приходят и на контроллер, записывает только он
+        if hasattr(self.config, 'workerinput'):
+            return
+        if report.failed:
+            self.results[report.nodeid] = None
+        elif report.when == 'call' and report.passed:
+            self.results.setdefault(report.nodeid,
+                                    self.fingerprint(report.nodeid))
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        # Всё уже проверено — это успех, а не "тесты не найдены"
+        if (self.deselected
+                and exitstatus == pytest.ExitCode.NO_TESTS_COLLECTED):
+            session.exitstatus = pytest.ExitCode.OK
+        if hasattr(self.config, 'workerinput') or not self.results:
+            return
+        passed = self.config.cache.get(PASSED_KEY, {})
+        for nodeid, fingerprint in self.results.items():
+            if fingerprint is None:
+                passed.pop(nodeid, None)
+            else:
+                passed[nodeid] = fingerprint
+        self.config.cache.set(PASSED_KEY, passed)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.deselected:
+            terminalreporter.write_line(
+                f"changed-only: {self.deselected} tests unchanged since "
+                f"their last pass were not run")
+
+
+def pytest_configure(config):
+    if getattr(config, 'cache', None) is not None:
+        config.pluginmanager.register(ChangedSelector(config),
+                                      'changed-selector')
@@ -0,0 +1,208 @@
+"""
+Отбор тестовых модулей по `-m` без их импорта.
+
+Обычно `pytest -m unit` импортирует все тестовые модули (а с ними
+Selenium, requests, httpx) и только потом отбрасывает лишние тесты.
+Плагин читает маркеры тестов прямо из исходника (декораторы
+`@pytest.mark.X` у функций и классов, `pytestmark`, маркеры базовых
+классов из модулей проекта) и не собирает модуль, если ни один его тест
+не может подойти под выражение -m.
+
+Если маркеры нельзя определить статически (pytest.param(marks=...),
+базовый класс из чужой библиотеки), модуль собирается как обычно.
+Отключается ini-опцией `marker_prefilter = false`.
+"""
+import ast
+import os
+
+from _pytest.mark.expression import Expression
+
+
+def pytest_addoption(parser):
+    parser.addini(
+        'marker_prefilter', type='bool', default=True,
+        help='не импортировать модули, тесты которых не подходят под -m')
+
+
+def pytest_configure(config):
+    expression = config.option.markexpr
+    if not expression or not config.getini('marker_prefilter'):
+        return
+    try:
+        compiled = Expression.compile(expression)
+    except Exception:
+        # Ошибку в выражении покажет сам pytest (тип исключения
+        # менялся между версиями)
+        return
+    config.pluginmanager.register(MarkerPrefilter(config, compiled),
+                                  'marker-prefilter')
+
+
+class StaticMarkers:
+    """Маркеры тестов модуля, прочитанные из исходника."""
+
+    def __init__(self, root):
+        self.root = root
+        self._classes = {}
+
+    def of_module(self, path):
+        """Список множеств маркеров по тестам или None, если неизвестно."""
+        tree = self._parse(path)
+        if tree is None:
+            return None
+        for node in ast.walk(tree):
+            if (isinstance(node, ast.Call)
+                    and _dotted(node.func) in ('pytest.param', 'param')):
+                return None
+        module_marks = self._pytestmark(tree.body)
+        imports = self._imports(tree, path)
+        local_classes = {node.name: node for node in tree.body
+                         if isinstance(node, ast.ClassDef)}
+        tests = []
+        for node in tree.body:
+            if _is_test_function(node):
+                tests.append(module_marks | _decorator_marks(node))
+            elif isinstance(node, ast.ClassDef) and node.name.startswith(
+                    'Test'):
+                class_marks = self._class_marks(node, local_classes, imports)
+                if class_marks is None:
+                    return None
+                for item in node.body:
+                    if _is_test_function(item):
+                        tests.append(module_marks | class_marks
+                                     | _decorator_marks(item))
+        return tests
+
+    # --- Helpers ---
+
+    def _parse(self, path):
+        try:
+            with open(path, 'rb') as f:
+                return ast.parse(f.read(), filename=str(path))
+        except (OSError, SyntaxError, ValueError):
+            return None
+
+    def _pytestmark(self, body):
+        marks = set()
+        for node in body:
+            if isinstance(node, ast.Assign) and any(
+                    isinstance(t, ast.Name) and t.id == 'pytestmark'
+                    for t in node.targets):
+                values = node.value.elts if isinstance(
+                    node.value, (ast.List, ast.Tuple)) else [node.value]
+                marks.update(filter(None, map(_mark_name, values)))
+        return marks
+
+    def _class_marks(self, node, local_classes, imports):
+        marks = _decorator_marks(node) | self._pytestmark(node.body)
+        for base in node.bases:
+            name = _dotted(base)
+            if name == 'object':
+                continue
+            if name in local_classes:
+                base_marks = self._class_marks(local_classes[name],
+                                               local_classes, imports)
+            elif name in imports:
+                base_marks = self._imported_class_marks(*imports[name])
+            else:
+                return None
+            if base_marks is None:
+                return None
+            marks |= base_marks
+        return marks
+
+    def _imported_class_marks(self, path, class_name):
+        key = (path, class_name)
+        if key not in self._classes:
+            self._classes[key] = None
+            tree = self._parse(path)
+            if tree is not None:
+                classes = {node.name: node for node in tree.body
+                           if isinstance(node, ast.ClassDef)}
+                if class_name in classes:
+                    self._classes[key] = self._class_marks(
+                        classes[class_name], classes,
+                        self._imports(tree, path))
+        return self._classes[key]
+
+    def _imports(self, tree, path):
+        """{имя: (файл модуля проекта, имя класса)} для from-импортов."""
+        package = os.path.dirname(str(path))
+        found = {}
+        for node in tree.body:
+            if not isinstance(node, ast.ImportFrom):
+                continue
+            if node.level:
+                base = package
+                for _ in range(node.level - 1):
+                    base = os.path.dirname(base)
+            else:
+                base = self.root
+            module = os.path.join(base, *(node.module or '').split('.'))
+            if not os.path.isfile(module + '.py'):
+                continue
+            for alias in node.names:
+                found[alias.asname or alias.name] = (module + '.py',
+                                                     alias.name)
+        return found
+
+
+class MarkerPrefilter:
+
+    def __init__(self, config, expression):
+        self.config = config
+        self.expression = expression
+        self.markers = StaticMarkers(str(config.rootpath))
+        self.skipped = 0
+
+    def pytest_ignore_collect(self, collection_path, config):
+        if collection_path.suffix != '.py' or not (
+                collection_path.name.startswith('test_')
+                or collection_path.name.endswith('_test.py')):
+            return None
+        tests = self.markers.of_module(collection_path)
+        if tests is None:
+            return None
+        for marks in tests:
+            # Аргументы маркеров (-m "mark(x=1)") не проверяем: лучше
+            # собрать лишний модуль, чем пропустить нужный
+            if self.expression.evaluate(
+                    lambda name, **kwargs: name in marks):
+                return None
+        self.skipped += 1
+        return True
+
+    def pytest_report_collectionfinish(self, config):
+        if self.skipped:
+            return (f"marker prefilter: {self.skipped} modules skipped "
+                    f"without import")
+        return None
+
+
+def _is_test_function(node):
+    return (isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+            and node.name.startswith('test'))
+
+
+def _decorator_marks(node):
+    return set(filter(None, map(_mark_name, node.decorator_list)))
+
+
+def _mark_name(node):
+    """pytest.mark.unit / pytest.mark.network(...) -> 'unit' / 'network'"""
+    if isinstance(node, ast.Call):
+        node = node.func
+    name = _dotted(node)
+    for prefix in ('pytest.mark.', 'mark.'):
+        if name and name.startswith(prefix):
+            return name[len(prefix):].split('.')[0]
+    return None
+
+
+def _dotted(node):
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        parent = _dotted(node.value)
+        return f"{parent}.{node.attr}" if parent else None
+    return None
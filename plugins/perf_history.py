@@ -0,0 +1,361 @@
+"""
+История производительности прогонов в SQLite и поиск регрессий.
+
+С опцией `--perf-db=perf_history.sqlite` каждый прогон дописывает в базу
+длительность каждого теста и задержку каждого HTTP-запроса через
+BaseApi/TelegramBot (время до ответа сервера, по эндпоинтам). Запись
+идёт в отдельном потоке через aiosqlite: тесты только кладут строки
+в очередь и не ждут диска. Под xdist пишет только контроллер, воркеры
+передают ему задержки запросов в конце прогона.
+
+Отчёт о регрессиях:
+
+    python -m plugins.perf_history report --db perf_history.sqlite
+
+Для каждого теста и эндпоинта медиана последних прогонов сравнивается
+с базовой линией — медианой предыдущего окна прогонов. Скачок — это рост
+больше чем на --min-change и больше чем на --z робастных стандартных
+отклонений (MAD) базовой линии. Медленный рост, который растворяется
+в базовой линии, ловится тестом тренда Манна-Кендалла по всему окну.
+"""
+import argparse
+import asyncio
+import functools
+import math
+import os
+import queue
+import re
+import socket
+import sqlite3
+import statistics
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+import pytest
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started REAL NOT NULL,
+    commit_sha TEXT,
+    branch TEXT,
+    host TEXT
+);
+CREATE TABLE IF NOT EXISTS test_durations (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    nodeid TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    duration REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS request_latencies (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    nodeid TEXT,
+    endpoint TEXT NOT NULL,
+    status INTEGER,
+    latency REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS test_durations_nodeid
+    ON test_durations(nodeid, run_id);
+CREATE INDEX IF NOT EXISTS request_latencies_endpoint
+    ON request_latencies(endpoint, run_id);
+"""
+
+_BOT_TOKEN = re.compile(r'/bot[^/]+')
+_NUMBER = re.compile(r'/\d+(?=/|$)')
+
+
+def endpoint_key(method, url):
+    """Ключ эндпоинта без токена бота и числовых id в пути."""
+    parts = urlsplit(url)
+    path = _NUMBER.sub('/{id}', _BOT_TOKEN.sub('/bot<token>', parts.path))
+    return f"{method} {parts.netloc}{path}"
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('perf-history')
+    group.addoption(
+        '--perf-db', metavar='PATH', default=None,
+        help='дописывать длительности тестов и задержки запросов '
+             'в SQLite базу истории')
+
+
+def pytest_configure(config):
+    path = config.getoption('perf_db')
+    if path:
+        config.pluginmanager.register(PerfHistoryPlugin(config, path),
+                                      'perf-history')
+
+
+# --- Запись ---
+
+class HistoryWriter:
+    """
+    Фоновый поток, который пишет строки в базу пачками.
+    add() только кладёт строку в очередь и сразу возвращается.
+    """
+    BATCH = 500
+
+    def __init__(self, path):
+        self.path = path
+        self.run_id = None
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name='perf-history-writer')
+
+    def start(self):
+        self._thread.start()
+
+    def add(self, table, row):
+        self._queue.put((table, row))
+
+    def close(self, timeout=30):
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    # --- Helpers ---
+
+    def _run(self):
+        asyncio.run(self._write())
+
+    async def _write(self):
+        import aiosqlite
+
+        loop = asyncio.get_running_loop()
+        async with aiosqlite.connect(self.path, timeout=30) as db:
+            await db.execute('PRAGMA journal_mode=WAL')
+            await db.executescript(SCHEMA)
+            cursor = await db.execute(
+                'INSERT INTO runs (started, commit_sha, branch, host) '
+                'VALUES (?, ?, ?, ?)',
+                (time.time(), os.getenv('GITHUB_SHA'),
+                 os.getenv('GITHUB_REF_NAME'), socket.gethostname()))
+            self.run_id = cursor.lastrowid
+            await db.commit()
+
+            done = False
+            while not done:
+                batch = [await loop.run_in_executor(None, self._queue.get)]
+                while len(batch) < self.BATCH:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if None in batch:
+                    done = True
+                    batch = [item for item in batch if item is not None]
+                await self._insert(db, batch)
+
+    async def _insert(self, db, batch):
+        tests = [(self.run_id,) + row for table, row in batch
+                 if table == 'test']
+        requests = [(self.run_id,) + row for table, row in batch
+                    if table == 'request']
+        if tests:
+            await db.executemany(
+                'INSERT INTO test_durations VALUES (?, ?, ?, ?)', tests)
+        if requests:
+            await db.executemany(
+                'INSERT INTO request_latencies VALUES (?, ?, ?, ?, ?)',
+                requests)
+        await db.commit()
+
+
+class PerfHistoryPlugin:
+
+    def __init__(self, config, path):
+        self.config = config
+        self.is_worker = hasattr(config, 'workerinput')
+        self.current_nodeid = None
+        # На воркере задержки копятся и уходят контроллеру в конце
+        self.requests = []
+        self.writer = None
+        if not self.is_worker:
+            self.writer = HistoryWriter(path)
+            self.writer.start()
+        self._patcher = pytest.MonkeyPatch()
+        self._instrument()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item):
+        self.current_nodeid = item.nodeid
+        yield
+        self.current_nodeid = None
+
+    def pytest_runtest_logreport(self, report):
+        # Под xdist отчёты о тестах приходят на контроллер
+        if self.writer is None:
+            return
+        if report.when == 'call' or (report.when == 'setup'
+                                     and not report.passed):
+            self.writer.add('test', (report.nodeid, report.outcome,
+                                     report.duration))
+
+    def record_request(self, method, url, status, latency):
+        row = (self.current_nodeid, endpoint_key(method, url), status,
+               latency)
+        if self.writer is not None:
+            self.writer.add('request', row)
+        else:
+            self.requests.append(row)
+
+    def pytest_sessionfinish(self):
+        workeroutput = getattr(self.config, 'workeroutput', None)
+        if workeroutput is not None:
+            workeroutput['perf_requests'] = self.requests
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        output = getattr(node, 'workeroutput', None) or {}
+        for row in output.get('perf_requests', []):
+            self.writer.add('request', tuple(row))
+
+    def pytest_unconfigure(self):
+        self._patcher.undo()
+        if self.writer is not None:
+            self.writer.close()
+
+    # --- Helpers ---
+
+    def _instrument(self):
+        try:
+            from tests.api.base_api import TimeoutSession
+        except ImportError:
+            return
+        plugin = self
+        request = TimeoutSession.request
+
+        @functools.wraps(request)
+        def wrapper(session, method, url, **kwargs):
+            response = request(session, method, url, **kwargs)
+            if getattr(response, 'from_cassette', False):
+                # Ответ из кассеты не ходил в сеть, его задержка — не метрика
+                return response
+            # elapsed — от отправки запроса до разбора заголовков ответа
+            plugin.record_request(method, url, response.status_code,
+                                  response.elapsed.total_seconds())
+            return response
+        self._patcher.setattr(TimeoutSession, 'request', wrapper)
+
+
+# --- Отчёт ---
+
+def load_series(db, kind, last_runs):
+    """{ключ: [(run_id, значение)]} по последним last_runs прогонам."""
+    if kind == 'test':
+        query = ('SELECT nodeid, run_id, duration FROM test_durations '
+                 "WHERE outcome = 'passed' AND run_id IN "
+                 '(SELECT id FROM runs ORDER BY id DESC LIMIT ?)')
+    else:
+        query = ('SELECT endpoint, run_id, latency FROM request_latencies '
+                 'WHERE run_id IN '
+                 '(SELECT id FROM runs ORDER BY id DESC LIMIT ?)')
+    per_run = {}
+    for key, run_id, value in db.execute(query, (last_runs,)):
+        per_run.setdefault(key, {}).setdefault(run_id, []).append(value)
+    # Один прогон — одно значение: медиана его замеров
+    return {key: [(run_id, statistics.median(values))
+                  for run_id, values in sorted(runs.items())]
+            for key, runs in per_run.items()}
+
+
+def mann_kendall(values):
+    """Z-статистика теста Манна-Кендалла: > 0 — ряд растёт."""
+    n = len(values)
+    s = sum((b > a) - (b < a)
+            for i, a in enumerate(values) for b in values[i + 1:])
+    variance = n * (n - 1) * (2 * n + 5) / 18
+    if s == 0 or variance == 0:
+        return 0.0
+    return (s - 1 if s > 0 else s + 1) / math.sqrt(variance)
+
+
+def detect_regression(values, recent=3, window=20, z=3.0, min_change=0.2,
+                      min_baseline=5):
+    """
+    values — значения по прогонам от старых к новым.
+    Возвращает (было, стало, оценка, вид) или None, где вид — 'step'
+    (скачок относительно базовой линии) или 'trend' (устойчивый рост
+    по всему окну, который скачком не виден).
+    """
+    if len(values) < recent + min_baseline:
+        return None
+    series = values[-recent - window:]
+    baseline = series[:-recent]
+    current = statistics.median(series[-recent:])
+
+    base = statistics.median(baseline)
+    mad = statistics.median(abs(v - base) for v in baseline)
+    # MAD ноль у очень стабильных рядов: шум не меньше 5% медианы
+    scale = max(1.4826 * mad, 0.05 * base, 1e-6)
+    score = (current - base) / scale
+    if score > z and current > base * (1 + min_change):
+        return base, current, score, 'step'
+
+    start = statistics.median(series[:recent])
+    trend = mann_kendall(series)
+    if trend > z and current > start * (1 + min_change):
+        return start, current, trend, 'trend'
+    return None
+
+
+def report(db_path, recent=3, window=20, z=3.0, min_change=0.2,
+           out=sys.stdout):
+    """Печатает регрессии; возвращает их количество."""
+    if not os.path.exists(db_path):
+        print(f"{db_path}: no history yet", file=out)
+        return 0
+    db = sqlite3.connect(db_path)
+    try:
+        runs = db.execute('SELECT COUNT(*) FROM runs').fetchone()[0]
+        found = 0
+        for kind, title in (('test', 'tests'), ('request', 'endpoints')):
+            rows = []
+            for key, series in load_series(db, kind,
+                                           recent + window).items():
+                result = detect_regression(
+                    [value for _, value in series], recent=recent,
+                    window=window, z=z, min_change=min_change)
+                if result:
+                    rows.append((key,) + result)
+            rows.sort(key=lambda row: row[2] / max(row[1], 1e-9),
+                      reverse=True)
+            print(f"{title}: {len(rows)} regressions", file=out)
+            for key, base, current, score, kind in rows:
+                # Нулевая база — эндпоинт раньше отвечал мгновенно
+                ratio = f"{current / base:5.2f}x" if base else '  new '
+                print(f"  {ratio}  {base * 1000:9.1f} ms -> "
+                      f"{current * 1000:9.1f} ms  {kind:5} z={score:5.1f}  "
+                      f"{key}", file=out)
+            found += len(rows)
+        print(f"{runs} runs in history", file=out)
+        return found
+    finally:
+        db.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m plugins.perf_history')
+    commands = parser.add_subparsers(dest='command', required=True)
+    cmd = commands.add_parser('report', help='найти регрессии')
+    cmd.add_argument('--db', default='perf_history.sqlite')
+    cmd.add_argument('--recent', type=int, default=3,
+                     help='сколько последних прогонов сравнивать')
+    cmd.add_argument('--window', type=int, default=20,
+                     help='сколько прогонов до них берётся в базовую линию')
+    cmd.add_argument('--z', type=float, default=3.0,
+                     help='порог в робастных стандартных отклонениях')
+    cmd.add_argument('--min-change', type=float, default=0.2,
+                     help='минимальный относительный рост (0.2 = +20%%)')
+    cmd.add_argument('--fail', action='store_true',
+                     help='код возврата 1, если есть регрессии')
+    args = parser.parse_args(argv)
+
+    found = report(args.db, recent=args.recent, window=args.window,
+                   z=args.z, min_change=args.min_change)
+    return 1 if args.fail and found else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,266 @@
+"""
+Планировщик тестов для pytest-xdist с учётом длительности и ресурсов.
+
+Плагин запоминает длительность каждого теста между прогонами
+(в .pytest_cache) и при запуске `pytest -n N --balance` раскладывает
+тесты по воркерам "самые долгие — первыми" (LPT bin packing).
+Группы маркеров из ini-опции `scheduler_groups` ограничивают число
+воркеров, на которых идут их тесты, например:
+
+    scheduler_groups =
+        telega = 1
+        ui smoke = 2
+
+Здесь все `telega` тесты идут одной последовательной полосой, а Chrome
+одновременно запущен не более чем на двух воркерах.
+"""
+import statistics
+
+import pytest
+
+DURATIONS_KEY = 'scheduler/durations'
+GROUPS_KEY = 'scheduler/groups'
+# Вес нового замера в скользящем среднем
+SMOOTHING = 0.5
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('scheduler')
+    group.addoption(
+        '--balance', action='store_true', default=False,
+        help='распределять тесты по xdist-воркерам по их длительности')
+    parser.addini(
+        'scheduler_groups', type='linelist', default=[],
+        help='"маркеры = лимит": сколько воркеров может гонять эти тесты')
+    parser.addini(
+        'scheduler_default_duration', default='1.0',
+        help='длительность (сек.) для тестов без истории')
+
+
+def parse_groups(lines):
+    """'ui smoke = 2' -> [('ui smoke', {'ui', 'smoke'}, 2)]"""
+    groups = []
+    for line in lines:
+        markers, _, limit = line.partition('=')
+        groups.append(
+            (markers.strip(), set(markers.split()), int(limit.strip())))
+    return groups
+
+
+def plan_schedule(tests, workers, limits):
+    """
+    Раскладывает тесты по воркерам.
+
+    tests — список (ключ, длительность, группа или None),
+    limits — {группа: сколько воркеров ей можно занять}.
+    Возвращает список очередей ключей, по одной на воркер; внутри
+    очереди тесты идут от долгих к коротким.
+    """
+    lanes = {}
+    offset = 0
+    for group in sorted(limits):
+        size = max(1, min(limits[group], workers))
+        lanes[group] = [(offset + i) % workers for i in range(size)]
+        offset += size
+
+    loads = [0.0] * workers
+    plan = [[] for _ in range(workers)]
+    # Сначала раскладываем тесты с ограничениями: у них меньше вариантов
+    for key, cost, group in sorted(
+            tests, key=lambda t: (t[2] is None, -t[1])):
+        allowed = lanes.get(group, range(workers))
+        worker = min(allowed, key=lambda i: loads[i])
+        plan[worker].append(key)
+        loads[worker] += cost
+    return plan
+
+
+# --- Запись длительностей ---
+
+class DurationRecorder:
+
+    def __init__(self, config):
+        self.config = config
+        self.measured = {}
+
+    def pytest_runtest_logreport(self, report):
+        if report.skipped:
+            return
+        self.measured[report.nodeid] = (
+            self.measured.get(report.nodeid, 0.0) + report.duration)
+
+    def pytest_collection_modifyitems(self, items):
+        # Контроллер xdist не собирает тесты, поэтому маркеры ему
+        # передаёт первый воркер через кеш
+        workerinput = getattr(self.config, 'workerinput', None)
+        if workerinput is None or workerinput.get('workerid') != 'gw0':
+            return
+        groups = parse_groups(self.config.getini('scheduler_groups'))
+        mapping = {}
+        for item in items:
+            names = {mark.name for mark in item.iter_markers()}
+            for name, markers, _ in groups:
+                if names & markers:
+                    mapping[item.nodeid] = name
+                    break
+        self.config.cache.set(GROUPS_KEY, mapping)
+
+    def pytest_sessionfinish(self):
+        if hasattr(self.config, 'workerinput') or not self.measured:
+            return
+        durations = self.config.cache.get(DURATIONS_KEY, {})
+        for nodeid, duration in self.measured.items():
+            old = durations.get(nodeid)
+            durations[nodeid] = round(
+                duration if old is None
+                else SMOOTHING * duration + (1 - SMOOTHING) * old, 4)
+        self.config.cache.set(DURATIONS_KEY, durations)
+
+
+def pytest_configure(config):
+    if getattr(config, 'cache', None) is not None:
+        config.pluginmanager.register(
+            DurationRecorder(config), 'duration-recorder')
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    if getattr(config, 'cache', None) is None:
+        return None
+    if not config.getoption('balance'):
+        return None
+    return DurationScheduling(config, log)
+
+
+# --- Планировщик xdist ---
+
+class DurationScheduling:
+    """
+    Статическое расписание для xdist по истории длительностей.
+    Реализует тот же протокол, что и xdist.scheduler.LoadScheduling.
+    """
+
+    def __init__(self, config, log=None):
+        from xdist.remote import Producer
+        from xdist.workermanage import parse_tx_spec_config
+
+        self.config = config
+        self.numnodes = len(parse_tx_spec_config(config))
+        self.node2collection = {}
+        self.node2pending = {}
+        self.pending = []
+        self.collection = None
+        self.log = log.durationsched if log else Producer('durationsched')
+
+    @property
+    def nodes(self):
+        return list(self.node2pending)
+
+    @property
+    def collection_is_completed(self):
+        return len(self.node2collection) >= self.numnodes
+
+    @property
+    def tests_finished(self):
+        if not self.collection_is_completed or self.pending:
+            return False
+        return all(len(p) < 2 for p in self.node2pending.values())
+
+    @property
+    def has_pending(self):
+        return bool(self.pending) or any(self.node2pending.values())
+
+    def add_node(self, node):
+        assert node not in self.node2pending
+        self.node2pending[node] = []
+
+    def add_node_collection(self, node, collection):
+        assert node in self.node2pending
+        if self.collection is not None and collection != self.collection:
+            self.log('**Different tests collected on', node.gateway.id, '**')
+            return
+        self.node2collection[node] = list(collection)
+
+    def mark_test_complete(self, node, item_index, duration=0):
+        self.node2pending[node].remove(item_index)
+
+    def mark_test_pending(self, item):
+        self.pending.insert(0, self.collection.index(item))
+        self._send_leftovers()
+
+    def remove_pending_tests_from_node(self, node, indices):
+        """Возвращает снятые с воркера тесты в общую очередь."""
+        pending = self.node2pending[node]
+        for index in indices:
+            pending.remove(index)
+        self.pending.extend(indices)
+        self._send_leftovers(busy=node)
+
+    def remove_node(self, node):
+        pending = self.node2pending.pop(node)
+        if not pending:
+            return None
+        crashitem = self.collection[pending.pop(0)]
+        self.pending.extend(pending)
+        self._send_leftovers()
+        return crashitem
+
+    def schedule(self):
+        assert self.collection_is_completed
+        if self.collection is not None:
+            self._send_leftovers()
+            return
+
+        collections = list(self.node2collection.values())
+        if any(c != collections[0] for c in collections[1:]):
+            self.log('**Different tests collected, aborting run**')
+            return
+        self.collection = collections[0]
+        if not self.collection:
+            return
+
+        nodes = self.nodes
+        plan = plan_schedule(self._tests(), len(nodes), self._limits())
+        for node, indices in zip(nodes, plan):
+            self._send(node, indices)
+        # Воркеры не останавливаем: им ещё могут достаться тесты упавшего
+        # воркера. Когда общая очередь пуста и воркеры доделывают последние
+        # тесты, tests_finished становится True и xdist сам их остановит
+
+    # --- Helpers ---
+
+    def _tests(self):
+        cache = self.config.cache
+        durations = cache.get(DURATIONS_KEY, {})
+        groups = cache.get(GROUPS_KEY, {})
+        default = float(self.config.getini('scheduler_default_duration'))
+        known = [durations[n] for n in self.collection if n in durations]
+        if known:
+            default = statistics.median(known)
+        return [
+            (index, durations.get(nodeid, default), groups.get(nodeid))
+            for index, nodeid in enumerate(self.collection)
+        ]
+
+    def _limits(self):
+        return {name: limit for name, _, limit
+                in parse_groups(self.config.getini('scheduler_groups'))}
+
+    def _send(self, node, indices):
+        if indices:
+            self.node2pending[node].extend(indices)
+            node.send_runtest_some(indices)
+
+    def _send_leftovers(self, busy=None):
+        """
+        Отдаёт общую очередь наименее загруженному живому воркеру.
+        busy получает тесты, только если других живых воркеров нет.
+        """
+        live = [node for node in self.nodes if not node.shutting_down]
+        if len(live) > 1 and busy in live:
+            live.remove(busy)
+        if not self.pending or not live:
+            return
+        node = min(live, key=lambda n: len(self.node2pending[n]))
+        self._send(node, self.pending[:])
+        self.pending.clear()
@@ -0,0 +1,212 @@
+"""
+Поэтапные замеры времени прогона через OpenTelemetry.
+
+С опцией `--trace-spans=spans.jsonl` каждый тест оборачивается в span,
+внутри которого отдельно видны setup/call/teardown, запуск и возврат
+браузера в пул, действия page objects, ожидания и HTTP-запросы через
+BaseApi/TelegramBot. Span'ы пишутся в файл (по одному JSON на строку)
+фоновым BatchSpanProcessor, а в конце прогона печатается top-N самых
+долгих (`--trace-top`, по умолчанию 15).
+
+Без опции плагин ничего не импортирует и ничего не оборачивает.
+"""
+import functools
+import importlib
+import os
+import re
+from urllib.parse import urlsplit
+
+import pytest
+
+# Что оборачивать: модуль -> [(класс, [методы] или None = все публичные)]
+INSTRUMENTED = {
+    'pages.login_page': [('LoginPage', None)],
+    'pages.dashboard_page': [('DashboardPage', None)],
+    'pages.waits': [('Waiter', ['visible', 'present', 'url_contains',
+                                'frame_and_switch'])],
+    'tests.ui.browser_pool': [('BrowserPool', ['acquire', 'release'])],
+}
+# Токен бота в URL не должен попадать в файл со span'ами
+_BOT_TOKEN = re.compile(r'/bot[^/]+')
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('timing')
+    group.addoption(
+        '--trace-spans', metavar='PATH', default=None,
+        help='писать OpenTelemetry span\'ы прогона в файл (JSON lines)')
+    group.addoption(
+        '--trace-top', type=int, default=15,
+        help='сколько самых долгих span\'ов показать в конце прогона')
+
+
+def pytest_configure(config):
+    path = config.getoption('trace_spans')
+    if path:
+        config.pluginmanager.register(TimingPlugin(config, path),
+                                      'timing-plugin')
+
+
+class _Collector:
+    """SpanProcessor, который запоминает длительности для итоговой сводки."""
+
+    def __init__(self, plugin):
+        self.plugin = plugin
+
+    def on_start(self, span, parent_context=None):
+        pass
+
+    def on_end(self, span):
+        duration = (span.end_time - span.start_time) / 1e9
+        self.plugin.finished.append(
+            (duration, span.name, self.plugin.current_nodeid))
+
+    def shutdown(self):
+        pass
+
+    def force_flush(self, timeout_millis=30000):
+        return True
+
+
+class TimingPlugin:
+
+    def __init__(self, config, path):
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import (BatchSpanProcessor,
+                                                    ConsoleSpanExporter)
+
+        self.config = config
+        self.finished = []
+        self.current_nodeid = None
+        worker = os.getenv('PYTEST_XDIST_WORKER')
+        if worker:
+            # У каждого xdist-воркера свой файл, сводку собирает контроллер
+            root, ext = os.path.splitext(path)
+            path = f'{root}.{worker}{ext}'
+        self._file = open(path, 'w', encoding='utf-8')
+        self.provider = TracerProvider(resource=Resource.create({
+            'service.name': 'autotest-aifs',
+            'worker': worker or 'main',
+        }))
+        self.provider.add_span_processor(BatchSpanProcessor(
+            ConsoleSpanExporter(
+                out=self._file,
+                formatter=lambda span: span.to_json(indent=None) + '\n')))
+        self.provider.add_span_processor(_Collector(self))
+        self.tracer = self.provider.get_tracer('plugins.timing')
+        self._patcher = pytest.MonkeyPatch()
+        self._instrument()
+
+    # --- pytest hooks ---
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item):
+        self.current_nodeid = item.nodeid
+        with self.tracer.start_as_current_span(
+                'test', attributes={'test.nodeid': item.nodeid}):
+            yield
+        self.current_nodeid = None
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        with self.tracer.start_as_current_span('setup'):
+            yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        with self.tracer.start_as_current_span('call'):
+            yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item):
+        with self.tracer.start_as_current_span('teardown'):
+            yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef):
+        with self.tracer.start_as_current_span(
+                f'fixture {fixturedef.argname}'):
+            yield
+
+    def pytest_sessionfinish(self):
+        workeroutput = getattr(self.config, 'workeroutput', None)
+        if workeroutput is not None:
+            workeroutput['timing_spans'] = self._top()
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        output = getattr(node, 'workeroutput', None) or {}
+        self.finished.extend(
+            tuple(row) for row in output.get('timing_spans', []))
+
+    def pytest_terminal_summary(self, terminalreporter):
+        self.provider.force_flush()
+        rows = self._top()
+        if not rows:
+            return
+        terminalreporter.section(f'top {len(rows)} slowest spans')
+        for duration, name, nodeid in rows:
+            terminalreporter.write_line(
+                f"{duration:8.3f}s  {name}  [{nodeid or '-'}]")
+
+    def _top(self):
+        rows = sorted(self.finished, key=lambda row: row[0], reverse=True)
+        # Span 'test' целиком дублирует свои фазы, в сводке он не нужен
+        rows = [row for row in rows if row[1] != 'test']
+        return rows[:self.config.getoption('trace_top')]
+
+    def pytest_unconfigure(self):
+        self._patcher.undo()
+        self.provider.shutdown()
+        self._file.close()
+
+    # --- Instrumentation ---
+
+    def _instrument(self):
+        for module_name, targets in INSTRUMENTED.items():
+            try:
+                module = importlib.import_module(module_name)
+            except ImportError:
+                continue
+            for class_name, methods in targets:
+                cls = getattr(module, class_name)
+                if methods is None:
+                    methods = [name for name, value in vars(cls).items()
+                               if callable(value) and not name.startswith('_')]
+                for name in methods:
+                    self._patcher.setattr(cls, name, self._traced(
+                        f'{class_name}.{name}', getattr(cls, name)))
+
+        try:
+            from tests.api.base_api import TimeoutSession
+        except ImportError:
+            return
+        self._patcher.setattr(TimeoutSession, 'request',
+                              self._traced_request(TimeoutSession.request))
+
+    def _traced(self, name, func):
+        tracer = self.tracer
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracer.start_as_current_span(name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def _traced_request(self, request):
+        tracer = self.tracer
+
+        @functools.wraps(request)
+        def wrapper(session, method, url, **kwargs):
+            parts = urlsplit(url)
+            path = _BOT_TOKEN.sub('/bot<token>', parts.path)
+            with tracer.start_as_current_span(
+                    f'HTTP {method} {parts.netloc}{path}',
+                    attributes={'http.method': method,
+                                'http.host': parts.netloc,
+                                'http.path': path}) as span:
+                response = request(session, method, url, **kwargs)
+                span.set_attribute('http.status_code', response.status_code)
+                return response
+        return wrapper
@@ -0,0 +1,151 @@
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+
+from filelock import FileLock
+
+from .base_api import BaseApi
+
+
+def token_expires_at(token, default_ttl):
+    """
+    Достаёт время истечения (exp) из JWT без проверки подписи.
+    Если токен не JWT или поля exp нет, считаем, что он живёт default_ttl.
+    """
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        return float(claims['exp'])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return time.time() + default_ttl
+
+
+class TokenProvider:
+    """
+    Выдаёт accessToken для авторизованных запросов.
+
+    Логинится один раз и держит токен в памяти до истечения срока.
+    Если указан cache_dir, токен дополнительно кладётся в файл под
+    файловой блокировкой, чтобы параллельные xdist-воркеры логинились
+    один раз на весь прогон, а не каждый сам по себе. login_session —
+    отдельная сессия для запроса логина (по умолчанию session).
+    """
+    # За сколько секунд до exp токен считается протухшим
+    EXPIRY_MARGIN = 60
+    # Срок жизни токена, если в нём нет поля exp
+    DEFAULT_TTL = 15 * 60
+
+    def __init__(self, session, email, password, base_url=None,
+                 cache_dir=None, login_session=None):
+        self.session = session
+        self.login_session = login_session or session
+        self.email = email
+        self.password = password
+        self.base_url = base_url or BaseApi.BASE_URL
+        self.login_count = 0
+        self._token = None
+        self._expires_at = 0
+        self._lock = threading.Lock()
+        self._cache_file = None
+        if cache_dir:
+            key = hashlib.sha256(
+                f"{self.base_url}|{email}".encode()).hexdigest()[:16]
+            self._cache_file = os.path.join(cache_dir, f"token-{key}.json")
+
+    # --- Public API ---
+
+    def get_token(self):
+        """Возвращает живой токен, при необходимости логинится."""
+        with self._lock:
+            if not self._is_fresh(self._expires_at):
+                self._token, self._expires_at = self._load_or_login()
+            return self._token
+
+    def invalidate(self, token=None):
+        """
+        Забывает токен (например, после 401).
+        Если передан token, файл кеша удаляется только когда в нём лежит
+        именно этот токен: другой воркер мог уже положить свежий.
+        """
+        with self._lock:
+            if token is None or token == self._token:
+                self._token, self._expires_at = None, 0
+            if self._cache_file:
+                with self._file_lock():
+                    cached = self._read_cache()
+                    if cached and (token is None or cached[0] == token):
+                        os.remove(self._cache_file)
+
+    def auth_headers(self):
+        return {"Authorization": f"Bearer {self.get_token()}"}
+
+    def request(self, method, endpoint, **kwargs):
+        """
+        Выполняет авторизованный запрос к BASE_URL + endpoint.
+        На 401 один раз обновляет токен и повторяет запрос.
+        """
+        url = self.base_url + endpoint
+        headers = dict(kwargs.pop('headers', None) or {})
+
+        token = self.get_token()
+        headers["Authorization"] = f"Bearer {token}"
+        response = self.session.request(method, url, headers=headers,
+                                        **kwargs)
+        if response.status_code == 401:
+            self.invalidate(token)
+            headers["Authorization"] = f"Bearer {self.get_token()}"
+            response = self.session.request(method, url, headers=headers,
+                                            **kwargs)
+        return response
+
+    def get(self, endpoint, **kwargs):
+        return self.request('GET', endpoint, **kwargs)
+
+    # --- Helpers ---
+
+    def _is_fresh(self, expires_at):
+        return expires_at - self.EXPIRY_MARGIN > time.time()
+
+    def _load_or_login(self):
+        if not self._cache_file:
+            return self._login()
+        with self._file_lock():
+            cached = self._read_cache()
+            if cached and self._is_fresh(cached[1]):
+                return cached
+            token, expires_at = self._login()
+            self._write_cache(token, expires_at)
+            return token, expires_at
+
+    def _login(self):
+        response = self.login_session.post(
+            self.base_url + BaseApi.LOGIN_ENDPOINT,
+            headers={"Content-Type": "application/json"},
+            json={"email": self.email, "password": self.password},
+        )
+        response.raise_for_status()
+        self.login_count += 1
+        token = response.json()["accessToken"]
+        return token, token_expires_at(token, self.DEFAULT_TTL)
+
+    def _file_lock(self):
+        return FileLock(self._cache_file + '.lock')
+
+    def _read_cache(self):
+        try:
+            with open(self._cache_file, encoding='utf-8') as f:
+                data = json.load(f)
+            return data['token'], float(data['expires_at'])
+        except (OSError, KeyError, TypeError, ValueError):
+            return None
+
+    def _write_cache(self, token, expires_at):
+        # Файл с токеном доступен только текущему пользователю
+        fd = os.open(self._cache_file,
+                     os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'token': token, 'expires_at': expires_at}, f)
@@ -1,5 +1,72 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.settings import setting
+
+
+class TimeoutSession(requests.Session):
+    """Сессия, которая подставляет таймаут по умолчанию в каждый запрос."""
+
+    def __init__(self, timeout):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+def build_session(pool_size=None, connect_timeout=None, read_timeout=None,
+                  retries=None):
+    """
+    Создаёт сессию с пулом keep-alive соединений.
+
+    Параметры по умолчанию берутся из BaseApi (settings) и могут быть
+    переопределены через переменные окружения API_POOL_SIZE,
+    API_CONNECT_TIMEOUT, API_READ_TIMEOUT и API_RETRIES.
+    """
+    pool_size = pool_size or BaseApi.POOL_SIZE
+    connect_timeout = connect_timeout or BaseApi.CONNECT_TIMEOUT
+    read_timeout = read_timeout or BaseApi.READ_TIMEOUT
+    if retries is None:
+        retries = BaseApi.RETRIES
+
+    # Повторяем только ошибки соединения и 502/503/504 для идемпотентных
+    # методов: повторный POST на логин нам не нужен.
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=0,
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({'GET', 'HEAD', 'OPTIONS'}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=retry,
+    )
+
+    session = TimeoutSession(timeout=(connect_timeout, read_timeout))
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive',
+    })
+    return session
+
+
 class BaseApi:
     """Базовый класс для всех API тестов."""
-    BASE_URL = "https://app.aifromspace.com"
-    LOGIN_ENDPOINT = "/api/auth/login"
-    USER_ENDPOINT = '/api/user'
+    BASE_URL = setting('base_url')
+    LOGIN_ENDPOINT = setting('login_endpoint')
+    USER_ENDPOINT = setting('user_endpoint')
+
+    # --- Настройки HTTP клиента ---
+    POOL_SIZE = setting('api_pool_size')
+    CONNECT_TIMEOUT = setting('api_connect_timeout')
+    READ_TIMEOUT = setting('api_read_timeout')
+    RETRIES = setting('api_retries')
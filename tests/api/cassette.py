@@ -0,0 +1,251 @@
+"""
+Запись и воспроизведение HTTP-обмена (cassettes) для api и telega тестов.
+
+CassetteAdapter монтируется в requests-сессию вместо обычного
+HTTPAdapter и работает в одном из режимов:
+
+    record — все запросы идут в сеть, обмен записывается в файл;
+    new    — записанное воспроизводится, новое записывается;
+    replay — только воспроизведение, сеть не используется.
+
+Перед записью из обмена убираются секреты: значения переменных
+окружения (логин, пароль, токен бота) заменяются заглушками, а
+токены в JSON и заголовки авторизации не сохраняются вовсе. При
+воспроизведении тесты получают те же заглушки через окружение, поэтому
+запросы совпадают с записанными.
+
+Записанные ответы лежат в памяти в словаре по ключу запроса; из чего
+состоит ключ, задаётся match_on (см. MATCHERS).
+"""
+import base64
+import io
+import json
+import os
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+MODES = ('off', 'replay', 'new', 'record')
+DEFAULT_MATCH_ON = ('method', 'url', 'body')
+
+# Поля JSON, значения которых не сохраняются. Пароль из окружения
+# заменяется заглушкой, а неверные пароли из тестов секретом не являются
+SECRET_FIELDS = ('accessToken', 'refreshToken', 'token')
+_SECRET_FIELD = re.compile(
+    r'("(?:%s)"\s*:\s*)"[^"]*"' % '|'.join(SECRET_FIELDS))
+# Заголовки запроса и ответа, которые не сохраняются
+SECRET_HEADERS = {'authorization', 'cookie', 'set-cookie'}
+# Заголовки, которые после декодирования тела уже неверны
+_DROP_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding'}
+
+
+class CassetteMiss(requests.exceptions.ConnectionError):
+    """В режиме replay запроса нет в записи."""
+
+
+def _canonical_body(body):
+    if not body:
+        return ''
+    if isinstance(body, bytes):
+        body = body.decode('utf-8', 'replace')
+    try:
+        return json.dumps(json.loads(body), sort_keys=True,
+                          ensure_ascii=False)
+    except ValueError:
+        return body
+
+
+def _sorted_query(url):
+    return urlencode(sorted(parse_qsl(urlsplit(url).query)))
+
+
+MATCHERS = {
+    'method': lambda req: req['method'],
+    'url': lambda req: req['url'].split('?')[0] + '?' + _sorted_query(
+        req['url']),
+    'host': lambda req: urlsplit(req['url']).netloc,
+    'path': lambda req: urlsplit(req['url']).path,
+    'query': lambda req: _sorted_query(req['url']),
+    'body': lambda req: _canonical_body(req.get('body')),
+}
+
+
+class Scrubber:
+    """Заменяет секреты заглушками: {значение: заглушка}."""
+
+    def __init__(self, secrets=None):
+        # Короткие значения (chat id "1") легко спутать с чем-то ещё
+        self.secrets = sorted(
+            ((value, stub) for value, stub in (secrets or {}).items()
+             if value and len(value) >= 4 and value != stub),
+            key=lambda pair: -len(pair[0]))
+
+    def text(self, text):
+        for value, stub in self.secrets:
+            text = text.replace(value, stub)
+        return _SECRET_FIELD.sub(r'\1"<scrubbed>"', text)
+
+    def headers(self, headers):
+        return {name: self.text(value) for name, value in headers.items()
+                if name.lower() not in SECRET_HEADERS}
+
+
+class Cassette:
+    """Файл с записанным обменом и индекс для поиска ответа."""
+
+    def __init__(self, path, match_on=DEFAULT_MATCH_ON, scrubber=None):
+        self.path = path
+        self.match_on = tuple(match_on)
+        self.scrubber = scrubber or Scrubber()
+        self.interactions = []
+        self.recorded = []
+        self.dirty = False
+        self._index = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.interactions = json.load(f)['interactions']
+        for interaction in self.interactions:
+            self._index.setdefault(self._key(interaction['request']),
+                                   []).append(interaction['response'])
+
+    def request_record(self, prepared):
+        """Запрос в том виде, в каком он хранится (без секретов)."""
+        body = prepared.body
+        if isinstance(body, bytes):
+            body = body.decode('utf-8', 'replace')
+        return {
+            'method': prepared.method,
+            'url': self.scrubber.text(prepared.url),
+            'body': self.scrubber.text(body) if body else None,
+        }
+
+    def find(self, request):
+        """Следующий записанный ответ на такой запрос или None."""
+        responses = self._index.get(self._key(request))
+        if not responses:
+            return None
+        # Одинаковые запросы получают ответы по порядку записи,
+        # последний ответ повторяется
+        return responses.pop(0) if len(responses) > 1 else responses[0]
+
+    def append(self, request, response):
+        content = response.content
+        try:
+            body = {'text': self.scrubber.text(content.decode('utf-8'))}
+        except UnicodeDecodeError:
+            body = {'base64': base64.b64encode(content).decode('ascii')}
+        record = {
+            'request': request,
+            'response': dict(
+                body,
+                status=response.status_code,
+                reason=response.reason,
+                headers={name: value for name, value in
+                         self.scrubber.headers(response.headers).items()
+                         if name.lower() not in _DROP_HEADERS},
+            ),
+        }
+        self.recorded.append(record)
+        self.dirty = True
+
+    def save(self, mode):
+        """record перезаписывает файл, new дописывает новое к старому."""
+        if not self.dirty:
+            return
+        interactions = self.recorded
+        if mode == 'new':
+            interactions = self.interactions + self.recorded
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'interactions': interactions}, f,
+                      ensure_ascii=False, separators=(',', ':'))
+            f.write('\n')
+
+    def _key(self, request):
+        return tuple(MATCHERS[name](request) for name in self.match_on)
+
+
+class CassetteAdapter(BaseAdapter):
+    """Адаптер requests, который пишет обмен в кассету и отдаёт его оттуда."""
+
+    def __init__(self, cassette, mode, real_adapters=None):
+        super().__init__()
+        if mode not in MODES[1:]:
+            raise ValueError(f"Неизвестный режим кассет: {mode}")
+        self.cassette = cassette
+        self.mode = mode
+        # {префикс URL: адаптер}, через которые запросы идут в сеть
+        self.real_adapters = dict(real_adapters or {})
+        self.hits = 0
+        self.misses = 0
+
+    def send(self, request, **kwargs):
+        record = self.cassette.request_record(request)
+        if self.mode != 'record':
+            stored = self.cassette.find(record)
+            if stored is not None:
+                self.hits += 1
+                return self._build_response(request, stored)
+            self.misses += 1
+            if self.mode == 'replay':
+                raise CassetteMiss(
+                    f"Нет записи для {record['method']} {record['url']} "
+                    f"в {self.cassette.path}; запишите её с "
+                    f"API_CASSETTES=new", request=request)
+        response = self._real_adapter(request.url).send(request, **kwargs)
+        self.cassette.append(record, response)
+        return response
+
+    def close(self):
+        for adapter in self.real_adapters.values():
+            adapter.close()
+
+    # --- Helpers ---
+
+    def _real_adapter(self, url):
+        for prefix in sorted(self.real_adapters, key=len, reverse=True):
+            if url.lower().startswith(prefix.lower()):
+                return self.real_adapters[prefix]
+        raise requests.exceptions.InvalidSchema(
+            f"No connection adapters were found for {url!r}")
+
+    @staticmethod
+    def _build_response(request, stored):
+        response = requests.Response()
+        response.status_code = stored['status']
+        response.reason = stored.get('reason')
+        response.headers = CaseInsensitiveDict(stored.get('headers', {}))
+        if 'base64' in stored:
+            content = base64.b64decode(stored['base64'])
+        else:
+            content = stored.get('text', '').encode('utf-8')
+        # Тело уже прочитано: iter_content и iter_lines отдают его из
+        # _content, а raw нужен тем, кто читает поток напрямую
+        response._content = content
+        response._content_consumed = True
+        response.raw = io.BytesIO(content)
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        # Метка для истории производительности: задержки у ответа нет
+        response.from_cassette = True
+        return response
+
+
+def mount_cassette(session, cassette, mode):
+    """
+    Подключает кассету к сессии вместо её адаптеров. Возвращает адаптер
+    кассеты и функцию, которая возвращает сессии прежние адаптеры.
+    """
+    original = dict(session.adapters)
+    adapter = CassetteAdapter(cassette, mode, real_adapters=original)
+    for prefix in original:
+        session.adapters[prefix] = adapter
+
+    def unmount():
+        session.adapters.clear()
+        session.adapters.update(original)
+    return adapter, unmount
@@ -0,0 +1,11 @@
+import pytest
+
+from utils.settings import settings
+
+
+@pytest.fixture
+def telegram_bot(http_session):
+    """Бот, который ходит в Telegram API через общий пул соединений."""
+    from .telegram_bot import TelegramBot
+
+    return TelegramBot(settings.telegram_bot_token, session=http_session)
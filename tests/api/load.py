@@ -0,0 +1,172 @@
+"""
+Нагрузочный режим для логина и профиля пользователя.
+
+Повторяет сценарии из test_api_login.py и test_user_profile.py
+с заданной параллельностью и пишет JSON-отчёт с пропускной способностью,
+долей ошибок и p50/p95/p99 задержек по каждому эндпоинту:
+
+    python -m tests.api.load --concurrency 50 --ramp-up 10 --duration 60 \
+        --flows login,profile --output load_report.json
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+
+import httpx
+
+from utils.settings import settings
+from utils.utils import percentile
+
+from .base_api import BaseApi
+
+
+class LoadStats:
+    """Собирает замеры и считает итоговый отчёт по эндпоинтам."""
+
+    def __init__(self):
+        self.samples = {}
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def record(self, endpoint, latency, status=None, error=None):
+        self.samples.setdefault(endpoint, []).append(
+            (latency, status, error))
+
+    def summary(self):
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        report = {}
+        for endpoint, samples in sorted(self.samples.items()):
+            latencies = sorted(s[0] for s in samples)
+            errors = sum(1 for _, status, error in samples
+                         if error or status is None or status >= 400)
+            report[endpoint] = {
+                'requests': len(samples),
+                'errors': errors,
+                'error_rate': round(errors / len(samples), 4),
+                'throughput_rps': round(len(samples) / elapsed, 2),
+                'latency_ms': {
+                    name: round(percentile(latencies, q) * 1000, 2)
+                    for name, q in (('p50', 50), ('p95', 95), ('p99', 99))
+                },
+                'max_latency_ms': round(latencies[-1] * 1000, 2),
+                'status_codes': dict(Counter(
+                    str(status or error) for _, status, error in samples)),
+            }
+        return {'duration_s': round(elapsed, 2), 'endpoints': report}
+
+
+class LoadRunner:
+    """Виртуальные пользователи, гоняющие сценарии до истечения времени."""
+
+    def __init__(self, base_url, email, password, concurrency=10,
+                 ramp_up=0.0, duration=30.0, flows=('login', 'profile'),
+                 timeout=30.0, transport=None):
+        self.base_url = base_url
+        self.email = email
+        self.password = password
+        self.concurrency = concurrency
+        self.ramp_up = ramp_up
+        self.duration = duration
+        self.flows = flows
+        self.timeout = timeout
+        self.transport = transport
+        self.stats = LoadStats()
+
+    async def run(self):
+        limits = httpx.Limits(max_connections=self.concurrency,
+                              max_keepalive_connections=self.concurrency)
+        async with httpx.AsyncClient(base_url=self.base_url, limits=limits,
+                                     timeout=self.timeout,
+                                     transport=self.transport) as client:
+            self.stats = LoadStats()
+            deadline = self.stats.started + self.ramp_up + self.duration
+            users = [
+                self._virtual_user(client, number, deadline)
+                for number in range(self.concurrency)
+            ]
+            await asyncio.gather(*users)
+        self.stats.finished = time.perf_counter()
+        return self.stats.summary()
+
+    async def _virtual_user(self, client, number, deadline):
+        # Пользователи подключаются равномерно в течение ramp_up секунд
+        if self.ramp_up:
+            await asyncio.sleep(self.ramp_up * number / self.concurrency)
+        flow = self.flows[number % len(self.flows)]
+        token = None
+        while time.perf_counter() < deadline:
+            # Отдаём управление, даже если ответ пришёл без ожидания сети
+            await asyncio.sleep(0)
+            if flow == 'login' or token is None:
+                token = await self._login(client)
+                if flow == 'login':
+                    continue
+            if token and await self._get_user(client, token) == 401:
+                token = None
+
+    async def _login(self, client):
+        response = await self._call(
+            client, 'POST', BaseApi.LOGIN_ENDPOINT,
+            json={"email": self.email, "password": self.password})
+        if response is not None and response.status_code == 200:
+            return response.json().get('accessToken')
+        return None
+
+    async def _get_user(self, client, token):
+        response = await self._call(
+            client, 'GET', BaseApi.USER_ENDPOINT,
+            headers={"Authorization": f"Bearer {token}"})
+        return response.status_code if response is not None else None
+
+    async def _call(self, client, method, endpoint, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, endpoint, **kwargs)
+        except httpx.HTTPError as error:
+            self.stats.record(endpoint, time.perf_counter() - start,
+                              error=type(error).__name__)
+            return None
+        self.stats.record(endpoint, time.perf_counter() - start,
+                          status=response.status_code)
+        return response
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--base-url', default=BaseApi.BASE_URL)
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--ramp-up', type=float, default=0.0,
+                        help='за сколько секунд подключаются все пользователи')
+    parser.add_argument('--duration', type=float, default=30.0,
+                        help='сколько секунд держать полную нагрузку')
+    parser.add_argument('--flows', default='login,profile',
+                        help='сценарии через запятую: login, profile')
+    parser.add_argument('--output', default='load_report.json')
+    args = parser.parse_args(argv)
+
+    runner = LoadRunner(
+        base_url=args.base_url,
+        email=settings.login,
+        password=settings.password,
+        concurrency=args.concurrency,
+        ramp_up=args.ramp_up,
+        duration=args.duration,
+        flows=tuple(args.flows.split(',')),
+    )
+    report = asyncio.run(runner.run())
+    report['config'] = {
+        'base_url': args.base_url,
+        'concurrency': args.concurrency,
+        'ramp_up_s': args.ramp_up,
+        'duration_s': args.duration,
+        'flows': runner.flows,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(json.dumps(report['endpoints'], ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,301 @@
+"""
+Локальная замена бэкенда aifromspace и Telegram Bot API.
+
+Сервер поднимается в том же процессе в отдельном потоке и реализует
+только то, чем пользуются тесты: /api/auth/login, /api/user и методы
+бота sendMessage, getUpdates, getMe. Задержку и ошибки можно включать
+прямо из теста, чтобы детерминированно проверять поведение клиента.
+
+Для UI бенчмарка ассистента есть страница-заменитель дашборда
+(/dashboard) с iframe чата (/embed.aifromspace.com/assistant), который
+получает ответ потоком, по слову, как настоящий ассистент.
+"""
+import random
+import threading
+import time
+import uuid
+
+from flask import Flask, Response, jsonify, request
+from werkzeug.serving import make_server
+
+# Страница-заменитель дашборда: только iframe ассистента. В адресе iframe
+# есть embed.aifromspace.com, поэтому его находят те же локаторы
+STANDIN_DASHBOARD = """<!doctype html>
+<html><head><meta charset="utf-8"><title>Dashboard (stub)</title></head>
+<body>
+<h1>Dashboard</h1>
+<iframe src="/embed.aifromspace.com/assistant"
+        style="width: 480px; height: 640px; border: 0"></iframe>
+</body></html>
+"""
+
+# Чат ассистента: ответ приходит потоком и дописывается в сообщение,
+# aria-busy="false" — ответ закончен
+STANDIN_ASSISTANT = """<!doctype html>
+<html><head><meta charset="utf-8"><title>Assistant (stub)</title></head>
+<body>
+<header>QA Testing Assistant</header>
+<div class="messages"></div>
+<form id="chat">
+  <textarea name="prompt"></textarea>
+  <button type="submit">Send</button>
+</form>
+<script>
+const form = document.getElementById('chat');
+const messages = document.querySelector('.messages');
+const add = (role) => {
+    const message = document.createElement('div');
+    message.className = 'message ' + role;
+    messages.appendChild(message);
+    return message;
+};
+form.addEventListener('submit', async (event) => {
+    event.preventDefault();
+    const prompt = form.prompt.value;
+    form.prompt.value = '';
+    add('user').textContent = prompt;
+    const answer = add('assistant');
+    answer.setAttribute('aria-busy', 'true');
+    const response = await fetch('/embed.aifromspace.com/api/chat', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({prompt}),
+    });
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    for (;;) {
+        const {done, value} = await reader.read();
+        if (done) break;
+        answer.textContent += decoder.decode(value, {stream: true});
+    }
+    answer.setAttribute('aria-busy', 'false');
+});
+</script>
+</body></html>
+"""
+
+
+class StubState:
+    """Данные и настройки стенда, общие для всех запросов."""
+
+    def __init__(self, email, password, bot_token, seed=0):
+        self.email = email
+        self.password = password
+        self.bot_token = bot_token
+        self.tokens = set()
+        self.sent_messages = []
+        self.updates = []
+        self.requests = []
+        # Задержка ответа в секундах: число или (min, max)
+        self.latency = 0
+        # Доля запросов, которые отвечают 500
+        self.error_rate = 0.0
+        # Ассистент: задержка первого слова, пауза между словами (с)
+        # и длина ответа в словах
+        self.assistant_first_token = 0.3
+        self.assistant_token_interval = 0.03
+        self.assistant_tokens = 20
+        self._faults = []
+        self._next_update_id = 1
+        self._next_message_id = 1
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._new_updates = threading.Condition(self._lock)
+
+    def inject_error(self, path, status=500, times=1, retry_after=None):
+        """Следующие `times` запросов к path (суффикс URL) вернут ошибку."""
+        with self._lock:
+            self._faults.append({'path': path, 'status': status,
+                                 'times': times, 'retry_after': retry_after})
+
+    def push_update(self, text, chat_id=1, **message):
+        """Кладёт входящее сообщение в очередь getUpdates."""
+        with self._new_updates:
+            update = {
+                'update_id': self._next_update_id,
+                'message': {
+                    'message_id': self._next_update_id,
+                    'chat': {'id': chat_id},
+                    'date': int(time.time()),
+                    'text': text,
+                    **message,
+                },
+            }
+            self._next_update_id += 1
+            self.updates.append(update)
+            self._new_updates.notify_all()
+            return update
+
+    # --- Helpers ---
+
+    def take_fault(self, path):
+        with self._lock:
+            for fault in self._faults:
+                if path.endswith(fault['path']):
+                    fault['times'] -= 1
+                    if fault['times'] <= 0:
+                        self._faults.remove(fault)
+                    return fault
+            if self.error_rate and self._random.random() < self.error_rate:
+                return {'status': 500, 'retry_after': None}
+        return None
+
+    def delay(self):
+        latency = self.latency
+        if isinstance(latency, (tuple, list)):
+            with self._lock:
+                latency = self._random.uniform(*latency)
+        if latency:
+            time.sleep(latency)
+
+    def issue_token(self):
+        token = uuid.uuid4().hex
+        with self._lock:
+            self.tokens.add(token)
+        return token
+
+    def store_message(self, chat_id, text):
+        with self._lock:
+            message = {
+                'message_id': self._next_message_id,
+                'chat': {'id': chat_id},
+                'date': int(time.time()),
+                'text': text,
+            }
+            self._next_message_id += 1
+            self.sent_messages.append(message)
+            return message
+
+    def wait_updates(self, offset, timeout):
+        with self._new_updates:
+            self._new_updates.wait_for(
+                lambda: any(u['update_id'] >= offset for u in self.updates),
+                timeout=timeout)
+            # Как в Telegram: offset подтверждает все более ранние апдейты
+            self.updates = [u for u in self.updates
+                            if u['update_id'] >= offset]
+            return list(self.updates)
+
+
+def create_app(state):
+    app = Flask(__name__)
+    bot = f"/bot{state.bot_token}"
+
+    @app.before_request
+    def latency_and_faults():
+        state.requests.append((request.method, request.path))
+        state.delay()
+        fault = state.take_fault(request.path)
+        if fault is None:
+            return None
+        if request.path.startswith('/bot'):
+            body = {'ok': False, 'error_code': fault['status'],
+                    'description': 'Injected error'}
+            if fault['retry_after'] is not None:
+                body['parameters'] = {'retry_after': fault['retry_after']}
+        else:
+            body = {'message': 'Injected error'}
+        return jsonify(body), fault['status']
+
+    # --- aifromspace ---
+
+    @app.post('/api/auth/login')
+    def login():
+        data = request.get_json(silent=True) or {}
+        if (data.get('email'), data.get('password')) != (
+                state.email, state.password):
+            return jsonify({'message': 'Invalid email or password'}), 401
+        return jsonify({
+            'accessToken': state.issue_token(),
+            'user': {'email': state.email},
+        })
+
+    @app.get('/api/user')
+    def user():
+        token = request.headers.get('Authorization', '')
+        if token.removeprefix('Bearer ') not in state.tokens:
+            return jsonify({'message': 'Unauthorized'}), 401
+        return jsonify({'email': state.email})
+
+    # --- Страница-заменитель дашборда и ассистента ---
+
+    @app.get('/dashboard')
+    def dashboard():
+        return STANDIN_DASHBOARD
+
+    @app.get('/embed.aifromspace.com/assistant')
+    def assistant():
+        return STANDIN_ASSISTANT
+
+    @app.post('/embed.aifromspace.com/api/chat')
+    def assistant_chat():
+        prompt = (request.get_json(silent=True) or {}).get('prompt', '')
+        words = [f'Ответ на «{prompt}»:'] + [
+            f'слово{i}' for i in range(1, state.assistant_tokens)]
+
+        def stream():
+            time.sleep(state.assistant_first_token)
+            for i, word in enumerate(words):
+                if i:
+                    time.sleep(state.assistant_token_interval)
+                yield (' ' if i else '') + word
+        return Response(stream(), mimetype='text/plain',
+                        headers={'X-Content-Type-Options': 'nosniff',
+                                 'Cache-Control': 'no-store'})
+
+    # --- Telegram Bot API ---
+
+    @app.route(f'{bot}/getMe', methods=['GET', 'POST'])
+    def get_me():
+        return jsonify({'ok': True, 'result': {
+            'id': 1, 'is_bot': True,
+            'first_name': 'Stub', 'username': 'stub_bot',
+        }})
+
+    @app.post(f'{bot}/sendMessage')
+    def send_message():
+        data = request.get_json(silent=True) or {}
+        if not data.get('chat_id') or not data.get('text'):
+            return jsonify({'ok': False, 'error_code': 400,
+                            'description': 'Bad Request'}), 400
+        return jsonify({'ok': True, 'result': state.store_message(
+            data['chat_id'], data['text'])})
+
+    @app.route(f'{bot}/getUpdates', methods=['GET', 'POST'])
+    def get_updates():
+        params = {**request.args, **(request.get_json(silent=True) or {})}
+        offset = int(params.get('offset') or 0)
+        timeout = float(params.get('timeout') or 0)
+        return jsonify({'ok': True,
+                        'result': state.wait_updates(offset, timeout)})
+
+    return app
+
+
+class StubServer:
+    """Запускает стенд на свободном порту 127.0.0.1 в фоновом потоке."""
+
+    def __init__(self, email='user@example.com', password='Password123',
+                 bot_token='123456:stub-token'):
+        self.state = StubState(email, password, bot_token)
+        self._server = make_server('127.0.0.1', 0, create_app(self.state),
+                                   threaded=True)
+        self.url = f"http://127.0.0.1:{self._server.server_port}"
+        # Короткий poll_interval, чтобы остановка не ждала полсекунды
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        kwargs={'poll_interval': 0.05},
+                                        daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,94 @@
+import os
+
+from utils.intent_matcher import load_matcher
+from utils.settings import setting
+
+from .base_api import build_session
+
+
+class TelegramBot:
+    """Класс для работы с Telegram Bot API"""
+    
+    API_BASE = setting('telegram_api_base')
+
+    def __init__(self, token, session=None):
+        self.token = token
+        self.api_url = f"{self.API_BASE}/bot{token}"
+        # Общая сессия с пулом соединений: без неё каждый вызов
+        # заново делает TCP+TLS рукопожатие с api.telegram.org
+        self.session = session or build_session()
+    
+    def send_message(self, chat_id, text):
+        """Отправляет сообщение в чат"""
+        url = f"{self.api_url}/sendMessage"
+        payload = {"chat_id": chat_id, "text": text}
+        response = self.session.post(url, json=payload)
+        return response
+    
+    def process_start_command(self, chat_id):
+        """Обрабатывает команду /start и отправляет приветственное сообщение"""
+        welcome_message = "Добро пожаловать! Я тестовый бот. Как дела?"
+        return self.send_message(chat_id, welcome_message)
+    
+    def get_updates(self, offset=None):
+        """Получает обновления от Telegram API"""
+        url = f"{self.api_url}/getUpdates"
+        params = {"offset": offset} if offset else None
+        response = self.session.get(url, params=params)
+        return response
+
+    def get_me(self):
+        """Возвращает информацию о боте (проверка токена и соединения)"""
+        url = f"{self.api_url}/getMe"
+        response = self.session.get(url)
+        return response
+    
+    def process_task_question(self, chat_id):
+        """Обрабатывает вопрос о основной задаче бота"""
+        task_response = "проверка работы платформы"
+        return self.send_message(chat_id, task_response)
+
+
+class BotLogic:
+    """Класс для имитации логики обработки сообщений ботом"""
+
+    # Таблица правил: порядок правил задаёт их приоритет
+    RULES_FILE = os.path.join(os.path.dirname(__file__), 'bot_rules.json')
+
+    def __init__(self, rules_file=None):
+        self.matcher = load_matcher(rules_file or self.RULES_FILE)
+
+    def process_message(self, message_text):
+        """Обрабатывает входящее сообщение и возвращает ответ бота"""
+        return self.matcher.match(message_text)
+
+
+class TelegramBotInteraction:
+    """Класс для реального взаимодействия с ботом (отправка вопроса + получение ответа)"""
+    
+    def __init__(self, token, session=None):
+        self.bot = TelegramBot(token, session=session)
+        self.bot_logic = BotLogic()
+    
+    def ask_question_and_get_response(self, chat_id, question):
+        """
+        Имитирует реальное взаимодействие:
+        1. Пользователь отправляет вопрос
+        2. Бот обрабатывает вопрос через свою логику
+        3. Бот отправляет ответ
+        """
+        # Шаг 1: Имитируем получение вопроса от пользователя
+        print(f"👤 Пользователь спрашивает: '{question}'")
+        
+        # Шаг 2: Бот обрабатывает вопрос через свою логику
+        bot_response = self.bot_logic.process_message(question)
+        print(f"🤖 Бот думает и решает ответить: '{bot_response}'")
+        
+        # Шаг 3: Бот отправляет ответ пользователю
+        response = self.bot.send_message(chat_id, bot_response)
+        
+        return {
+            "question": question,
+            "bot_response": bot_response,
+            "api_response": response
+        }
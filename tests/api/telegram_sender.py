@@ -0,0 +1,139 @@
+"""
+Очередь массовой отправки сообщений в Telegram с ограничением скорости.
+
+Сообщения копятся в очереди и отправляются одним flush():
+сообщения в один чат склеиваются до лимита Telegram в 4096 символов,
+чаты отправляются параллельно через общий пул соединений, а скорость
+ограничивается token bucket'ами на каждый чат и на бота в целом.
+Ответ 429 с retry_after выдерживается и запрос повторяется.
+
+    queue = SendQueue(token)
+    for report in failures:
+        queue.add(chat_id, report)
+    stats = queue.send_all()   # {'sent': ..., 'throttled': ..., 'failed': ...}
+"""
+import asyncio
+import time
+
+import httpx
+
+from .telegram_bot import TelegramBot
+
+MESSAGE_LIMIT = 4096
+
+
+class TokenBucket:
+    """Не больше rate событий в секунду, всплеск до capacity."""
+
+    def __init__(self, rate, capacity=1, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+
+    def reserve(self):
+        """Забирает токен и возвращает, сколько секунд нужно подождать."""
+        now = self.clock()
+        self._tokens = min(self.capacity,
+                           self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.rate
+
+    async def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+def coalesce(texts, limit=MESSAGE_LIMIT, separator='\n\n'):
+    """Склеивает тексты в сообщения не длиннее limit, сохраняя порядок."""
+    messages = []
+    current = ''
+    for text in texts:
+        # Слишком длинный текст режется на куски по limit
+        pieces = [text[i:i + limit]
+                  for i in range(0, len(text), limit)] or ['']
+        for piece in pieces:
+            if not current:
+                current = piece
+            elif len(current) + len(separator) + len(piece) <= limit:
+                current += separator + piece
+            else:
+                messages.append(current)
+                current = piece
+    if current:
+        messages.append(current)
+    return messages
+
+
+class SendQueue:
+
+    def __init__(self, token, api_base=None, per_chat_rate=1.0,
+                 global_rate=30.0, max_retries=3, concurrency=10,
+                 retry_delay=1.0):
+        self.api_url = f"{api_base or TelegramBot.API_BASE}/bot{token}"
+        self.per_chat_rate = per_chat_rate
+        self.global_bucket = TokenBucket(global_rate, capacity=global_rate)
+        self.max_retries = max_retries
+        self.concurrency = concurrency
+        self.retry_delay = retry_delay
+        self.stats = {'queued': 0, 'requests': 0, 'sent': 0,
+                      'throttled': 0, 'failed': 0}
+        self._pending = {}
+
+    def add(self, chat_id, text):
+        self._pending.setdefault(chat_id, []).append(text)
+        self.stats['queued'] += 1
+
+    def send_all(self):
+        """Синхронная обёртка над flush() для обычных тестов и хуков."""
+        return asyncio.run(self.flush())
+
+    async def flush(self):
+        pending, self._pending = self._pending, {}
+        limits = httpx.Limits(max_connections=self.concurrency)
+        async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+            await asyncio.gather(*(
+                self._send_chat(client, chat_id, coalesce(texts))
+                for chat_id, texts in pending.items()
+            ))
+        return dict(self.stats)
+
+    # --- Helpers ---
+
+    async def _send_chat(self, client, chat_id, messages):
+        # В один чат сообщения уходят строго по порядку
+        bucket = TokenBucket(self.per_chat_rate)
+        for text in messages:
+            await bucket.acquire()
+            if await self._send(client, chat_id, text):
+                self.stats['sent'] += 1
+            else:
+                self.stats['failed'] += 1
+
+    async def _send(self, client, chat_id, text):
+        for _ in range(self.max_retries + 1):
+            await self.global_bucket.acquire()
+            self.stats['requests'] += 1
+            try:
+                response = await client.post(
+                    f"{self.api_url}/sendMessage",
+                    json={"chat_id": chat_id, "text": text})
+            except httpx.HTTPError:
+                await asyncio.sleep(self.retry_delay)
+                continue
+            if response.status_code == 429:
+                self.stats['throttled'] += 1
+                retry_after = response.json().get(
+                    'parameters', {}).get('retry_after', self.retry_delay)
+                await asyncio.sleep(retry_after)
+                continue
+            if response.status_code >= 500:
+                await asyncio.sleep(self.retry_delay)
+                continue
+            return response.status_code == 200
+        return False
@@ -0,0 +1,180 @@
+"""
+Асинхронный поток обновлений Telegram (long polling getUpdates).
+
+UpdateStream держит один долгий запрос getUpdates, подтверждает
+полученные апдейты через offset и раздаёт их обработчикам параллельно.
+Очередь между опросом и обработчиками ограничена: если обработчики не
+успевают, опрос ждёт, и новые апдейты не подтверждаются раньше времени.
+Тест может дождаться нужного апдейта вместо sleep:
+
+    async with UpdateStream(token, handlers=[handler]) as stream:
+        ...
+        update = await stream.wait_for(lambda u: ..., timeout=10)
+"""
+import asyncio
+import inspect
+import logging
+from collections import deque
+
+import httpx
+
+from .telegram_bot import TelegramBot
+
+logger = logging.getLogger(__name__)
+
+
+class UpdateStream:
+
+    def __init__(self, token, handlers=(), api_base=None, poll_timeout=25,
+                 allowed_updates=('message',), limit=100, concurrency=4,
+                 queue_size=100, history=1000):
+        self.api_url = f"{api_base or TelegramBot.API_BASE}/bot{token}"
+        self.handlers = list(handlers)
+        self.poll_timeout = poll_timeout
+        self.allowed_updates = list(allowed_updates)
+        self.limit = limit
+        self.concurrency = concurrency
+        self.offset = None
+        self.stats = {'polls': 0, 'batches': 0, 'updates': 0,
+                      'handled': 0, 'errors': 0}
+        self._queue = asyncio.Queue(maxsize=queue_size)
+        self._history = deque(maxlen=history)
+        self._waiters = []
+        self._tasks = []
+        self._client = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def start(self):
+        # Таймаут чтения больше, чем long poll, иначе запрос оборвётся сам
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(10, read=self.poll_timeout + 10))
+        self._tasks = [asyncio.create_task(self._poll())]
+        self._tasks += [asyncio.create_task(self._dispatch())
+                        for _ in range(self.concurrency)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def wait_for(self, predicate, timeout):
+        """
+        Ждёт первый апдейт, для которого predicate(update) истинно.
+        Уже полученные апдейты тоже проверяются, поэтому ответ,
+        пришедший раньше вызова, не потеряется.
+        """
+        for update in self._history:
+            if predicate(update):
+                return update
+        future = asyncio.get_running_loop().create_future()
+        waiter = (predicate, future)
+        self._waiters.append(waiter)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._waiters.remove(waiter)
+
+    async def drain(self):
+        """Ждёт, пока обработчики разберут всё, что уже в очереди."""
+        await self._queue.join()
+
+    # --- Helpers ---
+
+    async def _poll(self):
+        delay = 0
+        while True:
+            try:
+                updates = await self._get_updates()
+                delay = 0
+            except (httpx.HTTPError, ValueError) as error:
+                self.stats['errors'] += 1
+                # Бэкофф при ошибках сети, но не больше 30 секунд
+                delay = min(max(delay * 2, 0.5), 30)
+                logger.warning('getUpdates failed: %s, retry in %ss',
+                               error, delay)
+                await asyncio.sleep(delay)
+                continue
+            if not updates:
+                continue
+            self.stats['batches'] += 1
+            for update in updates:
+                self._history.append(update)
+                self._notify(update)
+                await self._queue.put(update)
+            # Подтверждаем батч только после того, как он весь в очереди
+            self.offset = updates[-1]['update_id'] + 1
+
+    async def _get_updates(self):
+        payload = {'timeout': self.poll_timeout, 'limit': self.limit,
+                   'allowed_updates': self.allowed_updates}
+        if self.offset is not None:
+            payload['offset'] = self.offset
+        self.stats['polls'] += 1
+        response = await self._client.post(f"{self.api_url}/getUpdates",
+                                           json=payload)
+        data = response.json()
+        if not data.get('ok'):
+            retry_after = data.get('parameters', {}).get('retry_after')
+            if retry_after:
+                await asyncio.sleep(retry_after)
+            raise ValueError(data.get('description', 'getUpdates failed'))
+        if 'result' not in data:
+            raise ValueError('getUpdates: в ответе нет result')
+        updates = data['result']
+        self.stats['updates'] += len(updates)
+        return updates
+
+    def _notify(self, update):
+        for predicate, future in self._waiters:
+            if future.done():
+                continue
+            try:
+                matched = predicate(update)
+            except Exception as error:
+                # Ошибка в условии теста (например, u['message'] у апдейта
+                # без сообщения) — падает wait_for, а не опрос
+                future.set_exception(error)
+                continue
+            if matched:
+                future.set_result(update)
+
+    async def _dispatch(self):
+        while True:
+            update = await self._queue.get()
+            try:
+                for handler in self.handlers:
+                    if inspect.iscoroutinefunction(handler):
+                        await handler(update)
+                    else:
+                        # Синхронные обработчики (BotLogic, requests)
+                        # не должны блокировать цикл событий
+                        await asyncio.to_thread(handler, update)
+                self.stats['handled'] += 1
+            except Exception:
+                self.stats['errors'] += 1
+                logger.exception('Update handler failed: %s', update)
+            finally:
+                self._queue.task_done()
+
+
+def reply_handler(interaction):
+    """
+    Обработчик, который отвечает на текстовые сообщения через
+    TelegramBotInteraction (логика BotLogic + sendMessage).
+    """
+    def handle(update):
+        message = update.get('message') or {}
+        if 'text' in message:
+            interaction.ask_question_and_get_response(
+                message['chat']['id'], message['text'])
+    return handle
@@ -1,23 +1,22 @@
 import pytest
-import os
-import requests
-from dotenv import load_dotenv
+
+from utils.settings import settings
+
 from .base_api import BaseApi  # Импортируем наш базовый класс
 
 # Создаём класс для тестов, который наследуется от BaseApi
-load_dotenv()
 
 
 @pytest.mark.api
 class TestApiLogin(BaseApi):
 
-    def test_successful_api_login(self):
+    def test_successful_api_login(self, http_session):
         # Arrange
         # Используем данные из базового класса
         url = self.BASE_URL + self.LOGIN_ENDPOINT
 
-        login = os.getenv('LOGIN')
-        password = os.getenv('PASSWORD')
+        login = settings.login
+        password = settings.password
 
         payload = {
             "email": login,
@@ -26,7 +25,7 @@ class TestApiLogin(BaseApi):
         headers = {"Content-Type": "application/json"}
 
         # Act
-        response = requests.post(url, headers=headers, json=payload)
+        response = http_session.post(url, headers=headers, json=payload)
 
         # Assert
         assert response.status_code == 200
@@ -34,12 +33,12 @@ class TestApiLogin(BaseApi):
         assert "accessToken" in response_data
         assert response_data["user"]["email"] == payload["email"]
 
-    def test_failed_api_login_with_wrong_password(self):
+    def test_failed_api_login_with_wrong_password(self, http_session):
         # Arrange
         # Используем данные из базового класса
         url = self.BASE_URL + self.LOGIN_ENDPOINT
 
-        login = os.getenv('LOGIN')
+        login = settings.login
 
         payload = {
             "email": login,
@@ -48,7 +47,7 @@ class TestApiLogin(BaseApi):
         headers = {"Content-Type": "application/json"}
 
         # Act
-        response = requests.post(url, headers=headers, json=payload)
+        response = http_session.post(url, headers=headers, json=payload)
 
         # Assert
         assert response.status_code == 401
@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+from .base_api import BaseApi, build_session
+from .cassette import Cassette, CassetteMiss, Scrubber, mount_cassette
+from .telegram_bot import TelegramBot
+
+
+def record_login_and_profile(stub_server, path, scrubber):
+    session = build_session()
+    tape = Cassette(str(path), scrubber=scrubber)
+    _, unmount = mount_cassette(session, tape, 'record')
+    login = session.post(stub_server.url + BaseApi.LOGIN_ENDPOINT, json={
+        "email": stub_server.state.email,
+        "password": stub_server.state.password,
+    })
+    session.get(stub_server.url + BaseApi.USER_ENDPOINT, headers={
+        "Authorization": f"Bearer {login.json()['accessToken']}"})
+    unmount()
+    tape.save('record')
+    return login
+
+
+@pytest.mark.api
+def test_recorded_exchange_replays_without_network(stub_server, tmp_path):
+    path = tmp_path / 'login.json'
+    record_login_and_profile(stub_server, path, Scrubber())
+    stub_server.stop()
+
+    session = build_session()
+    adapter, _ = mount_cassette(session, Cassette(str(path)), 'replay')
+    user = session.get(stub_server.url + BaseApi.USER_ENDPOINT)
+
+    assert user.status_code == 200
+    assert user.json()["email"] == stub_server.state.email
+    assert adapter.hits == 1
+    assert user.from_cassette
+    with pytest.raises(CassetteMiss):
+        session.get(stub_server.url + '/api/unknown')
+
+
+@pytest.mark.api
+def test_replayed_response_can_be_streamed(stub_server, tmp_path):
+    path = tmp_path / 'login.json'
+    record_login_and_profile(stub_server, path, Scrubber())
+    stub_server.stop()
+
+    session = build_session()
+    mount_cassette(session, Cassette(str(path)), 'replay')
+    user = session.get(stub_server.url + BaseApi.USER_ENDPOINT, stream=True)
+
+    body = b''.join(user.iter_content(chunk_size=8))
+    assert json.loads(body)["email"] == stub_server.state.email
+    assert b''.join(user.iter_lines()) == body.replace(b'\n', b'')
+    assert user.raw.read() == body
+@pytest.mark.api
+def test_cassette_contains_no_secrets(stub_server, tmp_path):
+    path = tmp_path / 'login.json'
+    scrubber = Scrubber({stub_server.state.password: '<PASSWORD>'})
+
+    login = record_login_and_profile(stub_server, path, scrubber)
+
+    text = path.read_text(encoding='utf-8')
+    assert login.json()['accessToken'] not in text
+    assert stub_server.state.password not in text
+    assert 'Bearer' not in text
+    assert '<PASSWORD>' in json.loads(text)['interactions'][0]['request'][
+        'body']
+
+
+@pytest.mark.telega
+def test_bot_token_is_scrubbed_and_match_on_path(stub_server, tmp_path):
+    path = tmp_path / 'bot.json'
+    token = stub_server.state.bot_token
+    scrubber = Scrubber({token: '123456:placeholder'})
+    bot = TelegramBot(token, session=build_session())
+    bot.api_url = f"{stub_server.url}/bot{token}"
+    tape = Cassette(str(path), scrubber=scrubber)
+    mount_cassette(bot.session, tape, 'record')
+    bot.get_me()
+    tape.save('record')
+    assert token not in path.read_text(encoding='utf-8')
+
+    # Другой хост, тот же путь: с match_on=path ответ находится
+    replay = TelegramBot('123456:placeholder', session=build_session())
+    replay.api_url = "http://replay.invalid/bot123456:placeholder"
+    mount_cassette(replay.session,
+                   Cassette(str(path), match_on=('method', 'path')),
+                   'replay')
+
+    assert replay.get_me().json()["result"]["is_bot"] is True
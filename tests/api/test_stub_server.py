@@ -0,0 +1,73 @@
+import time
+
+import pytest
+
+from .base_api import BaseApi, build_session
+from .telegram_bot import TelegramBot
+
+
+@pytest.mark.api
+def test_stub_login_and_profile(stub_server):
+    session = build_session()
+    login = session.post(stub_server.url + BaseApi.LOGIN_ENDPOINT, json={
+        "email": stub_server.state.email,
+        "password": stub_server.state.password,
+    })
+    token = login.json()["accessToken"]
+
+    user = session.get(stub_server.url + BaseApi.USER_ENDPOINT,
+                       headers={"Authorization": f"Bearer {token}"})
+
+    assert user.status_code == 200
+    assert user.json()["email"] == stub_server.state.email
+
+
+@pytest.mark.api
+def test_stub_error_injection(stub_server):
+    stub_server.state.inject_error(BaseApi.USER_ENDPOINT, status=503)
+    session = build_session(retries=0)
+
+    first = session.get(stub_server.url + BaseApi.USER_ENDPOINT)
+    second = session.get(stub_server.url + BaseApi.USER_ENDPOINT)
+
+    assert first.status_code == 503
+    assert second.status_code == 401
+
+
+@pytest.mark.telega
+def test_stub_telegram_latency_and_retry_after(stub_server):
+    bot = TelegramBot(stub_server.state.bot_token)
+    bot.api_url = f"{stub_server.url}/bot{bot.token}"
+    stub_server.state.latency = 0.05
+    stub_server.state.inject_error('/sendMessage', status=429, retry_after=3)
+
+    start = time.perf_counter()
+    throttled = bot.send_message(1, "привет")
+    sent = bot.send_message(1, "привет")
+
+    assert time.perf_counter() - start >= 0.1
+    assert throttled.json()["parameters"]["retry_after"] == 3
+    assert sent.json()["result"]["text"] == "привет"
+
+
+@pytest.mark.api
+def test_stub_assistant_streams_answer_word_by_word(stub_server):
+    stub_server.state.assistant_first_token = 0.1
+    stub_server.state.assistant_token_interval = 0.01
+    stub_server.state.assistant_tokens = 5
+    session = build_session()
+
+    dashboard = session.get(stub_server.url + "/dashboard")
+    start = time.perf_counter()
+    response = session.post(
+        stub_server.url + "/embed.aifromspace.com/api/chat",
+        json={"prompt": "привет"}, stream=True)
+    chunks = []
+    for chunk in response.iter_content(chunk_size=None):
+        chunks.append((time.perf_counter() - start, chunk.decode("utf-8")))
+
+    assert "embed.aifromspace.com" in dashboard.text
+    assert len(chunks) == 5
+    assert chunks[0][0] >= 0.1
+    assert "".join(text for _, text in chunks).startswith(
+        "Ответ на «привет»: слово1")
@@ -1,115 +1,20 @@
-import requests
 import pytest
-import os
 import time
 from unittest.mock import patch, Mock
-from dotenv import load_dotenv
 
-load_dotenv()
+from utils.settings import settings
 
-BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
-CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
-TELEGRAM_API_URL = f"https://api.telegram.org/bot{BOT_TOKEN}"
-
-
-class TelegramBot:
-    """Класс для работы с Telegram Bot API"""
-    
-    def __init__(self, token):
-        self.token = token
-        self.api_url = f"https://api.telegram.org/bot{token}"
-    
-    def send_message(self, chat_id, text):
-        """Отправляет сообщение в чат"""
-        url = f"{self.api_url}/sendMessage"
-        payload = {"chat_id": chat_id, "text": text}
-        response = requests.post(url, json=payload)
-        return response
-    
-    def process_start_command(self, chat_id):
-        """Обрабатывает команду /start и отправляет приветственное сообщение"""
-        welcome_message = "Добро пожаловать! Я тестовый бот. Как дела?"
-        return self.send_message(chat_id, welcome_message)
-    
-    def get_updates(self, offset=None):
-        """Получает обновления от Telegram API"""
-        url = f"{self.api_url}/getUpdates"
-        if offset:
-            url += f"?offset={offset}"
-        response = requests.get(url)
-        return response
-    
-    def process_task_question(self, chat_id):
-        """Обрабатывает вопрос о основной задаче бота"""
-        task_response = "проверка работы платформы"
-        return self.send_message(chat_id, task_response)
-
-
-class BotLogic:
-    """Класс для имитации логики обработки сообщений ботом"""
-    
-    @staticmethod
-    def process_message(message_text):
-        """Обрабатывает входящее сообщение и возвращает ответ бота"""
-        message_lower = message_text.lower().strip()
-        
-        # Обработка команды /start
-        if message_lower == "/start":
-            return "Добро пожаловать! Я тестовый бот. Как дела?"
-        
-        # Обработка вопроса о основной задаче
-        if "основную задачу" in message_lower and "системного сообщения" in message_lower:
-            return "проверка работы платформы"
-        
-        # Обработка других приветствий
-        if any(word in message_lower for word in ["привет", "hello", "hi"]):
-            if "основную задачу" in message_lower:
-                return "проверка работы платформы"
-            return "Привет! Как дела?"
-        
-        # Ответ по умолчанию
-        return "Извините, я не понимаю ваш вопрос."
-
-
-class TelegramBotInteraction:
-    """Класс для реального взаимодействия с ботом (отправка вопроса + получение ответа)"""
-    
-    def __init__(self, token):
-        self.bot = TelegramBot(token)
-        self.bot_logic = BotLogic()
-    
-    def ask_question_and_get_response(self, chat_id, question):
-        """
-        Имитирует реальное взаимодействие:
-        1. Пользователь отправляет вопрос
-        2. Бот обрабатывает вопрос через свою логику
-        3. Бот отправляет ответ
-        """
-        # Шаг 1: Имитируем получение вопроса от пользователя
-        print(f"👤 Пользователь спрашивает: '{question}'")
-        
-        # Шаг 2: Бот обрабатывает вопрос через свою логику
-        bot_response = self.bot_logic.process_message(question)
-        print(f"🤖 Бот думает и решает ответить: '{bot_response}'")
-        
-        # Шаг 3: Бот отправляет ответ пользователю
-        response = self.bot.send_message(chat_id, bot_response)
-        
-        return {
-            "question": question,
-            "bot_response": bot_response,
-            "api_response": response
-        }
+from .telegram_bot import TelegramBot, BotLogic, TelegramBotInteraction
 
 
 @pytest.mark.telega
-def test_bot_responds_to_start_command():
+def test_bot_responds_to_start_command(telegram_bot):
     """Тест проверяет, что бот правильно отвечает на команду /start"""
     # --- Arrange (Подготовка) ---
-    bot = TelegramBot(BOT_TOKEN)
+    bot = telegram_bot
     
     # --- Act (Действие) ---
-    response = bot.process_start_command(CHAT_ID)
+    response = bot.process_start_command(settings.telegram_chat_id)
     
     # --- Assert (Проверка) ---
     assert response.status_code == 200, "Не удалось отправить приветственное сообщение"
@@ -125,7 +30,7 @@ def test_bot_responds_to_start_command():
 
 
 @pytest.mark.telega
-@patch('requests.post')
+@patch('requests.Session.post')
 def test_bot_start_command_with_mock(mock_post):
     """Тест с использованием mock для симуляции ответа Telegram API"""
     # --- Arrange (Подготовка mock) ---
@@ -137,24 +42,24 @@ def test_bot_start_command_with_mock(mock_post):
         "result": {
             "message_id": 123,
             "text": "Добро пожаловать! Я тестовый бот. Как дела?",
-            "chat": {"id": int(CHAT_ID)},
+            "chat": {"id": int(settings.telegram_chat_id)},
             "date": int(time.time())
         }
     }
     mock_post.return_value = mock_response
     
     # --- Act (Действие) ---
-    bot = TelegramBot(BOT_TOKEN)
-    response = bot.process_start_command(CHAT_ID)
+    bot = TelegramBot(settings.telegram_bot_token)
+    response = bot.process_start_command(settings.telegram_chat_id)
     
     # --- Assert (Проверка) ---
-    # Проверяем, что requests.post был вызван с правильными параметрами
+    # Проверяем, что session.post был вызван с правильными параметрами
     mock_post.assert_called_once()
     call_args = mock_post.call_args
     
     # Проверяем URL
-    expected_url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
-    assert call_args[1]['json']['chat_id'] == CHAT_ID
+    expected_url = f"{settings.telegram_api_url}/sendMessage"
+    assert call_args[1]['json']['chat_id'] == settings.telegram_chat_id
     assert "Добро пожаловать" in call_args[1]['json']['text']
     
     # Проверяем ответ
@@ -167,13 +72,10 @@ def test_bot_start_command_with_mock(mock_post):
 
 
 @pytest.mark.telega
-def test_telegram_api_connection():
+def test_telegram_api_connection(telegram_bot):
     """Простой тест для проверки подключения к Telegram API"""
-    # --- Arrange ---
-    url = f"https://api.telegram.org/bot{BOT_TOKEN}/getMe"
-    
     # --- Act ---
-    response = requests.get(url)
+    response = telegram_bot.get_me()
     
     # --- Assert ---
     assert response.status_code == 200, "Не удалось подключиться к Telegram API"
@@ -188,17 +90,17 @@ def test_telegram_api_connection():
 
 
 @pytest.mark.telega
-def test_bot_task_response():
+def test_bot_task_response(telegram_bot):
     """
     УСТАРЕВШИЙ ТЕСТ - НЕ ДЕЛАЕТ РЕАЛЬНОГО ТЕСТИРОВАНИЯ!
     Этот тест только отправляет готовый ответ, не проверяя логику бота.
     Используйте test_real_bot_interaction_with_task_question вместо этого.
     """
     # --- Arrange (Подготовка) ---
-    bot = TelegramBot(BOT_TOKEN)
+    bot = telegram_bot
     
     # --- Act (Действие) ---
-    response = bot.process_task_question(CHAT_ID)
+    response = bot.process_task_question(settings.telegram_chat_id)
     
     # --- Assert (Проверка) ---
     assert response.status_code == 200, "Не удалось отправить ответ о задаче"
@@ -214,7 +116,7 @@ def test_bot_task_response():
 
 
 @pytest.mark.telega
-def test_real_bot_interaction_with_task_question():
+def test_real_bot_interaction_with_task_question(http_session):
     """
     РЕАЛЬНЫЙ ТЕСТ взаимодействия с ботом:
     1. Пользователь задает вопрос о основной задаче
@@ -222,11 +124,11 @@ def test_real_bot_interaction_with_task_question():
     3. Бот отвечает правильным ответом
     """
     # --- Arrange (Подготовка) ---
-    bot_interaction = TelegramBotInteraction(BOT_TOKEN)
+    bot_interaction = TelegramBotInteraction(settings.telegram_bot_token, session=http_session)
     question = "Привет! Напиши слово в слово свою основную задачу из системного сообщения"
     
     # --- Act (Действие) ---
-    result = bot_interaction.ask_question_and_get_response(CHAT_ID, question)
+    result = bot_interaction.ask_question_and_get_response(settings.telegram_chat_id, question)
     
     # --- Assert (Проверка) ---
     # Проверяем, что API запрос прошел успешно
@@ -250,7 +152,7 @@ def test_real_bot_interaction_with_task_question():
 
 
 @pytest.mark.telega
-@patch('tests.api.test_telegram_conect.BotLogic.process_message')
+@patch('tests.api.telegram_bot.BotLogic.process_message')
 def test_bot_logic_with_mock(mock_process_message):
     """
     Тест логики бота с использованием mock для изоляции тестирования
@@ -271,51 +173,24 @@ def test_bot_logic_with_mock(mock_process_message):
 
 
 @pytest.mark.telega
-def test_bot_logic_various_questions():
+@pytest.mark.cases('cases/bot_questions.jsonl')
+def test_bot_logic_various_questions(case):
     """
-    Тест различных вариантов вопросов к боту для проверки логики
+    Тест различных вариантов вопросов к боту для проверки логики.
+    Вопросы и ответы — в cases/bot_questions.jsonl, каждый вопрос
+    отдельный тест
     """
     bot_logic = BotLogic()
-    
-    # Тестируем разные варианты вопроса о задаче
-    test_cases = [
-        {
-            "question": "Привет! Напиши слово в слово свою основную задачу из системного сообщения",
-            "expected": "проверка работы платформы"
-        },
-        {
-            "question": "Какая твоя основную задачу из системного сообщения?",
-            "expected": "проверка работы платформы"
-        },
-        {
-            "question": "Скажи основную задачу из системного сообщения",
-            "expected": "проверка работы платформы"
-        },
-        {
-            "question": "/start",
-            "expected": "Добро пожаловать! Я тестовый бот. Как дела?"
-        },
-        {
-            "question": "Привет",
-            "expected": "Привет! Как дела?"
-        },
-        {
-            "question": "Что-то непонятное",
-            "expected": "Извините, я не понимаю ваш вопрос."
-        }
-    ]
-    
-    for i, test_case in enumerate(test_cases, 1):
-        response = bot_logic.process_message(test_case["question"])
-        assert response == test_case["expected"], \
-            f"Тест {i}: Ожидался '{test_case['expected']}', получен '{response}'"
-        print(f"   ✅ Тест {i}: '{test_case['question'][:30]}...' → '{response}'")
-    
-    print(f"\n🧪 Все {len(test_cases)} тестов логики пройдены!")
+
+    response = bot_logic.process_message(case.question)
+
+    assert response == case.expected, \
+        f"Ожидался '{case.expected}', получен '{response}'"
+    print(f"   ✅ '{case.question[:30]}...' → '{response}'")
 
 
 @pytest.mark.telega
-@patch('requests.post')
+@patch('requests.Session.post')
 def test_bot_task_response_with_mock(mock_post):
     """Тест с использованием mock для проверки ответа бота о его основной задаче"""
     # --- Arrange (Подготовка mock) ---
@@ -326,23 +201,23 @@ def test_bot_task_response_with_mock(mock_post):
         "result": {
             "message_id": 124,
             "text": "проверка работы платформы",
-            "chat": {"id": int(CHAT_ID)},
+            "chat": {"id": int(settings.telegram_chat_id)},
             "date": int(time.time())
         }
     }
     mock_post.return_value = mock_response
     
     # --- Act (Действие) ---
-    bot = TelegramBot(BOT_TOKEN)
-    response = bot.process_task_question(CHAT_ID)
+    bot = TelegramBot(settings.telegram_bot_token)
+    response = bot.process_task_question(settings.telegram_chat_id)
     
     # --- Assert (Проверка) ---
-    # Проверяем, что requests.post был вызван с правильными параметрами
+    # Проверяем, что session.post был вызван с правильными параметрами
     mock_post.assert_called_once()
     call_args = mock_post.call_args
     
     # Проверяем параметры вызова
-    assert call_args[1]['json']['chat_id'] == CHAT_ID
+    assert call_args[1]['json']['chat_id'] == settings.telegram_chat_id
     assert call_args[1]['json']['text'] == "проверка работы платформы"
     
     # Проверяем ответ
@@ -0,0 +1,63 @@
+import time
+
+import pytest
+
+from .telegram_sender import MESSAGE_LIMIT, SendQueue
+
+
+def make_queue(stub_server, **kwargs):
+    return SendQueue(stub_server.state.bot_token, api_base=stub_server.url,
+                     retry_delay=0.05, **kwargs)
+
+
+@pytest.mark.telega
+def test_queue_coalesces_messages_per_chat(stub_server):
+    queue = make_queue(stub_server)
+    for i in range(10):
+        queue.add(1, f"failed test {i}")
+        queue.add(2, f"failed test {i}")
+
+    stats = queue.send_all()
+
+    assert stats['sent'] == 2 and stats['requests'] == 2
+    sent = stub_server.state.sent_messages
+    assert sorted(m['chat']['id'] for m in sent) == [1, 2]
+    assert sent[0]['text'].splitlines()[0] == "failed test 0"
+
+
+@pytest.mark.telega
+def test_queue_honors_retry_after(stub_server):
+    stub_server.state.inject_error('/sendMessage', status=429,
+                                   retry_after=0.3)
+    queue = make_queue(stub_server)
+    queue.add(1, "report")
+
+    start = time.perf_counter()
+    stats = queue.send_all()
+
+    assert time.perf_counter() - start >= 0.3
+    assert stats['throttled'] == 1 and stats['sent'] == 1
+
+
+@pytest.mark.telega
+def test_queue_counts_failed_messages(stub_server):
+    stub_server.state.inject_error('/sendMessage', status=500, times=10)
+    queue = make_queue(stub_server, max_retries=2)
+    queue.add(1, "report")
+
+    stats = queue.send_all()
+
+    assert stats['failed'] == 1 and stats['requests'] == 3
+
+
+@pytest.mark.telega
+def test_per_chat_rate_limit(stub_server):
+    queue = make_queue(stub_server, per_chat_rate=10)
+    for i in range(3):
+        queue.add(1, 'x' * MESSAGE_LIMIT)
+
+    start = time.perf_counter()
+    queue.send_all()
+
+    # Три сообщения в один чат при 10/с: минимум две паузы по 0.1 с
+    assert time.perf_counter() - start >= 0.2
@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from .telegram_bot import TelegramBotInteraction
+from .telegram_updates import UpdateStream, reply_handler
+
+
+def make_stream(stub_server, **kwargs):
+    return UpdateStream(stub_server.state.bot_token, api_base=stub_server.url,
+                        poll_timeout=1, **kwargs)
+
+
+@pytest.mark.telega
+def test_stream_replies_to_incoming_message(stub_server):
+    state = stub_server.state
+    interaction = TelegramBotInteraction(state.bot_token)
+    interaction.bot.api_url = f"{stub_server.url}/bot{state.bot_token}"
+
+    async def scenario():
+        async with make_stream(
+                stub_server, handlers=[reply_handler(interaction)]) as stream:
+            state.push_update("/start", chat_id=42)
+            update = await stream.wait_for(
+                lambda u: u['message']['text'] == "/start", timeout=5)
+            await stream.drain()
+            return update, stream.offset
+
+    update, offset = asyncio.run(scenario())
+
+    assert offset == update['update_id'] + 1
+    assert state.sent_messages[-1]['chat']['id'] == 42
+    assert state.sent_messages[-1]['text'].startswith("Добро пожаловать")
+
+
+@pytest.mark.telega
+def test_stream_dispatches_batch_concurrently(stub_server):
+    handled = []
+    active = []
+    peak = []
+    all_started = asyncio.Event()
+
+    async def slow_handler(update):
+        # Обработчик ждёт, пока запустятся все пять: при последовательной
+        # раздаче первый не дождётся остальных и пик останется 1
+        active.append(update['update_id'])
+        peak.append(len(active))
+        if len(active) == 5:
+            all_started.set()
+        await asyncio.wait_for(all_started.wait(), timeout=5)
+        active.remove(update['update_id'])
+        handled.append(update['update_id'])
+
+    async def scenario():
+        async with make_stream(stub_server, handlers=[slow_handler],
+                               concurrency=5) as stream:
+            for i in range(5):
+                stub_server.state.push_update(f"msg {i}")
+            await stream.wait_for(
+                lambda u: u['message']['text'] == "msg 4", timeout=5)
+            await stream.drain()
+
+    asyncio.run(scenario())
+
+    assert sorted(handled) == [1, 2, 3, 4, 5]
+    assert max(peak) == 5
+
+
+@pytest.mark.telega
+def test_wait_for_times_out(stub_server):
+    async def scenario():
+        async with make_stream(stub_server) as stream:
+            await stream.wait_for(lambda u: True, timeout=0.3)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(scenario())
+
+
+@pytest.mark.telega
+def test_failing_predicate_fails_wait_for_not_polling(stub_server):
+    async def scenario():
+        async with make_stream(stub_server) as stream:
+            stub_server.state.push_update("first")
+            with pytest.raises(KeyError):
+                await stream.wait_for(lambda u: u['callback_query'],
+                                      timeout=5)
+            stub_server.state.push_update("second")
+            return await stream.wait_for(
+                lambda u: u['message']['text'] == "second", timeout=5)
+
+    update = asyncio.run(scenario())
+
+    assert update['message']['text'] == "second"
+
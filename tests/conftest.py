@@ -0,0 +1,161 @@
+import os
+import re
+
+import pytest
+
+from utils.settings import settings
+
+# Модули API (requests, filelock) импортируются внутри фикстур, чтобы
+# `pytest -m unit` не тянул их при сборке
+
+# Переключатели прогона (API_STUB, API_CASSETTES) берутся из окружения
+# команды, а не из .env: так их видно ещё до загрузки настроек.
+#
+# API_STUB=1 гоняет api и telega тесты против локального стенда
+# (tests/api/stub_server.py) вместо app.aifromspace.com и api.telegram.org
+USE_STUB = os.getenv('API_STUB') == '1'
+STUB_ENV = {
+    'LOGIN': 'user@example.com',
+    'PASSWORD': 'Password123',
+    'TELEGRAM_BOT_TOKEN': '123456:stub-token',
+    'TELEGRAM_CHAT_ID': '1',
+}
+# API_CASSETTES=record|new|replay пишет/воспроизводит HTTP-обмен
+# api и telega тестов из tests/cassettes (см. tests/api/cassette.py)
+CASSETTE_MODE = os.getenv('API_CASSETTES', 'off')
+CASSETTE_DIR = os.path.join(os.path.dirname(__file__), 'cassettes')
+
+
+def use_stub_env():
+    """
+    Подставляет учётные данные стенда туда, где их нет в окружении
+    и .env. Вызывается из фикстуры, а не при импорте: `pytest -m unit`
+    с API_STUB=1 в окружении не должен читать .env.
+    """
+    # Значения из .env важнее заглушек, поэтому сначала читаем его
+    settings.load()
+    for name, value in STUB_ENV.items():
+        os.environ.setdefault(name, value)
+
+
+def start_stub_server():
+    from tests.api.stub_server import StubServer
+
+    return StubServer(
+        email=settings.login,
+        password=settings.password,
+        bot_token=settings.telegram_bot_token,
+    ).start()
+
+
+@pytest.fixture(scope='session', autouse=True)
+def stub_backend():
+    """При API_STUB=1 направляет API и Telegram на локальный стенд."""
+    if USE_STUB or CASSETTE_MODE == 'replay':
+        use_stub_env()
+    if not USE_STUB:
+        yield None
+        return
+    server = start_stub_server()
+    patcher = pytest.MonkeyPatch()
+    patcher.setenv('API_BASE_URL', server.url)
+    patcher.setenv('TELEGRAM_API_BASE', server.url)
+    yield server
+    patcher.undo()
+    server.stop()
+
+
+@pytest.fixture
+def stub_server():
+    """Отдельный стенд на тест: задержки и ошибки не влияют на соседей."""
+    from tests.api.stub_server import StubServer
+
+    with StubServer() as server:
+        yield server
+
+
+@pytest.fixture(scope='session')
+def http_session():
+    """
+    Одна сессия с пулом keep-alive соединений на весь прогон.
+    При запуске через xdist у каждого воркера своя сессия.
+    """
+    from tests.api.base_api import build_session
+
+    session = build_session()
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope='session')
+def cassette_secrets(stub_backend):
+    """Реальные секреты, которые в кассетах заменяются заглушками стенда."""
+    return {settings.get(name): value for name, value in STUB_ENV.items()}
+
+
+@pytest.fixture(autouse=True)
+def cassette(request):
+    """
+    Кассета api/telega теста: tests/cassettes/<модуль>/<тест>.json.
+    Маркер cassette('имя', match_on=('method', 'path')) меняет файл и
+    то, по каким частям запроса ищется ответ.
+    """
+    node = request.node
+    if CASSETTE_MODE == 'off' or not (node.get_closest_marker('api')
+                                      or node.get_closest_marker('telega')):
+        yield None
+        return
+    from tests.api.cassette import Cassette, Scrubber, mount_cassette
+
+    marker = node.get_closest_marker('cassette')
+    args, kwargs = (marker.args, marker.kwargs) if marker else ((), {})
+    module = os.path.splitext(os.path.basename(str(node.path)))[0]
+    name = args[0] if args else re.sub(r'[^\w.-]+', '_', node.name)
+    secrets = request.getfixturevalue('cassette_secrets')
+    tape = Cassette(os.path.join(CASSETTE_DIR, module, f'{name}.json'),
+                    scrubber=Scrubber(secrets), **kwargs)
+    adapter, unmount = mount_cassette(
+        request.getfixturevalue('http_session'), tape, CASSETTE_MODE)
+    yield adapter
+    unmount()
+    tape.save(CASSETTE_MODE)
+
+
+@pytest.fixture(scope='session')
+def token_provider(http_session, request):
+    """
+    Токен логина, общий для всех тестов сессии.
+    Токен кешируется в .pytest_cache под файловой блокировкой, поэтому
+    параллельные воркеры логинятся один раз. Отключается API_TOKEN_CACHE=0.
+    С кассетами логин пишется в общую кассету tests/cassettes/session/
+    login.json: токен берёт первый тест, которому он нужен, а
+    воспроизводить надо любой тест отдельно и в любом порядке.
+    """
+    from tests.api.auth import TokenProvider
+
+    cache_dir = None
+    cache = getattr(request.config, 'cache', None)
+    # С кассетами логин должен попасть в запись, а не браться из кеша
+    if (cache is not None and CASSETTE_MODE == 'off'
+            and settings.get('API_TOKEN_CACHE', '1') != '0'):
+        cache_dir = str(cache.mkdir('auth'))
+    login_session = None
+    if CASSETTE_MODE != 'off':
+        from tests.api.base_api import build_session
+        from tests.api.cassette import Cassette, Scrubber, mount_cassette
+
+        login_session = build_session()
+        tape = Cassette(os.path.join(CASSETTE_DIR, 'session', 'login.json'),
+                        scrubber=Scrubber(
+                            request.getfixturevalue('cassette_secrets')))
+        mount_cassette(login_session, tape, CASSETTE_MODE)
+    yield TokenProvider(
+        http_session,
+        email=settings.login,
+        password=settings.password,
+        cache_dir=cache_dir,
+        login_session=login_session,
+    )
+    if login_session is not None:
+        tape.save(CASSETTE_MODE)
+        login_session.close()
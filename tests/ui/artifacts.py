@@ -0,0 +1,196 @@
+"""
+Артефакты упавших UI тестов: скриншот, DOM и последние события браузера.
+
+Пока тест проходит, ничего не снимается: фикстура driver только держит
+в кольцевом буфере сетевые события из performance-лога, который и так
+читается для статистики сетевых профилей. Если тест упал, с браузера
+синхронно снимаются скриншот, DOM текущего фрейма, верхнего документа
+и iframe ассистента, а также консоль браузера за время теста. Сжатие
+и запись на диск идут в фоновом потоке, так что teardown не ждёт диска.
+
+Раскладка: <UI_ARTIFACTS_DIR>/<id теста>/{screenshot.png,
+dom-top.html.gz, dom-assistant.html.gz, events.json.gz}. Общий объём за
+прогон ограничен UI_ARTIFACTS_MAX_MB (под xdist делится между воркерами),
+когда лимит исчерпан, артефакты больше не снимаются.
+"""
+import gzip
+import json
+import os
+import queue
+import re
+import threading
+from collections import deque
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+
+ASSISTANT_IFRAME = (By.CSS_SELECTOR, "iframe[src*='embed.aifromspace.com']")
+URL_LENGTH = 300
+
+
+class EventBuffer:
+    """Последние события браузера в компактном виде."""
+
+    def __init__(self, maxlen=200):
+        self.events = deque(maxlen=maxlen)
+
+    def add_network(self, events):
+        """События performance-лога (Network.*) от NetworkStats.collect."""
+        urls = {}
+        for event in events:
+            method = event.get('method')
+            params = event.get('params', {})
+            if method == 'Network.requestWillBeSent':
+                url = params['request']['url'][:URL_LENGTH]
+                urls[params['requestId']] = url
+                self.events.append({
+                    'time': event.get('timestamp'), 'type': 'request',
+                    'method': params['request'].get('method'), 'url': url})
+            elif method == 'Network.responseReceived':
+                response = params.get('response', {})
+                self.events.append({
+                    'time': event.get('timestamp'), 'type': 'response',
+                    'status': response.get('status'),
+                    'url': response.get('url', '')[:URL_LENGTH]})
+            elif method == 'Network.loadingFailed':
+                self.events.append({
+                    'time': event.get('timestamp'), 'type': 'failed',
+                    'error': params.get('errorText'),
+                    'blocked': params.get('blockedReason'),
+                    'url': urls.get(params.get('requestId'))})
+
+    def add_console(self, entries, since=0):
+        """Записи get_log('browser') начиная с since (мс от эпохи)."""
+        for entry in entries:
+            if entry.get('timestamp', 0) >= since:
+                self.events.append({
+                    'time': entry.get('timestamp'), 'type': 'console',
+                    'level': entry.get('level'),
+                    'message': entry.get('message')})
+
+    def as_list(self):
+        return sorted(self.events, key=lambda event: event.get('time') or 0)
+
+
+def _safe_name(nodeid):
+    return re.sub(r'[^\w.\-\[\]]+', '_', nodeid).strip('_')[:150]
+
+
+class ArtifactWriter:
+    """
+    Снимает артефакты с браузера и пишет их на диск в фоновом потоке.
+    capture() делает только то, что требует браузера, и сразу
+    возвращается.
+    """
+
+    def __init__(self, root, max_bytes, max_dom_bytes=2 * 1024 * 1024):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_dom_bytes = max_dom_bytes
+        self.written = 0
+        self.dropped = 0
+        # Файл уже не влез в лимит: дальше снимать нет смысла
+        self.exhausted = False
+        self._queue = queue.Queue()
+        # Папки, которые ещё пишутся: папка -> Event окончания записи
+        self._pending = {}
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name='ui-artifacts-writer')
+        self._thread.start()
+
+    @property
+    def full(self):
+        return self.exhausted or self.written >= self.max_bytes
+
+    def capture(self, nodeid, driver, events, since=0):
+        """Снимает артефакты теста; возвращает папку или None (лимит)."""
+        if self.full:
+            self.dropped += 1
+            return None
+        files = {}
+        try:
+            files['screenshot.png'] = driver.get_screenshot_as_png()
+        except WebDriverException:
+            pass
+        for name, html in self._dom(driver).items():
+            files[f'dom-{name}.html.gz'] = html
+        try:
+            events.add_console(driver.get_log('browser'), since=since)
+        except (WebDriverException, ValueError):
+            # Консольный лог не включён в capabilities
+            pass
+        files['events.json.gz'] = events.as_list()
+        directory = os.path.join(self.root, _safe_name(nodeid))
+        done = self._pending[directory] = threading.Event()
+        self._queue.put((directory, files, done))
+        return directory
+
+    def wait(self, directory, timeout=10):
+        """Ждёт, пока файлы папки из capture() дойдут до диска."""
+        done = self._pending.get(directory)
+        if done is not None:
+            done.wait(timeout)
+
+    def close(self, timeout=60):
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    # --- Helpers ---
+
+    def _dom(self, driver):
+        """DOM текущего фрейма, верхнего документа и iframe ассистента."""
+        dom = {}
+        current = None
+        try:
+            current = driver.page_source
+            driver.switch_to.default_content()
+            dom['top'] = driver.page_source
+            for frame in driver.find_elements(*ASSISTANT_IFRAME)[:1]:
+                driver.switch_to.frame(frame)
+                dom['assistant'] = driver.page_source
+                driver.switch_to.default_content()
+        except WebDriverException:
+            # Браузер мог умереть вместе с тестом — сохраняем что успели
+            pass
+        if current is not None and current not in dom.values():
+            dom['current'] = current
+        return dom
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            directory, files, done = job
+            try:
+                self._write(directory, files)
+            except OSError:
+                self.dropped += 1
+            finally:
+                done.set()
+                if self._pending.get(directory) is done:
+                    del self._pending[directory]
+
+    def _write(self, directory, files):
+        os.makedirs(directory, exist_ok=True)
+        for name, content in files.items():
+            data = self._encode(name, content)
+            if self.written + len(data) > self.max_bytes:
+                self.dropped += 1
+                self.exhausted = True
+                continue
+            with open(os.path.join(directory, name), 'wb') as f:
+                f.write(data)
+            self.written += len(data)
+
+    def _encode(self, name, content):
+        if name.endswith('.json.gz'):
+            content = json.dumps(content, ensure_ascii=False, indent=1)
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+            if len(content) > self.max_dom_bytes:
+                content = (content[:self.max_dom_bytes]
+                           + b'\n<!-- truncated -->\n')
+        if name.endswith('.gz'):
+            return gzip.compress(content, compresslevel=6)
+        return content
@@ -0,0 +1,100 @@
+from selenium.common.exceptions import WebDriverException
+
+
+class BrowserPool:
+    """
+    Пул прогретых браузеров на один воркер.
+
+    Вместо запуска Chrome на каждый тест драйвер берётся из пула и после
+    теста возвращается обратно, предварительно очищенный. Браузер
+    пересоздаётся после max_uses тестов или если он упал.
+    """
+    # Origins, чьё хранилище чистится между тестами помимо текущего
+    RESET_ORIGINS = (
+        'https://app.aifromspace.com',
+        'https://embed.aifromspace.com',
+    )
+
+    def __init__(self, factory, max_uses=25):
+        self.factory = factory
+        self.max_uses = max_uses
+        self.launched = 0
+        self._idle = []
+        self._uses = {}
+
+    def acquire(self):
+        """Отдаёт живой браузер из пула или запускает новый."""
+        while self._idle:
+            driver = self._idle.pop()
+            if self._is_alive(driver):
+                return driver
+            self._discard(driver)
+
+        driver = self.factory()
+        self.launched += 1
+        self._uses[driver] = 0
+        return driver
+
+    def release(self, driver, broken=False):
+        """Возвращает браузер в пул или закрывает его."""
+        self._uses[driver] = self._uses.get(driver, 0) + 1
+        if broken or self._uses[driver] >= self.max_uses:
+            self._discard(driver)
+            return
+        try:
+            self.reset(driver)
+        except WebDriverException:
+            # Браузер упал или завис: в пул его не возвращаем
+            self._discard(driver)
+            return
+        self._idle.append(driver)
+
+    def close(self):
+        while self._idle:
+            self._discard(self._idle.pop())
+
+    def reset(self, driver):
+        """
+        Приводит браузер к состоянию "как после запуска":
+        выходит из iframe, закрывает лишние окна, чистит cookies,
+        localStorage/IndexedDB и sessionStorage. HTTP кеш не трогаем,
+        чтобы следующий тест грузил страницу из тёплого кеша.
+        """
+        driver.switch_to.default_content()
+        origin = driver.execute_script('return window.location.origin;')
+
+        # Новая вкладка = чистый sessionStorage и никакого контекста фрейма
+        old_handles = driver.window_handles
+        driver.switch_to.new_window('tab')
+        fresh_handle = driver.current_window_handle
+        for handle in old_handles:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(fresh_handle)
+
+        driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        origins = set(self.RESET_ORIGINS)
+        if origin and origin.startswith('http'):
+            origins.add(origin)
+        for origin in origins:
+            driver.execute_cdp_cmd('Storage.clearDataForOrigin', {
+                'origin': origin,
+                'storageTypes': 'local_storage,indexeddb,service_workers,'
+                                'cache_storage',
+            })
+
+    # --- Helpers ---
+
+    def _is_alive(self, driver):
+        try:
+            driver.current_window_handle
+            return True
+        except WebDriverException:
+            return False
+
+    def _discard(self, driver):
+        self._uses.pop(driver, None)
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
@@ -1,15 +1,298 @@
+import os
+import sys
+import time
+
 import pytest
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver import Chrome
 
+from utils.settings import settings
+
+# Selenium и page objects импортируются внутри фикстур: при
+# `pytest -m unit` UI фикстуры не создаются и Selenium не загружается
+
+
+def create_driver(user_data_dir=None):
+    from selenium.webdriver import Chrome
+    from selenium.webdriver.chrome.options import Options
 
-@pytest.fixture
-def driver():
     opt = Options()
     opt.add_argument('--headless')
     opt.add_argument('--window-size=1920,1080')
+    if user_data_dir:
+        opt.add_argument(f'--user-data-dir={user_data_dir}')
+    # Performance-лог нужен для подсчёта заблокированных запросов,
+    # консоль браузера — для артефактов упавших тестов
+    opt.set_capability('goog:loggingPrefs', {'performance': 'ALL',
+                                             'browser': 'ALL'})
+
+    return Chrome(options=opt)
+
+
+@pytest.fixture(scope='session')
+def profile_snapshot(request):
+    """
+    Прогретый профиль Chrome (UI_PROFILE_SNAPSHOT=1). Живёт в кеше
+    pytest и пересобирается раз в UI_PROFILE_MAX_AGE секунд или при
+    смене UI_PROFILE_VERSION.
+    """
+    cache = getattr(request.config, 'cache', None)
+    if settings.get('UI_PROFILE_SNAPSHOT') != '1' or cache is None:
+        return None
+    from pages.login_page import LoginPage
+
+    from .profile_snapshot import ProfileSnapshot
+
+    # Без логина профиль греется анонимно: HTTP сессия и токен не нужны
+    token_provider = None
+    if settings.login:
+        token_provider = request.getfixturevalue('token_provider')
+
+    def warm(user_data_dir):
+        browser = create_driver(user_data_dir)
+        try:
+            browser.get(LoginPage.BASE_URL)
+            if token_provider is not None:
+                # Залогиненный дашборд подтягивает и бандл ассистента
+                LoginPage(browser).login_with_token(
+                    token_provider.get_token())
+        finally:
+            browser.quit()
+
+    return ProfileSnapshot(
+        str(cache.mkdir('browser-profile')), warm,
+        max_age=int(settings.get('UI_PROFILE_MAX_AGE', 24 * 3600)),
+        version=settings.get('UI_PROFILE_VERSION', '1'),
+    )
+
+
+@pytest.fixture(scope='session')
+def browser_pool(profile_snapshot, tmp_path_factory):
+    """Пул браузеров на воркер; UI_BROWSER_MAX_USES — тестов на браузер."""
+    from .browser_pool import BrowserPool
 
-    browser = Chrome(options=opt)
+    def launch():
+        if profile_snapshot is None:
+            return create_driver()
+        # Каждый запуск получает свою копию снимка
+        user_data_dir = tmp_path_factory.mktemp('chrome-profile')
+        return create_driver(profile_snapshot.clone(str(user_data_dir)))
+
+    pool = BrowserPool(
+        launch,
+        max_uses=int(settings.get('UI_BROWSER_MAX_USES', 25)),
+    )
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope='session')
+def network_stats(request):
+    """Статистика блокировок; размеры ответов живут в кеше pytest."""
+    from .network_profiles import NETWORK_STATS
+
+    cache = getattr(request.config, 'cache', None)
+    if cache is not None:
+        NETWORK_STATS.sizes.update(cache.get('network/sizes', {}))
+    yield NETWORK_STATS
+    if cache is not None:
+        cache.set('network/sizes', NETWORK_STATS.sizes)
+
+
+@pytest.fixture
+def network_profile(request):
+    """
+    Сетевой профиль теста: маркер network или UI_NETWORK_PROFILE
+    (по умолчанию lean — без картинок, шрифтов, аналитики и ассистента).
+    """
+    from .network_profiles import NetworkProfile
+
+    return NetworkProfile.from_marker(
+        request.node.get_closest_marker('network'),
+        default=settings.get('UI_NETWORK_PROFILE', 'lean'))
+
+
+@pytest.fixture(scope='session')
+def artifact_writer():
+    """
+    Артефакты упавших тестов (UI_ARTIFACTS_DIR, по умолчанию artifacts).
+    UI_ARTIFACTS_MAX_MB — лимит на прогон, 0 отключает артефакты.
+    """
+    max_mb = float(settings.get('UI_ARTIFACTS_MAX_MB', 50))
+    if max_mb <= 0:
+        yield None
+        return
+    from .artifacts import ArtifactWriter
+
+    # Под xdist лимит делится между воркерами
+    workers = int(os.getenv('PYTEST_XDIST_WORKER_COUNT', 1))
+    writer = ArtifactWriter(settings.get('UI_ARTIFACTS_DIR', 'artifacts'),
+                            max_bytes=int(max_mb * 1024 * 1024 / workers))
+    yield writer
+    writer.close()
+
+
+@pytest.fixture
+def driver(request, browser_pool, network_profile, network_stats,
+           artifact_writer):
+    browser = browser_pool.acquire()
+    network_profile.apply(browser)
+    started = time.time() * 1000
     yield browser
-    browser.quit()
+    broken = True
+    try:
+        events = network_stats.collect(browser)
+        if artifact_writer is not None and _failed(request.node):
+            from .artifacts import EventBuffer
+
+            buffer = EventBuffer()
+            buffer.add_network(events)
+            request.node.artifacts_dir = artifact_writer.capture(
+                request.node.nodeid, browser, buffer, since=started)
+        broken = False
+    finally:
+        # Браузер после упавшего теста может быть мёртв: если снять
+        # статистику и артефакты не вышло, пул закрывает его, а не
+        # оставляет Chrome висеть до конца прогона
+        browser_pool.release(browser, broken=broken)
+
+
+def _failed(item):
+    return any(getattr(getattr(item, f'rep_{when}', None), 'failed', False)
+               for when in ('setup', 'call'))
+
+
+@pytest.fixture
+def page_metrics(driver):
+    """
+    Метрики производительности страниц теста. Снимаются page objects,
+    прикладываются к отчёту и проверяются по маркеру perf_budget.
+    """
+    from pages.metrics import PageMetrics
+
+    return PageMetrics(driver)
+
+
+@pytest.fixture
+def login_page(driver, page_metrics):
+    from pages.login_page import LoginPage
+
+    return LoginPage(driver, metrics=page_metrics)
+
+
+@pytest.fixture
+def dashboard_page(driver, page_metrics):
+    from pages.dashboard_page import DashboardPage
+
+    return DashboardPage(driver, metrics=page_metrics)
+
+
+@pytest.fixture
+def assistant_page(request, driver, dashboard_page, page_metrics,
+                   stub_backend):
+    """
+    Чат ассистента, драйвер уже внутри его iframe. При API_STUB=1 —
+    страница-заменитель со стенда (без сети), иначе дашборд
+    с логином через API.
+    """
+    from pages.assistant_page import AssistantPage
+
+    if stub_backend is not None:
+        driver.get(stub_backend.url + '/dashboard')
+        page_metrics.visit('dashboard')
+    else:
+        request.getfixturevalue('logged_in_driver')
+    dashboard_page.switch_to_assistant_iframe()
+    dashboard_page.get_assistant_header()
+    return AssistantPage(driver, metrics=page_metrics)
+
+
+@pytest.fixture
+def logged_in_driver(driver, login_page, token_provider):
+    """
+    Браузер с уже залогиненным пользователем на дашборде.
+    Токен берётся через API, форма входа не используется.
+    """
+    login_page.login_with_token(token_provider.get_token())
+    return driver
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """
+    После теста снимает метрики последней страницы, прикладывает их
+    к отчёту и роняет тест, если превышен бюджет из маркера
+    perf_budget(lcp=2500, time_to_assistant=8000) — в миллисекундах.
+    """
+    outcome = yield
+    metrics = item.funcargs.get('page_metrics')
+    if metrics is None:
+        return
+    metrics.finish()
+    if metrics.pages:
+        item.user_properties.append(('page_metrics', metrics.pages))
+        item.add_report_section('call', 'page metrics', metrics.summary())
+    marker = item.get_closest_marker('perf_budget')
+    if marker is None or outcome.excinfo is not None:
+        return
+    violations = metrics.over_budget(marker.kwargs)
+    if violations:
+        outcome.force_exception(pytest.fail.Exception(
+            'Превышен бюджет производительности:\n' + '\n'.join(violations),
+            pytrace=False))
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """
+    Запоминает отчёты фаз на тесте (по ним driver узнаёт о падении) и
+    прикладывает артефакты упавшего теста к отчёту teardown.
+    """
+    directory = getattr(item, 'artifacts_dir', None)
+    if call.when == 'teardown' and directory:
+        # До создания отчёта, чтобы он скопировал свойство
+        item.user_properties.append(('artifacts', directory))
+    outcome = yield
+    report = outcome.get_result()
+    setattr(item, f'rep_{report.when}', report)
+    if report.when != 'teardown' or not directory:
+        return
+    report.sections.append(('artifacts', directory))
+    try:
+        from pytest_html import extras
+    except ImportError:
+        return
+    # Файлы пишутся в фоне: скриншот мог не сняться с мёртвого браузера
+    # или не влезть в лимит, поэтому ссылку даём, только если он на диске
+    writer = item.funcargs.get('artifact_writer')
+    if writer is not None:
+        writer.wait(directory)
+    path = os.path.relpath(directory)
+    screenshot = os.path.join(path, 'screenshot.png')
+    links = [extras.image(screenshot)] if os.path.exists(screenshot) else []
+    report.extras = getattr(report, 'extras', []) + links + [
+        extras.url(path, name='artifacts'),
+    ]
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Печатает команды WebDriver по действиям и самые долгие ожидания."""
+    # Если модули не загружались, UI тестов в прогоне не было
+    network = sys.modules.get('tests.ui.network_profiles')
+    if network is not None and network.NETWORK_STATS.requests:
+        terminalreporter.section('network profiles')
+        terminalreporter.write_line(network.NETWORK_STATS.summary())
+    trips = sys.modules.get('pages.round_trips')
+    rows = trips.ROUND_TRIP_STATS.summary(top=10) if trips else []
+    if rows:
+        terminalreporter.section('webdriver round trips')
+        for action, calls, total, average in rows:
+            terminalreporter.write_line(
+                f"{total:6d} total {average:6.1f} per call {calls:4d}x  "
+                f"{action}")
+    waits = sys.modules.get('pages.waits')
+    rows = waits.WAIT_STATS.summary(top=10) if waits else []
+    if not rows:
+        return
+    terminalreporter.section('slowest page waits')
+    for key, calls, total, longest in rows:
+        terminalreporter.write_line(
+            f"{total:8.2f}s total {longest:6.2f}s max {calls:4d}x  {key}")
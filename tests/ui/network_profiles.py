@@ -0,0 +1,176 @@
+"""
+Сетевые профили браузера для UI тестов.
+
+Профиль говорит, какие классы запросов браузеру не нужны (картинки,
+шрифты, аналитика, iframe ассистента) и нужно ли замедлить сеть.
+Блокировка ставится через CDP Network.setBlockedURLs на вкладку теста,
+поэтому страница логина не тянет лишнее, если тест проверяет только
+текст ошибки. Тест выбирает профиль маркером:
+
+    @pytest.mark.network('lean', allow=['assistant'])
+
+По performance-логу Chrome считается, сколько запросов заблокировано,
+а размер ответов берётся из прошлых прогонов, где они не блокировались.
+"""
+import json
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+
+# Классы запросов и шаблоны URL для Network.setBlockedURLs
+BLOCK_CLASSES = {
+    'image': ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif',
+              '*.svg', '*.ico'],
+    'font': ['*.woff', '*.woff2', '*.ttf', '*.otf', '*fonts.googleapis.com*',
+             '*fonts.gstatic.com*'],
+    'media': ['*.mp4', '*.webm', '*.mp3', '*.ogg'],
+    'analytics': ['*google-analytics.com*', '*googletagmanager.com*',
+                  '*mc.yandex.ru*', '*doubleclick.net*',
+                  '*connect.facebook.net*', '*hotjar.com*', '*clarity.ms*',
+                  '*segment.io*'],
+    'assistant': ['*embed.aifromspace.com*'],
+}
+
+# Параметры Network.emulateNetworkConditions (задержка в мс, байт/с)
+THROTTLING = {
+    'slow-3g': {'latency': 400, 'downloadThroughput': 50 * 1024,
+                'uploadThroughput': 50 * 1024},
+    'fast-3g': {'latency': 150, 'downloadThroughput': 200 * 1024,
+                'uploadThroughput': 90 * 1024},
+}
+
+PROFILES = {
+    # Всё как у пользователя
+    'full': {'block': []},
+    # Только то, что нужно для проверок формы и дашборда
+    'lean': {'block': ['image', 'font', 'media', 'analytics', 'assistant']},
+    # Без сторонних скриптов, но с картинками и шрифтами приложения
+    'no-third-party': {'block': ['analytics']},
+    'slow-3g': {'block': ['analytics'], 'throttle': 'slow-3g'},
+}
+
+
+class NetworkProfile:
+
+    def __init__(self, name='full', allow=(), block=(), throttle=None):
+        if name not in PROFILES:
+            raise ValueError(f"Неизвестный сетевой профиль: {name}")
+        spec = PROFILES[name]
+        self.name = name
+        classes = list(spec['block']) + list(block)
+        self.classes = [cls for cls in dict.fromkeys(classes)
+                        if cls not in allow]
+        self.throttle = throttle or spec.get('throttle')
+
+    @classmethod
+    def from_marker(cls, marker, default='full'):
+        """Профиль по маркеру network(name, allow=, block=, throttle=)."""
+        if marker is None:
+            return cls(default)
+        name = marker.args[0] if marker.args else default
+        return cls(name, **marker.kwargs)
+
+    @property
+    def patterns(self):
+        patterns = []
+        for cls in self.classes:
+            patterns.extend(BLOCK_CLASSES.get(cls, [cls]))
+        return patterns
+
+    def apply(self, driver):
+        """Включает профиль на текущей вкладке браузера."""
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs',
+                               {'urls': self.patterns})
+        if self.throttle:
+            driver.execute_cdp_cmd('Network.emulateNetworkConditions', dict(
+                THROTTLING[self.throttle], offline=False))
+
+    def __repr__(self):
+        return f"NetworkProfile({self.name!r}, classes={self.classes})"
+
+
+class NetworkStats:
+    """
+    Сколько запросов и байт сэкономила блокировка.
+
+    Размеры ответов запоминаются по URL из незаблокированных загрузок
+    (sizes сохраняется между прогонами), поэтому байты для заблокированных
+    запросов — оценка по прошлым прогонам. Профиль lean блокирует одни и
+    те же классы в каждом прогоне, так что их размеры узнаются только из
+    прогона с UI_NETWORK_PROFILE=full; пока его не было, сводка сообщает
+    число заблокированных запросов без оценки байт.
+    """
+    MAX_SIZES = 5000
+
+    def __init__(self, sizes=None):
+        self.sizes = dict(sizes or {})
+        self.requests = 0
+        self.blocked = 0
+        # Заблокированные запросы, размер которых известен по прошлым
+        # прогонам: из них и складывается saved_bytes
+        self.sized = 0
+        self.saved_bytes = 0
+        self.loaded_bytes = 0
+
+    def collect(self, driver):
+        """
+        Разбирает накопленный performance-лог браузера. Возвращает
+        события лога: чтение его очищает, а они нужны и артефактам.
+        """
+        try:
+            entries = driver.get_log('performance')
+        except (WebDriverException, ValueError):
+            # Лог не включён в capabilities
+            return []
+        events = []
+        for entry in entries:
+            event = json.loads(entry['message'])['message']
+            event['timestamp'] = entry.get('timestamp')
+            events.append(event)
+        self.consume(events)
+        return events
+
+    def consume(self, events):
+        urls = {}
+        for event in events:
+            method = event.get('method')
+            params = event.get('params', {})
+            if method == 'Network.requestWillBeSent':
+                urls[params['requestId']] = _size_key(params['request']['url'])
+                self.requests += 1
+            elif method == 'Network.loadingFinished':
+                size = int(params.get('encodedDataLength', 0))
+                self.loaded_bytes += size
+                key = urls.get(params['requestId'])
+                if key and (key in self.sizes
+                            or len(self.sizes) < self.MAX_SIZES):
+                    self.sizes[key] = size
+            elif (method == 'Network.loadingFailed'
+                  and params.get('blockedReason')):
+                self.blocked += 1
+                size = self.sizes.get(urls.get(params['requestId']))
+                if size is not None:
+                    self.sized += 1
+                    self.saved_bytes += size
+
+    def summary(self):
+        line = f"{self.blocked} of {self.requests} requests blocked, "
+        if self.sized:
+            line += f"~{self.saved_bytes / 1024:.0f} KiB saved"
+            if self.sized < self.blocked:
+                line += f" (size known for {self.sized} of {self.blocked})"
+            line += ", "
+        elif self.blocked:
+            line += ("saved bytes unknown (run once with "
+                     "UI_NETWORK_PROFILE=full to learn sizes), ")
+        return line + f"{self.loaded_bytes / 1024:.0f} KiB loaded"
+
+
+NETWORK_STATS = NetworkStats()
+
+
+def _size_key(url):
+    # Query у статики обычно меняется от сборки к сборке
+    parts = urlsplit(url)
+    return f"{parts.netloc}{parts.path}"
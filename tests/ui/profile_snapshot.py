@@ -0,0 +1,124 @@
+"""
+Прогретый профиль Chrome, переживающий перезапуски прогона.
+
+Один раз (или когда снимок устарел) Chrome запускается с пустым
+user-data-dir, открывает страницы приложения и закрывается — в профиле
+остаются HTTP кеш и кеш скомпилированного JS. Из профиля удаляется всё,
+что относится к пользователю (cookies, localStorage, IndexedDB,
+история), и он сохраняется как снимок. Сам снимок браузеры не
+открывают: каждый запуск получает свою копию (copy-on-write, если
+файловая система умеет reflink), поэтому тесты не делят состояние.
+"""
+import json
+import os
+import shutil
+import subprocess
+import time
+
+from filelock import FileLock
+
+# Что вычищается из профиля перед сохранением снимка
+USER_STATE = (
+    'Default/Cookies',
+    'Default/Cookies-journal',
+    'Default/Network/Cookies',
+    'Default/Network/Cookies-journal',
+    'Default/Local Storage',
+    'Default/Session Storage',
+    'Default/IndexedDB',
+    'Default/Service Worker',
+    'Default/Login Data',
+    'Default/Login Data-journal',
+    'Default/History',
+    'Default/History-journal',
+    'Default/Sessions',
+    'Default/Current Session',
+    'Default/Current Tabs',
+    'Default/Last Session',
+    'Default/Last Tabs',
+)
+# Блокировки запущенного Chrome, с ними копия не откроется
+SINGLETON_FILES = ('SingletonLock', 'SingletonCookie', 'SingletonSocket')
+
+
+class ProfileSnapshot:
+    """
+    Снимок профиля в root/snapshot с метаданными в root/snapshot.json.
+
+    Снимок пересобирается, если он старше max_age секунд или собран для
+    другой version (например, после смены набора страниц для прогрева).
+    Несколько xdist-воркеров собирают его по очереди под файловой
+    блокировкой: первый собирает, остальные берут готовый.
+    """
+
+    def __init__(self, root, build, max_age=24 * 3600, version='1'):
+        self.root = root
+        self.build = build
+        self.max_age = max_age
+        self.version = str(version)
+        self.path = os.path.join(root, 'snapshot')
+        self._meta_path = os.path.join(root, 'snapshot.json')
+        self._lock = FileLock(os.path.join(root, 'snapshot.lock'))
+        self.rebuilt = False
+
+    def is_fresh(self):
+        try:
+            with open(self._meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return False
+        return (meta.get('version') == self.version
+                and time.time() - meta.get('created', 0) < self.max_age
+                and os.path.isdir(self.path))
+
+    def ensure(self):
+        """Возвращает путь к свежему снимку, при необходимости собирая его."""
+        if self.is_fresh():
+            return self.path
+        with self._lock:
+            # Пока ждали блокировку, снимок мог собрать другой воркер
+            if not self.is_fresh():
+                self._rebuild()
+        return self.path
+
+    def clone(self, target):
+        """Копирует снимок в target для одного запуска браузера."""
+        source = self.ensure()
+        if os.path.exists(target):
+            shutil.rmtree(target)
+        try:
+            subprocess.run(['cp', '-a', '--reflink=auto', source, target],
+                           check=True, capture_output=True)
+        except (OSError, subprocess.CalledProcessError):
+            # Нет GNU cp (macOS, Windows) — обычное копирование
+            shutil.rmtree(target, ignore_errors=True)
+            shutil.copytree(source, target, symlinks=True)
+        _remove(target, SINGLETON_FILES)
+        return target
+
+    # --- Helpers ---
+
+    def _rebuild(self):
+        os.makedirs(self.root, exist_ok=True)
+        staging = os.path.join(self.root, f'staging-{os.getpid()}')
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+        try:
+            self.build(staging)
+            _remove(staging, USER_STATE + SINGLETON_FILES)
+            shutil.rmtree(self.path, ignore_errors=True)
+            os.replace(staging, self.path)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        with open(self._meta_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.version, 'created': time.time()}, f)
+        self.rebuilt = True
+
+
+def _remove(root, names):
+    for name in names:
+        path = os.path.join(root, name)
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path, ignore_errors=True)
+        elif os.path.lexists(path):
+            os.remove(path)
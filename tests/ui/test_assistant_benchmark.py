@@ -0,0 +1,30 @@
+import pytest
+
+from pages.assistant_page import AssistantBenchmark
+from utils.settings import settings
+
+# Бенчмарк ассистента: каждый вопрос из cases/assistant_prompts.jsonl
+# задаётся UI_ASSISTANT_REPEAT раз (плюс один прогревочный), в отчёт
+# идут p50/p90/p95 времени до первого слова, полного ответа и скорости
+# потока. Без сети: API_STUB=1 pytest -m benchmark tests/ui
+
+
+@pytest.mark.ui
+@pytest.mark.benchmark
+@pytest.mark.network('lean', allow=['assistant'])
+@pytest.mark.cases('cases/assistant_prompts.jsonl', id_field='id')
+@pytest.mark.perf_budget(ttft_ms_p90=10000, total_ms_p90=60000)
+def test_assistant_streaming_latency(assistant_page, page_metrics, case):
+    '''Замеряет время до первого слова и скорость потока ответа'''
+    bench = AssistantBenchmark(
+        assistant_page, repeat=int(settings.get('UI_ASSISTANT_REPEAT', 5)))
+
+    [stats] = bench.run([case.prompt]).values()
+
+    # Перцентили — в метрики страницы: отчёт и бюджеты perf_budget
+    page_metrics.add('assistant', **{
+        f"{metric}_{name}": value
+        for metric, values in stats.items()
+        for name, value in values.items()})
+    print(f"\n{bench.report()}")
+    assert stats['ttft_ms']['max'] <= stats['total_ms']['max']
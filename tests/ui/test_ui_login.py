@@ -1,17 +1,11 @@
 import pytest
-import os
-from dotenv import load_dotenv
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 
-from pages.login_page import LoginPage
-from pages.dashboard_page import DashboardPage
+from utils.settings import settings
 
 # --- Фикстура для управления браузером ---
+# Браузер и page objects (login_page, dashboard_page) приходят
+# из фикстур tests/ui/conftest.py, Selenium здесь не импортируется
 
-load_dotenv()
 # @pytest.fixture
 # def driver():
 #     browser = webdriver.Chrome()
@@ -22,19 +16,18 @@ load_dotenv()
 
 
 @pytest.mark.smoke
-def test_successful_login(driver):
+@pytest.mark.network('lean', allow=['assistant'])
+@pytest.mark.perf_budget(time_to_assistant=8000)
+def test_successful_login(login_page, dashboard_page):
     '''Проверяет правильный пароль и почту'''
-    wait = WebDriverWait(driver, 10)
-
-    login_page = LoginPage(driver)
-    dashboard_page = DashboardPage(driver)
 # __acting__
 
-    login = os.getenv('LOGIN')
-    password = os.getenv('PASSWORD')
+    login = settings.login
+    password = settings.password
 
     login_page.open()
-    login_page.login(login, password)
+    # Тест проверяет саму форму: ввод и клик — настоящие
+    login_page.login(login, password, mode='native')
 # __assert__
     dashboard_page.wait_for_url_contain('dashboard')
 
@@ -44,29 +37,34 @@ def test_successful_login(driver):
     assert assistant_header.is_displayed()
     print("\nТест на успешный вход ПРОЙДЕН.")
 
+# --- Тест: Дашборд для пользователя, залогиненного через API ---
+
+
+@pytest.mark.smoke
+@pytest.mark.network('lean', allow=['assistant'])
+def test_dashboard_with_api_login(logged_in_driver, dashboard_page):
+    '''Проверяет дашборд без прохождения формы входа'''
+    dashboard_page.wait_for_url_contain('dashboard')
+    dashboard_page.switch_to_assistant_iframe()
+    assistant_header = dashboard_page.get_assistant_header()
+
+    assert assistant_header.is_displayed()
+    print("\nТест дашборда с логином через API ПРОЙДЕН.")
+
 # --- Тест №2: Вход с неверным паролем (Sad Path) ---
 
 
 @pytest.mark.ui
-@pytest.mark.parametrize(
-    "password, error_text",
-    [
-        ('WrongPass123', "Invalid email or password"),
-        ('aifromspace1', "Invalid email or password")]
-)
-def test_failed_wrong_password(driver, password, error_text):
+@pytest.mark.cases('cases/wrong_passwords.csv', id_field='password')
+def test_failed_wrong_password(login_page, case):
     '''Проверяет неправильный пароль.'''
-    wait = WebDriverWait(driver, 10)
-
-    login_page = LoginPage(driver)
-
-    login = os.getenv('LOGIN')
+    login = settings.login
     login_page.open()
-    login_page.login(login, password)
+    login_page.login(login, case.password, mode='native')
 
     # Assert
     # Проверяем тот текст ошибки, который ожидаем для этого набора данных
-    error_message = login_page.get_error_message(error_text)
+    error_message = login_page.get_error_message(case.error_text)
 
     assert error_message.is_displayed()
     print("\nТест на провальный вход ПРОЙДЕН.")
@@ -75,9 +73,8 @@ def test_failed_wrong_password(driver, password, error_text):
 
 
 @pytest.mark.ui
-def test_empty_password_field_browser_validation(driver):
+def test_empty_password_field_browser_validation(driver, login_page):
     '''Проверяет пустой пароль'''
-    login_page = LoginPage(driver)
     login_page.open()
 
     # Arrange: Находим поле пароля, но ничего в него не вводим
@@ -0,0 +1,133 @@
+import gzip
+import json
+from unittest.mock import Mock
+
+import pytest
+
+NETWORK = [
+    {'method': 'Network.requestWillBeSent', 'timestamp': 2,
+     'params': {'requestId': '1', 'request': {'method': 'POST',
+                                              'url': 'https://app/login'}}},
+    {'method': 'Network.responseReceived', 'timestamp': 3,
+     'params': {'response': {'status': 401, 'url': 'https://app/login'}}},
+    {'method': 'Network.loadingFailed', 'timestamp': 4,
+     'params': {'requestId': '1', 'errorText': 'net::ERR_FAILED'}},
+]
+
+
+def make_driver(sources):
+    driver = Mock()
+    driver.get_screenshot_as_png.return_value = b'\x89PNG'
+    type(driver).page_source = property(lambda self: sources.pop(0))
+    driver.find_elements.return_value = [Mock()]
+    driver.get_log.return_value = [
+        {'timestamp': 1, 'level': 'INFO', 'message': 'старый тест'},
+        {'timestamp': 5, 'level': 'SEVERE', 'message': 'TypeError'},
+    ]
+    return driver
+
+
+def read_gz(path):
+    return gzip.decompress(path.read_bytes()).decode('utf-8')
+
+
+@pytest.fixture(scope='module')
+def artifacts():
+    # Модуль артефактов импортирует Selenium — только при запуске теста
+    from tests.ui import artifacts
+
+    return artifacts
+
+
+@pytest.mark.unit
+def test_buffer_keeps_only_recent_events(artifacts):
+    buffer = artifacts.EventBuffer(maxlen=2)
+
+    buffer.add_network(NETWORK)
+
+    assert [event['type'] for event in buffer.as_list()] == ['response',
+                                                             'failed']
+    assert buffer.as_list()[1]['url'] == 'https://app/login'
+
+
+@pytest.mark.unit
+def test_failure_artifacts_are_written_compressed(tmp_path, artifacts):
+    writer = artifacts.ArtifactWriter(str(tmp_path), max_bytes=10 ** 6)
+    buffer = artifacts.EventBuffer()
+    buffer.add_network(NETWORK)
+    driver = make_driver(['<iframe body>', '<top>', '<iframe body>'])
+
+    directory = writer.capture('tests/ui/test_x.py::test_y[a b]', driver,
+                               buffer, since=2)
+    writer.close()
+
+    files = {path.name: path for path in tmp_path.rglob('*')
+             if path.is_file()}
+    assert directory.endswith('tests_ui_test_x.py_test_y[a_b]')
+    assert set(files) == {'screenshot.png', 'dom-top.html.gz',
+                          'dom-assistant.html.gz', 'events.json.gz'}
+    assert read_gz(files['dom-top.html.gz']) == '<top>'
+    events = json.loads(read_gz(files['events.json.gz']))
+    assert [event['type'] for event in events] == [
+        'request', 'response', 'failed', 'console']
+
+
+@pytest.mark.unit
+def test_current_frame_is_saved_when_it_is_not_top_or_assistant(
+        tmp_path, artifacts):
+    writer = artifacts.ArtifactWriter(str(tmp_path), max_bytes=10 ** 6)
+    driver = make_driver(['<dialog>', '<top>'])
+    driver.find_elements.return_value = []
+
+    writer.capture('test_dialog', driver, artifacts.EventBuffer())
+    writer.close()
+
+    assert read_gz(tmp_path / 'test_dialog' / 'dom-current.html.gz') == \
+        '<dialog>'
+
+
+@pytest.mark.unit
+def test_dead_browser_still_gives_events(tmp_path, artifacts):
+    from selenium.common.exceptions import WebDriverException
+
+    writer = artifacts.ArtifactWriter(str(tmp_path), max_bytes=10 ** 6)
+    driver = Mock()
+    driver.get_screenshot_as_png.side_effect = WebDriverException()
+    type(driver).page_source = property(
+        Mock(side_effect=WebDriverException()))
+    driver.get_log.side_effect = WebDriverException()
+
+    writer.capture('test_dead', driver, artifacts.EventBuffer())
+    writer.close()
+
+    assert [path.name for path in (tmp_path / 'test_dead').iterdir()] == [
+        'events.json.gz']
+
+
+@pytest.mark.unit
+def test_wait_returns_once_files_are_on_disk(tmp_path, artifacts):
+    writer = artifacts.ArtifactWriter(str(tmp_path), max_bytes=10 ** 6)
+    driver = make_driver(['<top>', '<top>'])
+    driver.find_elements.return_value = []
+
+    directory = writer.capture('test_wait', driver, artifacts.EventBuffer())
+    writer.wait(directory)
+
+    assert (tmp_path / 'test_wait' / 'screenshot.png').read_bytes() == \
+        b'\x89PNG'
+    writer.close()
+
+
+@pytest.mark.unit
+def test_size_cap_stops_capturing(tmp_path, artifacts):
+    writer = artifacts.ArtifactWriter(str(tmp_path), max_bytes=100)
+    driver = make_driver(['<top>'] * 10)
+    driver.get_screenshot_as_png.return_value = b'x' * 80
+
+    writer.capture('test_one', driver, artifacts.EventBuffer())
+    writer.close()
+    second = writer.capture('test_two', driver, artifacts.EventBuffer())
+
+    assert second is None
+    assert writer.written <= 100
+    assert writer.dropped >= 1
@@ -0,0 +1,68 @@
+from unittest.mock import Mock
+
+import pytest
+from pages.round_trips import RoundTripStats
+
+ANSWER = {'reason': 'done', 'ttft': 310.4, 'total': 900.2, 'stream': 589.8,
+          'updates': 20, 'text': ' '.join(['слово'] * 20)}
+
+
+@pytest.fixture(scope='module')
+def assistant():
+    # Страница ассистента импортирует Selenium — только при запуске теста
+    from pages import assistant_page
+
+    return assistant_page
+
+
+@pytest.fixture
+def make_page(assistant):
+    def make(*results):
+        driver = Mock()
+        driver.execute_async_script.side_effect = list(results)
+        page = assistant.AssistantPage(driver)
+        page.round_trips.stats = RoundTripStats()
+        return page
+    return make
+
+
+@pytest.mark.unit
+def test_ask_measures_answer_in_one_script_call(make_page):
+    page = make_page(ANSWER)
+
+    sample = page.ask('Привет', timeout=5)
+
+    assert sample == {'ttft_ms': 310, 'total_ms': 900, 'tokens': 20,
+                      'tokens_per_s': 32.2, 'updates': 20}
+    page.driver.execute_async_script.assert_called_once()
+    args = page.driver.execute_async_script.call_args[0]
+    assert args[1:5] == ('textarea', 'button[type="submit"]',
+                         '.message.assistant', 'Привет')
+
+
+@pytest.mark.unit
+def test_ask_raises_when_chat_or_answer_is_missing(make_page):
+    from selenium.common.exceptions import (NoSuchElementException,
+                                            TimeoutException)
+
+    with pytest.raises(NoSuchElementException):
+        make_page({'error': 'textarea'}).ask('Привет')
+    with pytest.raises(TimeoutException):
+        make_page(dict(ANSWER, reason='timeout')).ask('Привет')
+
+
+@pytest.mark.unit
+def test_benchmark_skips_warmup_and_reports_percentiles(make_page,
+                                                         assistant):
+    answers = [dict(ANSWER, ttft=ttft, total=ttft + 500)
+               for ttft in (5000, 100, 200, 300, 400)]
+    page = make_page(*answers)
+    bench = assistant.AssistantBenchmark(page, repeat=4, warmup=1)
+
+    summary = bench.run(['Привет'])
+
+    stats = summary['Привет']
+    assert stats['ttft_ms'] == {'p50': 200, 'p90': 400, 'p95': 400,
+                                'max': 400}
+    assert stats['total_ms']['p50'] == 700
+    assert 'ttft_ms' in bench.report()
@@ -0,0 +1,53 @@
+from unittest.mock import Mock
+
+import pytest
+
+
+@pytest.fixture
+def make_pool():
+    # Пул тянет Selenium, поэтому импорт здесь, а не при сборе модуля
+    from tests.ui.browser_pool import BrowserPool
+
+    def make(max_uses=3):
+        return BrowserPool(lambda: Mock(window_handles=['main']),
+                           max_uses=max_uses)
+    return make
+
+
+@pytest.mark.unit
+def test_pool_reuses_warm_browser(make_pool):
+    pool = make_pool()
+
+    first = pool.acquire()
+    pool.release(first)
+    second = pool.acquire()
+
+    assert second is first
+    assert pool.launched == 1
+    first.execute_cdp_cmd.assert_any_call('Network.clearBrowserCookies', {})
+
+
+@pytest.mark.unit
+def test_pool_recycles_browser_after_max_uses(make_pool):
+    pool = make_pool(max_uses=2)
+
+    browser = pool.acquire()
+    pool.release(browser)
+    pool.release(pool.acquire())
+
+    assert pool.acquire() is not browser
+    browser.quit.assert_called_once()
+
+
+@pytest.mark.unit
+def test_pool_drops_crashed_browser(make_pool):
+    from selenium.common.exceptions import WebDriverException
+
+    pool = make_pool()
+    browser = pool.acquire()
+    browser.switch_to.default_content.side_effect = WebDriverException('crash')
+
+    pool.release(browser)
+
+    assert pool.acquire() is not browser
+    assert pool.launched == 2
@@ -0,0 +1,71 @@
+import json
+
+import pytest
+from plugins.cases import iter_cases, parse_shard
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / 'emails.csv'
+    rows = ['email,expected'] + [f'user{i}@mail.ru,{i % 2 == 0}'
+                                 for i in range(10)]
+    path.write_text('\n'.join(rows) + '\n', encoding='utf-8')
+    return str(path)
+
+
+@pytest.mark.unit
+def test_cases_are_read_only_on_access(csv_file):
+    cases = [case for case, _ in iter_cases([csv_file])]
+
+    assert len(cases) == 10
+    assert all(case._data is None for case in cases)
+    assert cases[3].email == 'user3@mail.ru'
+    assert cases[3]['expected'] == 'False'
+
+    cases[3].release()
+    assert cases[3]._data is None
+
+
+@pytest.mark.unit
+def test_types_and_ids_from_field(csv_file):
+    [(case, case_id)] = list(iter_cases(
+        [csv_file], id_field='email', types={'expected': bool},
+        shard=(0, 10)))
+
+    assert case_id == 'user0@mail.ru'
+    assert case.expected is True
+
+
+@pytest.mark.unit
+def test_shards_cover_every_case_once(csv_file, tmp_path):
+    second = tmp_path / 'more.jsonl'
+    second.write_text(''.join(json.dumps({'n': i}) + '\n' for i in range(7)))
+    paths = [csv_file, str(second)]
+
+    everything = [case_id for _, case_id in iter_cases(paths)]
+    shards = [[case_id for _, case_id in iter_cases(paths, shard=(k, 3))]
+              for k in range(3)]
+
+    assert sorted(sum(shards, [])) == sorted(everything)
+    assert len(everything) == 17
+    assert max(map(len, shards)) - min(map(len, shards)) <= 1
+
+
+@pytest.mark.unit
+def test_jsonl_skips_blank_and_comment_lines(tmp_path):
+    path = tmp_path / 'questions.jsonl'
+    path.write_text('# вопросы\n{"question": "Привет"}\n\n'
+                    '{"question": "/start"}\n', encoding='utf-8')
+
+    cases = list(iter_cases([str(path)]))
+
+    assert [case_id for _, case_id in cases] == ['questions:2',
+                                                  'questions:4']
+    assert cases[1][0].question == '/start'
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('value', ['3', '0/2', '3/2', 'a/b'])
+def test_bad_shard_is_rejected(value):
+    with pytest.raises(pytest.UsageError):
+        parse_shard(value)
@@ -0,0 +1,58 @@
+import os
+
+import pytest
+from plugins.changed import DependencyGraph
+
+
+def write(root, name, text=''):
+    path = root / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return str(path)
+
+
+@pytest.fixture
+def project(tmp_path):
+    write(tmp_path, 'conftest.py', "pytest_plugins = ['plugins.timing']\n")
+    write(tmp_path, 'plugins/__init__.py')
+    write(tmp_path, 'plugins/timing.py')
+    write(tmp_path, 'utils/__init__.py')
+    write(tmp_path, 'utils/utils.py', 'import re\n')
+    write(tmp_path, 'utils/other.py')
+    write(tmp_path, 'tests/__init__.py')
+    write(tmp_path, 'tests/api/__init__.py')
+    write(tmp_path, 'tests/api/bot.py', 'from utils import utils\n')
+    write(tmp_path, 'tests/api/rules.json', '{}')
+    write(tmp_path, 'tests/api/test_bot.py', 'from .bot import Bot\n')
+    write(tmp_path, 'unit/test_utils.py',
+          'from utils.utils import is_email_valid\n')
+    return tmp_path
+
+
+def names(graph, root, path):
+    return {os.path.relpath(p, root) for p in graph.closure(str(path))}
+
+
+@pytest.mark.unit
+class TestDependencyGraph:
+
+    def test_closure_follows_relative_imports_and_data_files(self, project):
+        graph = DependencyGraph(str(project))
+
+        closure = names(graph, project, project / 'tests/api/test_bot.py')
+
+        assert {'tests/api/bot.py', 'utils/utils.py', 'tests/api/rules.json',
+                'conftest.py', 'plugins/timing.py'} <= closure
+        assert 'utils/other.py' not in closure
+
+    def test_fingerprint_changes_only_with_dependencies(self, project):
+        test_file = project / 'unit/test_utils.py'
+        before = DependencyGraph(str(project)).fingerprint(str(test_file))
+
+        write(project, 'utils/other.py', 'x = 1\n')
+        unrelated = DependencyGraph(str(project)).fingerprint(str(test_file))
+        write(project, 'utils/utils.py', 'import re\nx = 1\n')
+        related = DependencyGraph(str(project)).fingerprint(str(test_file))
+
+        assert unrelated == before
+        assert related != before
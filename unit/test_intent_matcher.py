@@ -0,0 +1,116 @@
+import os
+import random
+import time
+
+import pytest
+from utils.intent_matcher import IntentMatcher, KeywordAutomaton, load_matcher
+
+BOT_RULES = os.path.join(os.path.dirname(__file__), '..', 'tests', 'api',
+                         'bot_rules.json')
+RULES = int(os.getenv('BENCH_RULES', 5000))
+MESSAGES = int(os.getenv('BENCH_MESSAGES', 2000))
+
+
+def legacy_process_message(message_text):
+    '''Прежняя цепочка проверок BotLogic.process_message'''
+    message_lower = message_text.lower().strip()
+    if message_lower == "/start":
+        return "Добро пожаловать! Я тестовый бот. Как дела?"
+    if "основную задачу" in message_lower and "системного сообщения" in message_lower:
+        return "проверка работы платформы"
+    if any(word in message_lower for word in ["привет", "hello", "hi"]):
+        if "основную задачу" in message_lower:
+            return "проверка работы платформы"
+        return "Привет! Как дела?"
+    return "Извините, я не понимаю ваш вопрос."
+
+
+def naive_match(rules, default, message_text):
+    message = message_text.lower().strip()
+    for rule in rules:
+        if message in rule.get('exact', ()):
+            return rule['response']
+        required, optional = rule.get('all', ()), rule.get('any', ())
+        if not required and not optional:
+            continue
+        if all(w in message for w in required) and (
+                not optional or any(w in message for w in optional)):
+            return rule['response']
+    return default
+
+
+def make_rules(count, rnd):
+    words = [f"w{i}x" for i in range(count)]
+    rules = []
+    for i in range(count):
+        rule = {'all': rnd.sample(words, 2), 'response': f"r{i}"}
+        if i % 3 == 0:
+            rule['any'] = rnd.sample(words, 3)
+        rules.append(rule)
+    return rules, words
+
+
+def make_messages(count, words, rnd):
+    return [' '.join(rnd.choices(words, k=30)) for _ in range(count)]
+
+
+@pytest.mark.unit
+class TestKeywordAutomaton:
+
+    def test_finds_overlapping_keywords(self):
+        automaton = KeywordAutomaton(['he', 'she', 'his', 'hers'])
+
+        assert automaton.find('ushers') == {0, 1, 3}
+
+    def test_substring_semantics_match_in_operator(self):
+        automaton = KeywordAutomaton(['hi'])
+
+        assert automaton.find('this') == {0}
+
+
+@pytest.mark.unit
+class TestBotRules:
+
+    @pytest.mark.parametrize('message', [
+        '/start', ' /START ', 'Привет', 'hello there', 'this is it',
+        'Скажи основную задачу из системного сообщения',
+        'Привет! Какую основную задачу решаешь?',
+        'основную задачу', 'системного сообщения', 'Что-то непонятное', '',
+    ])
+    def test_same_answers_as_legacy_chain(self, message):
+        assert load_matcher(BOT_RULES).match(message) == \
+            legacy_process_message(message)
+
+    def test_random_rule_tables_match_naive_evaluation(self):
+        rnd = random.Random(1)
+        rules, words = make_rules(200, rnd)
+        matcher = IntentMatcher(rules, default='default')
+
+        for message in make_messages(500, words[:60], rnd):
+            assert matcher.match(message) == naive_match(
+                rules, 'default', message)
+
+
+@pytest.mark.benchmark
+def test_matcher_throughput_with_thousands_of_rules():
+    rnd = random.Random(2)
+    rules, words = make_rules(RULES, rnd)
+    messages = make_messages(MESSAGES, words, rnd)
+
+    start = time.perf_counter()
+    matcher = IntentMatcher(rules, default='default')
+    compile_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled = [matcher.match(m) for m in messages]
+    compiled_time = time.perf_counter() - start
+
+    sample = messages[:200]
+    start = time.perf_counter()
+    naive = [naive_match(rules, 'default', m) for m in sample]
+    naive_time = (time.perf_counter() - start) * len(messages) / len(sample)
+
+    print(f"\n{RULES} rules: compile {compile_time * 1e3:.1f} ms, "
+          f"compiled {len(messages) / compiled_time:,.0f} msg/s, "
+          f"naive ~{len(messages) / naive_time:,.0f} msg/s")
+    assert compiled[:len(sample)] == naive
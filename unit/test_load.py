@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+from utils.settings import settings
+from utils.utils import percentile
+
+LOGIN_ENDPOINT = settings.login_endpoint
+USER_ENDPOINT = settings.user_endpoint
+
+
+def fake_backend(httpx):
+    """Отвечает как бэкенд: логин выдаёт токен, профиль требует его."""
+    def handle(request):
+        if request.url.path == LOGIN_ENDPOINT:
+            return httpx.Response(200, json={"accessToken": "token"})
+        if request.headers.get("Authorization") == "Bearer token":
+            return httpx.Response(200, json={"email": "user@test.ru"})
+        return httpx.Response(401)
+    return httpx.MockTransport(handle)
+
+
+@pytest.mark.unit
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([], 50) is None
+
+
+@pytest.mark.unit
+def test_load_runner_reports_every_endpoint():
+    # httpx и клиенты API импортируются в тесте: сбор `pytest -m unit`
+    # их не загружает
+    import httpx
+
+    from tests.api.load import LoadRunner
+
+    runner = LoadRunner(
+        base_url="http://backend", email="user@test.ru", password="secret",
+        concurrency=4, duration=0.2, transport=fake_backend(httpx),
+    )
+
+    report = asyncio.run(runner.run())
+
+    login = report["endpoints"][LOGIN_ENDPOINT]
+    user = report["endpoints"][USER_ENDPOINT]
+    assert login["requests"] > 0 and user["requests"] > 0
+    assert login["error_rate"] == 0 and user["error_rate"] == 0
+    assert set(user["latency_ms"]) == {"p50", "p95", "p99"}
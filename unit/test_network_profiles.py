@@ -0,0 +1,103 @@
+import json
+from unittest.mock import Mock
+
+import pytest
+
+
+def perf_entry(method, **params):
+    return {'message': json.dumps({'message': {'method': method,
+                                               'params': params}})}
+
+
+@pytest.fixture(scope='module')
+def network():
+    # Профили импортируют Selenium: при сборе unit-тестов он не нужен
+    from tests.ui import network_profiles as network
+
+    return network
+
+
+@pytest.mark.unit
+def test_allow_removes_class_from_profile(network):
+    profile = network.NetworkProfile('lean', allow=['assistant'])
+
+    assert 'assistant' not in profile.classes
+    assert '*embed.aifromspace.com*' not in profile.patterns
+    assert '*.woff2' in profile.patterns
+
+
+@pytest.mark.unit
+def test_marker_kwargs_build_profile(network):
+    marker = Mock(args=('no-third-party',), kwargs={'block': ['image'],
+                                                   'throttle': 'fast-3g'})
+
+    profile = network.NetworkProfile.from_marker(marker, default='lean')
+
+    assert profile.classes == ['analytics', 'image']
+    assert profile.throttle == 'fast-3g'
+
+
+@pytest.mark.unit
+def test_apply_sends_cdp_commands(network):
+    driver = Mock()
+
+    network.NetworkProfile('slow-3g').apply(driver)
+
+    driver.execute_cdp_cmd.assert_any_call(
+        'Network.setBlockedURLs',
+        {'urls': network.NetworkProfile('slow-3g').patterns})
+    assert driver.execute_cdp_cmd.call_args[0][0] == \
+        'Network.emulateNetworkConditions'
+
+
+@pytest.mark.unit
+def test_stats_estimate_saved_bytes_from_previous_runs(network):
+    stats = network.NetworkStats(sizes={'cdn.example.com/logo.png': 2048})
+    driver = Mock()
+    driver.get_log.return_value = [
+        perf_entry('Network.requestWillBeSent', requestId='1',
+                   request={'url': 'https://cdn.example.com/logo.png?v=2'}),
+        perf_entry('Network.loadingFailed', requestId='1',
+                   blockedReason='inspector'),
+        perf_entry('Network.requestWillBeSent', requestId='2',
+                   request={'url': 'https://app.example.com/app.js'}),
+        perf_entry('Network.loadingFinished', requestId='2',
+                   encodedDataLength=1000),
+    ]
+
+    stats.collect(driver)
+
+    assert (stats.requests, stats.blocked) == (2, 1)
+    assert stats.saved_bytes == 2048
+    assert stats.sizes['app.example.com/app.js'] == 1000
+
+
+@pytest.mark.unit
+def test_unknown_profile_is_rejected(network):
+    with pytest.raises(ValueError):
+        network.NetworkProfile('turbo')
+
+
+def blocked_events(*urls):
+    events = [{'method': 'Network.requestWillBeSent',
+               'params': {'requestId': str(i), 'request': {'url': url}}}
+              for i, url in enumerate(urls)]
+    return events + [{'method': 'Network.loadingFailed',
+                      'params': {'requestId': str(i),
+                                 'blockedReason': 'inspector'}}
+                     for i in range(len(urls))]
+
+
+@pytest.mark.unit
+def test_summary_says_when_blocked_sizes_are_unknown(network):
+    urls = ('https://cdn.example.com/logo.png',
+            'https://cdn.example.com/font.woff2')
+    seeded = network.NetworkStats(sizes={'cdn.example.com/logo.png': 2048})
+    seeded.consume(blocked_events(*urls))
+    fresh = network.NetworkStats()
+    fresh.consume(blocked_events(*urls))
+
+    assert '~2 KiB saved (size known for 1 of 2)' in seeded.summary()
+    assert fresh.saved_bytes == 0
+    assert 'saved bytes unknown' in fresh.summary()
+    assert 'UI_NETWORK_PROFILE=full' in fresh.summary()
@@ -0,0 +1,96 @@
+from unittest.mock import Mock
+
+import pytest
+
+LOGIN = {'url': 'https://app/', 'ttfb': 80, 'lcp': 400, 'resources': 3,
+         'resource_bytes': 2048, 'slowest_resources': [['https://app/a.js',
+                                                         120]]}
+DASHBOARD = {'url': 'https://app/dashboard', 'ttfb': 90, 'lcp': 900}
+
+
+@pytest.fixture
+def make_metrics():
+    # Page objects импортируют Selenium — только когда тест запущен
+    from pages.metrics import PageMetrics
+
+    return PageMetrics
+
+
+@pytest.mark.unit
+def test_each_page_is_measured_with_one_script_call(make_metrics):
+    driver = Mock()
+    driver.execute_async_script.side_effect = [LOGIN, DASHBOARD]
+    metrics = make_metrics(driver)
+
+    metrics.visit('login')
+    metrics.collect()
+    metrics.collect('login')
+    metrics.visit('dashboard')
+    metrics.finish()
+
+    assert driver.execute_async_script.call_count == 2
+    assert metrics.pages['login']['lcp'] == 400
+    assert metrics.pages['dashboard']['lcp'] == 900
+    driver.switch_to.default_content.assert_called_once()
+
+
+@pytest.mark.unit
+def test_lost_document_does_not_fail_the_test(make_metrics):
+    from selenium.common.exceptions import WebDriverException
+
+    driver = Mock()
+    driver.execute_async_script.side_effect = WebDriverException('unload')
+    metrics = make_metrics(driver)
+
+    metrics.collect('login')
+
+    assert metrics.pages == {}
+
+
+@pytest.mark.unit
+def test_login_flow_measures_time_to_assistant(make_metrics):
+    from pages.dashboard_page import DashboardPage
+    from pages.login_page import LoginPage
+    from pages.waits import WaitStats, Waiter
+
+    driver = Mock()
+    driver.execute_async_script.return_value = dict(LOGIN)
+    metrics = make_metrics(driver)
+    waiter = Waiter(driver, timeout=0.3, mode='js', stats=WaitStats())
+    login_page = LoginPage(driver, metrics=metrics)
+    dashboard_page = DashboardPage(driver, metrics=metrics)
+    login_page.waiter = dashboard_page.waiter = waiter
+    login_page.round_trips.stats = None
+
+    login_page.open()
+    login_page.click_login_button()
+    dashboard_page.wait_for_url_contain('dashboard')
+    dashboard_page.get_assistant_header()
+
+    assert metrics.current == 'dashboard'
+    assert set(metrics.pages) == {'login', 'dashboard'}
+    assert metrics.pages['dashboard']['time_to_assistant'] >= 0
+
+
+@pytest.mark.unit
+def test_budgets_per_page_and_for_all_pages(make_metrics):
+    metrics = make_metrics(Mock())
+    metrics.pages = {'login': dict(LOGIN), 'dashboard': dict(DASHBOARD)}
+
+    assert metrics.over_budget({'lcp': 1000, 'login.ttfb': 100}) == []
+    assert metrics.over_budget({'lcp': 500}) == [
+        'dashboard.lcp: 900 мс > бюджета 500 мс']
+    assert metrics.over_budget({'dashboard.time_to_assistant': 5000}) == [
+        'dashboard.time_to_assistant: не измерено (бюджет 5000 мс)']
+
+
+@pytest.mark.unit
+def test_summary_lists_metrics_and_slowest_resources(make_metrics):
+    metrics = make_metrics(Mock())
+    metrics.pages = {'login': dict(LOGIN)}
+
+    summary = metrics.summary()
+
+    assert 'login: ttfb=80, lcp=400' in summary
+    assert '3 resources, 2 KiB' in summary
+    assert 'https://app/a.js' in summary
@@ -0,0 +1,81 @@
+import io
+import sqlite3
+
+import pytest
+from plugins.perf_history import (HistoryWriter, detect_regression,
+                                  endpoint_key, report)
+
+
+@pytest.mark.unit
+class TestDetectRegression:
+
+    def test_noise_is_not_a_regression(self):
+        values = [1.0, 1.1, 0.9, 1.05, 0.95, 1.0, 1.1, 1.08, 0.97]
+
+        assert detect_regression(values) is None
+
+    def test_slow_drift_is_flagged(self):
+        # Каждый прогон чуть медленнее предыдущего, к концу вдвое
+        values = [1.0 + 0.05 * i for i in range(23)]
+
+        base, current, score, kind = detect_regression(values)
+
+        assert kind == 'trend'
+        assert current / base > 1.5
+        assert score > 3
+
+    def test_step_is_flagged(self):
+        values = [1.0, 1.1, 0.9, 1.05, 0.95, 1.0, 1.02, 2.0, 2.1, 1.9]
+
+        assert detect_regression(values)[3] == 'step'
+
+    def test_short_history_is_ignored(self):
+        assert detect_regression([1, 1, 5, 5, 5]) is None
+
+
+@pytest.mark.unit
+def test_endpoint_key_hides_token_and_ids():
+    key = endpoint_key('POST', 'https://api.telegram.org/bot123:abc/'
+                               'sendMessage?x=1')
+
+    assert key == 'POST api.telegram.org/bot<token>/sendMessage'
+    assert endpoint_key('GET', 'https://h/api/users/42') == \
+        'GET h/api/users/{id}'
+
+
+@pytest.mark.unit
+def test_writer_and_report_round_trip(tmp_path):
+    path = str(tmp_path / 'history.sqlite')
+    for run in range(10):
+        writer = HistoryWriter(path)
+        writer.start()
+        latency = 0.1 if run < 7 else 0.3
+        writer.add('test', ('unit/test_x.py::test_a', 'passed', 1.0))
+        writer.add('request', ('unit/test_x.py::test_a',
+                               'POST h/api/auth/login', 200, latency))
+        writer.close()
+
+    out = io.StringIO()
+    found = report(path, out=out)
+
+    assert found == 1
+    assert 'POST h/api/auth/login' in out.getvalue()
+    db = sqlite3.connect(path)
+    assert db.execute('SELECT COUNT(*) FROM runs').fetchone()[0] == 10
+
+
+@pytest.mark.unit
+def test_report_handles_zero_baseline(tmp_path):
+    path = str(tmp_path / 'history.sqlite')
+    for run in range(10):
+        writer = HistoryWriter(path)
+        writer.start()
+        writer.add('request', ('unit/test_x.py::test_a', 'GET h/api/me',
+                               200, 0.0 if run < 7 else 0.2))
+        writer.close()
+
+    out = io.StringIO()
+    found = report(path, out=out)
+
+    assert found == 1
+    assert 'new' in out.getvalue()
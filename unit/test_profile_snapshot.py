@@ -0,0 +1,72 @@
+import os
+
+import pytest
+from tests.ui.profile_snapshot import ProfileSnapshot
+
+
+def fake_chrome(user_data_dir):
+    """Вместо Chrome: раскладывает файлы так, как их оставляет браузер."""
+    for name in ('Default/Cache/data_0', 'Default/Code Cache/js/index',
+                 'Default/Cookies', 'Default/Local Storage/leveldb/LOG',
+                 'SingletonLock'):
+        path = os.path.join(user_data_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write('x')
+
+
+@pytest.mark.unit
+def test_snapshot_keeps_caches_and_drops_user_state(tmp_path):
+    snapshot = ProfileSnapshot(str(tmp_path / 'root'), fake_chrome)
+
+    clone = snapshot.clone(str(tmp_path / 'clone'))
+
+    assert os.path.exists(os.path.join(clone, 'Default/Cache/data_0'))
+    assert os.path.exists(os.path.join(clone, 'Default/Code Cache/js/index'))
+    assert not os.path.exists(os.path.join(clone, 'Default/Cookies'))
+    assert not os.path.exists(os.path.join(clone, 'Default/Local Storage'))
+    assert not os.path.lexists(os.path.join(clone, 'SingletonLock'))
+
+
+@pytest.mark.unit
+def test_snapshot_is_built_once_while_fresh(tmp_path):
+    builds = []
+
+    def build(path):
+        builds.append(path)
+        fake_chrome(path)
+
+    snapshot = ProfileSnapshot(str(tmp_path), build)
+    snapshot.clone(str(tmp_path / 'a'))
+    snapshot.clone(str(tmp_path / 'b'))
+
+    assert len(builds) == 1
+
+
+@pytest.mark.unit
+def test_stale_or_other_version_snapshot_is_rebuilt(tmp_path):
+    ProfileSnapshot(str(tmp_path), fake_chrome, version='1').ensure()
+
+    expired = ProfileSnapshot(str(tmp_path), fake_chrome, max_age=0,
+                              version='1')
+    upgraded = ProfileSnapshot(str(tmp_path), fake_chrome, version='2')
+
+    assert not expired.is_fresh()
+    assert not upgraded.is_fresh()
+    upgraded.ensure()
+    assert upgraded.rebuilt and upgraded.is_fresh()
+
+
+@pytest.mark.unit
+def test_clones_do_not_share_files(tmp_path):
+    snapshot = ProfileSnapshot(str(tmp_path / 'root'), fake_chrome)
+    first = snapshot.clone(str(tmp_path / 'first'))
+    second = snapshot.clone(str(tmp_path / 'second'))
+
+    with open(os.path.join(first, 'Default/Cache/data_0'), 'w') as f:
+        f.write('changed')
+
+    with open(os.path.join(second, 'Default/Cache/data_0')) as f:
+        assert f.read() == 'x'
+    with open(os.path.join(snapshot.path, 'Default/Cache/data_0')) as f:
+        assert f.read() == 'x'
@@ -0,0 +1,132 @@
+import pytest
+from pages.round_trips import RoundTripStats, RoundTrips
+
+
+class FakeElement:
+
+    def __init__(self, driver, stale=0):
+        self.driver = driver
+        self.stale = stale
+
+    def send_keys(self, text):
+        self.driver.execute('sendKeysToElement')
+
+    def click(self):
+        if self.stale:
+            from selenium.common.exceptions import \
+                StaleElementReferenceException
+
+            self.stale -= 1
+            raise StaleElementReferenceException()
+        self.driver.execute('clickElement')
+
+
+class FakeDriver:
+    """Как в Selenium: каждая операция — одна команда через execute."""
+
+    def __init__(self, script_result=None, stale=0):
+        self.commands = []
+        self.script_result = script_result
+        self.stale = stale
+
+    def execute(self, command, params=None):
+        self.commands.append(command)
+
+    def get(self, url):
+        self.execute('get')
+
+    def find_element(self, by, value):
+        self.execute('findElement')
+        element = FakeElement(self, self.stale)
+        self.stale = 0
+        return element
+
+    def execute_script(self, script, *args):
+        self.execute('executeScript')
+        return self.script_result
+
+
+@pytest.fixture
+def make_page():
+    # LoginPage тянет Selenium: импорт при запуске теста, не при сборе
+    from pages.login_page import LoginPage
+
+    def make(driver, **kwargs):
+        page = LoginPage(driver, **kwargs)
+        page.round_trips.stats = RoundTripStats()
+        return page
+    return make
+
+
+@pytest.mark.unit
+def test_native_login_takes_six_round_trips(make_page):
+    page = make_page(FakeDriver(), action_mode='native')
+
+    page.login('user@mail.ru', 'secret')
+
+    assert page.round_trips.last['LoginPage.login'] == 6
+    assert page.round_trips.last['LoginPage.enter_email'] == 2
+
+
+@pytest.mark.unit
+def test_batch_login_takes_one_round_trip(make_page):
+    driver = FakeDriver()
+    page = make_page(driver, action_mode='batch')
+
+    page.login('user@mail.ru', 'secret')
+
+    assert driver.commands == ['executeScript']
+    assert page.round_trips.last['LoginPage.login'] == 1
+
+
+@pytest.mark.unit
+def test_mode_argument_overrides_page_mode(make_page):
+    page = make_page(FakeDriver(), action_mode='batch')
+
+    page.login('user@mail.ru', 'secret', mode='native')
+
+    assert page.round_trips.last['LoginPage.login'] == 6
+
+
+@pytest.mark.unit
+def test_batch_login_reports_missing_field(make_page):
+    from selenium.common.exceptions import NoSuchElementException
+
+    page = make_page(FakeDriver(script_result=['id', 'email']),
+                     action_mode='batch')
+
+    with pytest.raises(NoSuchElementException):
+        page.login('user@mail.ru', 'secret')
+
+
+@pytest.mark.unit
+def test_elements_are_cached_until_navigation(make_page):
+    driver = FakeDriver()
+    page = make_page(driver, action_mode='native')
+
+    page.enter_email('a')
+    page.enter_email('b')
+    assert driver.commands.count('findElement') == 1
+
+    page.open()
+    page.enter_email('c')
+    assert driver.commands.count('findElement') == 2
+
+
+@pytest.mark.unit
+def test_stale_element_is_found_again(make_page):
+    driver = FakeDriver(stale=1)
+    page = make_page(driver, action_mode='native')
+
+    page.click_login_button()
+
+    assert driver.commands == ['findElement', 'findElement', 'clickElement']
+
+
+@pytest.mark.unit
+def test_counter_is_installed_once_per_driver(make_page):
+    driver = FakeDriver()
+
+    assert RoundTrips.install(driver) is RoundTrips.install(driver)
+    make_page(driver).open()
+    assert driver._round_trips.total == 1
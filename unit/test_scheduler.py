@@ -0,0 +1,124 @@
+import pytest
+from plugins.scheduler import parse_groups, plan_schedule
+
+
+@pytest.mark.unit
+class TestPlanSchedule:
+
+    def test_longest_tests_are_spread_first(self):
+        tests = [('a', 5, None), ('b', 4, None), ('c', 3, None),
+                 ('d', 3, None), ('e', 1, None)]
+
+        plan = plan_schedule(tests, 2, {})
+
+        assert plan == [['a', 'd'], ['b', 'c', 'e']]
+
+    def test_group_limit_keeps_tests_on_its_lanes(self):
+        tests = [(f'ui{i}', 2, 'ui smoke') for i in range(6)]
+        tests += [(f'unit{i}', 0.1, None) for i in range(6)]
+
+        plan = plan_schedule(tests, 4, {'ui smoke': 2})
+
+        ui_workers = {w for w, queue in enumerate(plan)
+                      for key in queue if key.startswith('ui')}
+        assert len(ui_workers) == 2
+
+    def test_serial_lane_gets_whole_group(self):
+        tests = [(f'tg{i}', 1, 'telega') for i in range(3)]
+        tests += [('slow', 10, None)]
+
+        plan = plan_schedule(tests, 2, {'telega': 1})
+
+        assert plan[0] == ['tg0', 'tg1', 'tg2']
+        assert plan[1] == ['slow']
+
+    def test_parse_groups(self):
+        assert parse_groups(['ui smoke = 2']) == [
+            ('ui smoke', {'ui', 'smoke'}, 2)]
+
+
+class FakeNode:
+
+    def __init__(self, name):
+        self.gateway = type('Gateway', (), {'id': name})()
+        self.shutting_down = False
+        self.sent = []
+
+    def send_runtest_some(self, indices):
+        self.sent.extend(indices)
+
+    def shutdown(self):
+        self.shutting_down = True
+
+
+class FakeConfig:
+
+    def __init__(self, workers):
+        self.cache = self
+        self.workers = workers
+
+    def getvalue(self, name):
+        return [f'{self.workers}*popen']
+
+    def getini(self, name):
+        return {'scheduler_groups': [],
+                'scheduler_default_duration': '1.0'}[name]
+
+    def get(self, key, default):
+        return default
+
+
+@pytest.fixture
+def scheduled():
+    """Планировщик на двух воркерах, которым уже раздали четыре теста."""
+    from plugins.scheduler import DurationScheduling
+
+    sched = DurationScheduling(FakeConfig(2))
+    nodes = [FakeNode('gw0'), FakeNode('gw1')]
+    for node in nodes:
+        sched.add_node(node)
+        sched.add_node_collection(node, ['t0', 't1', 't2', 't3'])
+    sched.schedule()
+    return sched, nodes
+
+
+@pytest.mark.unit
+class TestDurationScheduling:
+
+    def test_nodes_stay_up_after_initial_distribution(self, scheduled):
+        sched, nodes = scheduled
+
+        assert sorted(nodes[0].sent + nodes[1].sent) == [0, 1, 2, 3]
+        assert not any(node.shutting_down for node in nodes)
+        assert not sched.tests_finished
+
+    def test_crashed_worker_tests_go_to_live_worker(self, scheduled):
+        sched, (crashed, alive) = scheduled
+        left = crashed.sent[:]
+
+        crashitem = sched.remove_node(crashed)
+
+        assert crashitem == sched.collection[left[0]]
+        assert alive.sent[-len(left) + 1:] == left[1:]
+        assert sched.node2pending[alive] == alive.sent
+        assert not sched.pending
+
+    def test_unscheduled_tests_return_to_queue(self, scheduled):
+        sched, (first, second) = scheduled
+        stolen = first.sent[1:]
+
+        sched.remove_pending_tests_from_node(first, stolen)
+
+        assert stolen[0] not in sched.node2pending[first]
+        assert sorted(sched.node2pending[first]
+                      + sched.node2pending[second]) == [0, 1, 2, 3]
+        assert not sched.pending
+
+    def test_tests_finish_when_queues_are_drained(self, scheduled):
+        sched, nodes = scheduled
+
+        for node in nodes:
+            for index in node.sent[:-1]:
+                sched.mark_test_complete(node, index)
+
+        assert sched.tests_finished
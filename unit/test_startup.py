@@ -0,0 +1,95 @@
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+from plugins.marker_prefilter import StaticMarkers
+from utils.settings import Settings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ('selenium', 'requests', 'httpx', 'dotenv')
+
+PROBE = textwrap.dedent("""
+    import json, sys, time
+    started = time.perf_counter()
+    import pytest
+    code = pytest.main(['-q', '-m', 'unit', '--collect-only',
+                        '-p', 'no:cacheprovider'])
+    print(json.dumps({
+        'code': int(code),
+        'elapsed': time.perf_counter() - started,
+        'loaded': [name for name in %r if name in sys.modules],
+    }))
+""" % (HEAVY,))
+
+
+@pytest.mark.benchmark
+def test_unit_collection_does_not_import_heavy_modules():
+    # Переключатели стенда и кассет не должны заставлять читать .env
+    env = dict(os.environ, API_STUB='1', API_CASSETTES='replay')
+    result = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT, env=env,
+                            capture_output=True, text=True, timeout=120)
+    stats = json.loads(result.stdout.strip().splitlines()[-1])
+    print(f"\npytest -m unit --collect-only: {stats['elapsed']:.2f}s")
+
+    assert stats['code'] == 0
+    assert stats['loaded'] == []
+
+
+@pytest.mark.unit
+def test_static_markers_follow_project_base_classes(tmp_path):
+    (tmp_path / 'base.py').write_text(textwrap.dedent("""
+        import pytest
+
+        @pytest.mark.api
+        class Base:
+            pass
+    """))
+    module = tmp_path / 'test_module.py'
+    module.write_text(textwrap.dedent("""
+        import pytest
+        from base import Base
+
+        pytestmark = pytest.mark.smoke
+
+        class TestThing(Base):
+            @pytest.mark.telega
+            def test_one(self):
+                pass
+
+        def test_two():
+            pass
+    """))
+
+    tests = StaticMarkers(str(tmp_path)).of_module(module)
+
+    assert tests == [{'smoke', 'api', 'telega'}, {'smoke'}]
+
+
+@pytest.mark.unit
+def test_static_markers_give_up_on_params(tmp_path):
+    module = tmp_path / 'test_module.py'
+    module.write_text(textwrap.dedent("""
+        import pytest
+
+        @pytest.mark.parametrize('x', [pytest.param(1, marks=pytest.mark.ui)])
+        def test_one(x):
+            pass
+    """))
+
+    assert StaticMarkers(str(tmp_path)).of_module(module) is None
+
+
+@pytest.mark.unit
+def test_settings_read_environment_on_access(monkeypatch, tmp_path):
+    settings = Settings(env_file=str(tmp_path / 'missing.env'))
+    monkeypatch.delenv('API_BASE_URL', raising=False)
+    monkeypatch.setenv('API_RETRIES', '5')
+
+    assert settings.base_url == 'https://app.aifromspace.com'
+    assert settings.api_retries == 5
+
+    monkeypatch.setenv('API_BASE_URL', 'http://127.0.0.1:8000')
+    assert settings.base_url == 'http://127.0.0.1:8000'
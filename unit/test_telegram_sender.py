@@ -0,0 +1,31 @@
+import pytest
+
+
+@pytest.fixture(scope='module')
+def sender():
+    # Модуль очереди импортирует httpx — он не нужен при сборе unit-тестов
+    from tests.api import telegram_sender
+
+    return telegram_sender
+
+
+@pytest.mark.unit
+def test_coalesce_respects_message_limit(sender):
+    texts = ['a' * 3000, 'b' * 1000, 'c' * 5000]
+
+    messages = sender.coalesce(texts)
+
+    assert all(len(m) <= sender.MESSAGE_LIMIT for m in messages)
+    assert ''.join(messages).replace('\n', '') == ''.join(texts)
+    assert len(messages) == 3
+
+
+@pytest.mark.unit
+def test_token_bucket_limits_rate(sender):
+    now = [0.0]
+    bucket = sender.TokenBucket(rate=2, capacity=1, clock=lambda: now[0])
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.5)
+    now[0] = 2.0
+    assert bucket.reserve() == 0
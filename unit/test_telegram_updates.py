@@ -0,0 +1,28 @@
+import asyncio
+
+import pytest
+
+
+@pytest.mark.unit
+def test_response_without_result_is_a_poll_error():
+    # httpx и клиент бота импортируются здесь, а не при сборе unit-тестов
+    import httpx
+
+    from tests.api.telegram_updates import UpdateStream
+
+    def handler(request):
+        return httpx.Response(200, json={'ok': True})
+
+    async def scenario():
+        stream = UpdateStream('123:abc', api_base='http://telegram.test')
+        # stop() до start() ничего не делает
+        await stream.stop()
+        stream._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler))
+        try:
+            await stream._get_updates()
+        finally:
+            await stream.stop()
+
+    with pytest.raises(ValueError, match='result'):
+        asyncio.run(scenario())
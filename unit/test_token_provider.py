@@ -0,0 +1,94 @@
+import base64
+import json
+import time
+from unittest.mock import Mock
+
+import pytest
+
+
+def make_jwt(exp):
+    payload = base64.urlsafe_b64encode(
+        json.dumps({"exp": exp}).encode()).decode().rstrip('=')
+    return f"header.{payload}.signature"
+
+
+def make_session(*tokens):
+    """Mock-сессия: каждый логин выдаёт следующий токен из списка."""
+    session = Mock()
+    session.post.side_effect = [
+        Mock(status_code=200, json=Mock(return_value={"accessToken": t}))
+        for t in tokens
+    ]
+    return session
+
+
+@pytest.fixture(scope='module')
+def auth():
+    # Модуль тянет requests и filelock — импорт при запуске теста, а не
+    # при сборе `pytest -m unit`
+    from tests.api import auth
+
+    return auth
+
+
+@pytest.mark.unit
+def test_token_is_cached_in_memory(auth):
+    session = make_session(make_jwt(time.time() + 3600))
+    provider = auth.TokenProvider(session, "user@test.ru", "secret")
+
+    assert provider.get_token() == provider.get_token()
+    assert provider.login_count == 1
+
+
+@pytest.mark.unit
+def test_expired_token_is_refreshed(auth):
+    old, new = make_jwt(time.time() + 10), make_jwt(time.time() + 3600)
+    provider = auth.TokenProvider(make_session(old, new), "user@test.ru",
+                                  "secret")
+
+    assert provider.get_token() == old
+    assert provider.get_token() == new
+    assert provider.login_count == 2
+
+
+@pytest.mark.unit
+def test_request_refreshes_token_on_401(auth):
+    first, second = make_jwt(time.time() + 3600), make_jwt(time.time() + 7200)
+    session = make_session(first, second)
+    session.request.side_effect = [Mock(status_code=401), Mock(status_code=200)]
+    provider = auth.TokenProvider(session, "user@test.ru", "secret")
+
+    response = provider.get('/api/user')
+
+    assert response.status_code == 200
+    last_headers = session.request.call_args[1]['headers']
+    assert last_headers["Authorization"] == f"Bearer {second}"
+
+
+@pytest.mark.unit
+def test_disk_cache_is_shared_between_providers(tmp_path, auth):
+    token = make_jwt(time.time() + 3600)
+    first = auth.TokenProvider(make_session(token), "user@test.ru",
+                               "secret", cache_dir=str(tmp_path))
+    second = auth.TokenProvider(make_session(), "user@test.ru", "secret",
+                                cache_dir=str(tmp_path))
+
+    assert first.get_token() == token
+    # Второй "воркер" берёт токен из файла и не логинится
+    assert second.get_token() == token
+    assert second.login_count == 0
+
+
+@pytest.mark.unit
+def test_login_goes_through_login_session(auth):
+    session = Mock()
+    session.request.return_value = Mock(status_code=200)
+    login_session = make_session(make_jwt(time.time() + 3600))
+    provider = auth.TokenProvider(session, "user@test.ru", "secret",
+                                  login_session=login_session)
+
+    provider.get('/api/user')
+
+    login_session.post.assert_called_once()
+    session.post.assert_not_called()
+    session.request.assert_called_once()
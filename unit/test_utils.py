@@ -2,35 +2,22 @@ import pytest
 from utils.utils import is_password_strong
 from utils.utils import is_email_valid
 
+# Таблицы кейсов лежат в unit/cases, одна строка — один тест
+
 
 @pytest.mark.unit
 class TestPasswordUtils:
-    @pytest.mark.parametrize(
-        'password, expected',
-        [
-            ('12345', False),
-            ('asshole123', False),
-            ('SAAM1234', False),
-            ('SuperSavePassword123', True)
-        ]
-    )
-    def test_is_strong_password(self, password, expected):
+    @pytest.mark.cases('cases/passwords.csv', id_field='password',
+                       types={'expected': bool})
+    def test_is_strong_password(self, case):
         'проверяет устойчивость пароля'
-        assert is_password_strong(password) == expected
+        assert is_password_strong(case.password) == case.expected
 
 
 @pytest.mark.unit
 class TestEmailUtils:
 
-    @pytest.mark.parametrize(
-        'email, expected',
-        [
-            ('test@test.ru', True),
-            ('second_test@mail.com', True),
-            ('@ghdfv.com', False),
-            ('test@mailru.', False),
-            ('test@.com', False)
-        ]
-    )
-    def test_is_email_valid(self, email, expected):
-        assert is_email_valid(email) == expected
+    @pytest.mark.cases('cases/emails.csv', id_field='email',
+                       types={'expected': bool})
+    def test_is_email_valid(self, case):
+        assert is_email_valid(case.email) == case.expected
@@ -0,0 +1,72 @@
+import io
+import os
+import time
+
+import pytest
+from utils.utils import (count_valid, count_valid_parallel, is_email_valid,
+                         is_password_strong, validate_many)
+
+# Размер бенчмарка: BENCH_ROWS=5000000 для замеров на больших выгрузках
+ROWS = int(os.getenv('BENCH_ROWS', 50_000))
+
+
+def make_rows(count):
+    samples = ['test@test.ru', 'second_test@mail.com', '@ghdfv.com',
+               'test@mailru.', 'SuperSavePassword123', 'asshole123']
+    return (samples[i % len(samples)] for i in range(count))
+
+
+def report(name, rows, elapsed):
+    print(f"\n{name}: {rows / elapsed:,.0f} rows/s ({rows} rows)")
+
+
+@pytest.mark.unit
+class TestBatchValidators:
+
+    def test_validate_many_streams_results(self):
+        results = validate_many(iter(['test@test.ru', 'test@.com']),
+                                is_email_valid)
+
+        assert next(results) is True
+        assert next(results) is False
+
+    def test_count_valid_reads_file_lines(self):
+        export = io.StringIO('test@test.ru\ntest@.com\nsecond_test@mail.com\n')
+
+        assert count_valid(export, is_email_valid) == (2, 3)
+
+
+# Поднимает пул процессов: в быстрый `-m unit` не входит
+@pytest.mark.slow
+def test_parallel_count_matches_serial(tmp_path):
+    path = tmp_path / 'export.txt'
+    path.write_text('\n'.join(make_rows(1000)) + '\n', encoding='utf-8')
+
+    expected = count_valid(str(path), is_password_strong)
+
+    assert count_valid_parallel(
+        str(path), is_password_strong, processes=2,
+        chunk_size=100) == expected
+
+
+@pytest.mark.benchmark
+class TestValidatorsThroughput:
+
+    @pytest.mark.parametrize('validator', [is_email_valid, is_password_strong])
+    def test_single_process_rows_per_second(self, validator):
+        start = time.perf_counter()
+        valid, total = count_valid(make_rows(ROWS), validator)
+        report(validator.__name__, total, time.perf_counter() - start)
+
+        assert total == ROWS
+
+    def test_multiprocess_rows_per_second(self, tmp_path):
+        path = tmp_path / 'export.txt'
+        with open(path, 'w', encoding='utf-8') as f:
+            f.writelines(row + '\n' for row in make_rows(ROWS))
+
+        start = time.perf_counter()
+        valid, total = count_valid_parallel(str(path), is_email_valid)
+        report('is_email_valid (parallel)', total, time.perf_counter() - start)
+
+        assert total == ROWS
@@ -0,0 +1,102 @@
+import random
+import re
+import time
+
+import pytest
+from utils.utils import is_email_valid, is_password_strong
+
+# Прежние шаблоны: новые валидаторы обязаны давать те же ответы
+LEGACY_PASSWORD = re.compile(r'^(?=.*[\d])(?=.*[A-Z])(?=.*[a-z])[\w]{8,}$')
+LEGACY_EMAIL = re.compile(r'^[\w.-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+ALPHABET = 'aZ9_.-@ \nжЁ٣é'
+
+
+def random_strings(count, seed=42):
+    rnd = random.Random(seed)
+    for _ in range(count):
+        yield ''.join(rnd.choice(ALPHABET) for _ in range(rnd.randint(0, 16)))
+
+
+def pathological_inputs(n):
+    """Входы, на которых шаблон email вынужден откатываться."""
+    return {
+        'dotted domain': 'a@' + 'a.' * n,
+        'no tld': 'a@' + 'a' * n + '.1',
+        'long labels': 'a@' + ('a' * 50 + '.') * (n // 50) + '!',
+        'no at': 'a' * n,
+        'password': 'a' * n + '!',
+    }
+
+
+def best_time(func, value, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(value)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@pytest.mark.unit
+class TestSameResultsAsLegacyPatterns:
+
+    def test_random_emails(self):
+        for value in random_strings(20_000):
+            candidate = value.replace(' ', '@', 1)
+            assert is_email_valid(candidate) == (
+                LEGACY_EMAIL.search(candidate) is not None), repr(candidate)
+
+    def test_random_passwords(self):
+        for value in random_strings(20_000, seed=7):
+            assert is_password_strong(value) == (
+                LEGACY_PASSWORD.search(value) is not None), repr(value)
+
+    @pytest.mark.parametrize('value', [
+        'test@test.ru\n', 'test@test.ru\n\n', 'a@b.c', 'a@.b.cc', 'a@b..cc',
+        'a@b.c1', 'a@b@c.com', 'ёж@mail.ru', 'SuperSavePassword123\n',
+        'Super_Save_123', 'Пароль12Aa', 'Aa1٣٣٣٣٣',
+    ])
+    def test_edge_cases(self, value):
+        assert is_email_valid(value) == (LEGACY_EMAIL.search(value) is not None)
+        assert is_password_strong(value) == (
+            LEGACY_PASSWORD.search(value) is not None)
+
+
+def validator_for(name):
+    return is_password_strong if name == 'password' else is_email_valid
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('name', list(pathological_inputs(10)))
+def test_worst_case_has_no_backtracking(name):
+    '''
+    На 160 тыс. символов квадратичный откат занял бы секунды и минуты,
+    линейная проверка — единицы миллисекунд. Порог с запасом в сотни
+    раз не зависит от скорости CI-машины.
+    '''
+    value = pathological_inputs(160_000)[name]
+
+    assert best_time(validator_for(name), value, repeat=1) < 0.5
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize('name', list(pathological_inputs(10)))
+def test_worst_case_is_linear(name):
+    '''Время на входе в 8 раз длиннее растёт не больше чем линейно'''
+    small = pathological_inputs(20_000)[name]
+    large = pathological_inputs(160_000)[name]
+    validator = validator_for(name)
+
+    t_small = best_time(validator, small)
+    t_large = best_time(validator, large)
+    legacy = LEGACY_PASSWORD if name == 'password' else LEGACY_EMAIL
+    t_legacy = best_time(legacy.search, large)
+    print(f"\n{name}: {len(small)} chars {t_small * 1e3:.3f} ms, "
+          f"{len(large)} chars {t_large * 1e3:.3f} ms "
+          f"(legacy regex {t_legacy * 1e3:.3f} ms)")
+
+    # Линейный рост дал бы x8; запас на шум таймера и кеши процессора.
+    # Отношение времён на общих раннерах шумит, поэтому тест только
+    # в бенчмарках (-m benchmark), а в unit — порог выше
+    assert t_large < max(t_small, 1e-4) * 20
@@ -0,0 +1,76 @@
+from unittest.mock import Mock
+
+import pytest
+
+# By.ID: сам Selenium импортируется только в фикстурах и тестах
+LOCATOR = ('id', 'email')
+
+
+@pytest.fixture
+def make_waiter():
+    from pages.waits import WaitStats, Waiter
+
+    def make(driver, **kwargs):
+        return Waiter(driver, timeout=0.3, stats=WaitStats(), **kwargs)
+    return make
+
+
+@pytest.fixture(scope='module')
+def exceptions():
+    from selenium.common import exceptions
+
+    return exceptions
+
+
+@pytest.mark.unit
+def test_js_wait_resolves_in_one_script_call(make_waiter):
+    element = Mock()
+    driver = Mock(execute_async_script=Mock(return_value=element))
+    waiter = make_waiter(driver, mode='js')
+
+    assert waiter.visible(LOCATOR) is element
+    driver.execute_async_script.assert_called_once()
+    driver.find_element.assert_not_called()
+
+
+@pytest.mark.unit
+def test_script_timeout_is_set_once_per_driver(make_waiter):
+    driver = Mock(execute_async_script=Mock(return_value=True))
+    waiter = make_waiter(driver, mode='js')
+
+    waiter.url_contains('dashboard')
+    waiter.url_contains('dashboard')
+
+    driver.set_script_timeout.assert_called_once()
+
+
+@pytest.mark.unit
+def test_js_timeout_falls_back_to_polling_and_raises(make_waiter, exceptions):
+    driver = Mock(execute_async_script=Mock(return_value=None))
+    driver.find_element.side_effect = exceptions.NoSuchElementException()
+    waiter = make_waiter(driver, mode='js')
+
+    with pytest.raises(exceptions.TimeoutException):
+        waiter.visible(LOCATOR)
+
+
+@pytest.mark.unit
+def test_wait_times_are_recorded_per_locator(make_waiter):
+    driver = Mock()
+    driver.find_element.return_value.is_displayed.return_value = True
+    waiter = make_waiter(driver, mode='webdriver', poll_interval=0.01)
+
+    waiter.visible(LOCATOR)
+    waiter.visible(LOCATOR)
+
+    [(key, calls, total, longest)] = waiter.stats.summary()
+    assert key == 'visible id=email' and calls == 2
+
+
+@pytest.mark.unit
+def test_webdriver_mode_times_out(make_waiter, exceptions):
+    driver = Mock(current_url='https://app.aifromspace.com/')
+    waiter = make_waiter(driver, mode='webdriver', poll_interval=0.01)
+
+    with pytest.raises(exceptions.TimeoutException):
+        waiter.url_contains('dashboard')
@@ -0,0 +1,136 @@
+"""
+Сопоставление сообщений с правилами по ключевым словам.
+
+Все ключевые слова всех правил компилируются в один автомат
+Ахо-Корасик, поэтому сообщение просматривается один раз, сколько бы
+правил ни было. Правило описывается словарём:
+
+    {"exact": ["/start"], "response": "..."}          — точное совпадение
+    {"all": ["a", "b"], "any": ["x", "y"], "response": "..."}
+
+Правило срабатывает, если в сообщении есть все слова из "all" и хотя бы
+одно из "any" (пустой список не проверяется). Из сработавших правил
+побеждает то, что стоит в таблице раньше.
+"""
+import json
+from collections import deque
+from functools import lru_cache
+
+
+class KeywordAutomaton:
+    """Автомат Ахо-Корасик: находит все вхождения ключевых слов за проход."""
+
+    def __init__(self, keywords):
+        self.keywords = list(keywords)
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        for index, keyword in enumerate(self.keywords):
+            self._add(keyword, index)
+        self._link()
+
+    def find(self, text):
+        """Возвращает множество индексов ключевых слов, найденных в text."""
+        goto, fail, out = self._goto, self._fail, self._out
+        hits = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                hits.update(out[state])
+        return hits
+
+    # --- Helpers ---
+
+    def _add(self, keyword, index):
+        state = 0
+        for ch in keyword:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        self._out[state] += (index,)
+
+    def _link(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                link = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = link if link != nxt else 0
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+
+class IntentMatcher:
+    """Скомпилированная таблица правил."""
+
+    def __init__(self, rules, default=None):
+        self.rules = list(rules)
+        self.default = default
+        self._exact = {}
+        keyword_ids = {}
+        self._conditions = []
+        self._rules_by_keyword = {}
+
+        for priority, rule in enumerate(self.rules):
+            for text in rule.get('exact', ()):
+                self._exact.setdefault(self._normalize(text), priority)
+            required = frozenset(
+                keyword_ids.setdefault(word.lower(), len(keyword_ids))
+                for word in rule.get('all', ()))
+            optional = frozenset(
+                keyword_ids.setdefault(word.lower(), len(keyword_ids))
+                for word in rule.get('any', ()))
+            self._conditions.append((required, optional))
+            for keyword in required | optional:
+                self._rules_by_keyword.setdefault(keyword, []).append(
+                    priority)
+
+        self._automaton = KeywordAutomaton(keyword_ids)
+
+    def match_rule(self, message_text):
+        """Индекс сработавшего правила или None."""
+        message = self._normalize(message_text)
+        best = self._exact.get(message)
+
+        hits = self._automaton.find(message)
+        candidates = set()
+        for keyword in hits:
+            candidates.update(self._rules_by_keyword[keyword])
+        for priority in sorted(candidates):
+            if best is not None and priority > best:
+                break
+            required, optional = self._conditions[priority]
+            if required <= hits and (not optional or optional & hits):
+                best = priority
+                break
+        return best
+
+    def match(self, message_text):
+        """Ответ сработавшего правила или ответ по умолчанию."""
+        priority = self.match_rule(message_text)
+        if priority is None:
+            return self.default
+        return self.rules[priority]['response']
+
+    @staticmethod
+    def _normalize(text):
+        return text.lower().strip()
+
+
+@lru_cache(maxsize=None)
+def load_matcher(path):
+    """Читает таблицу правил из JSON и компилирует её один раз на путь."""
+    with open(path, encoding='utf-8') as f:
+        table = json.load(f)
+    return IntentMatcher(table['rules'], default=table.get('default'))
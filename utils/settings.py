@@ -0,0 +1,102 @@
+"""
+Настройки прогона в одном месте.
+
+Значения берутся из окружения и файла .env, но только при первом
+обращении: импорт модуля ничего не читает и не тянет python-dotenv,
+поэтому сбор `pytest -m unit` не платит за настройки API и браузера.
+Каждое обращение читает окружение заново, так что значения,
+выставленные фикстурами (API_STUB, кассеты), сразу видны всем.
+
+    from utils.settings import settings
+
+    settings.login, settings.base_url, settings.telegram_api_url
+
+Классы, у которых настройка — атрибут класса (BaseApi.BASE_URL),
+получают её через дескриптор setting('base_url').
+"""
+import os
+
+
+class _Env:
+    """Атрибут Settings, который читает переменную окружения."""
+
+    def __init__(self, name, default=None, cast=str):
+        self.name = name
+        self.default = default
+        self.cast = cast
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        value = instance.get(self.name)
+        if value is None or value == '':
+            return self.default
+        return self.cast(value)
+
+
+class Settings:
+
+    # --- Учётные данные и Telegram ---
+    login = _Env('LOGIN')
+    password = _Env('PASSWORD')
+    telegram_bot_token = _Env('TELEGRAM_BOT_TOKEN')
+    telegram_chat_id = _Env('TELEGRAM_CHAT_ID')
+
+    # --- API ---
+    base_url = _Env('API_BASE_URL', 'https://app.aifromspace.com')
+    login_endpoint = '/api/auth/login'
+    user_endpoint = '/api/user'
+    api_pool_size = _Env('API_POOL_SIZE', 10, int)
+    api_connect_timeout = _Env('API_CONNECT_TIMEOUT', 5.0, float)
+    api_read_timeout = _Env('API_READ_TIMEOUT', 30.0, float)
+    api_retries = _Env('API_RETRIES', 2, int)
+    telegram_api_base = _Env('TELEGRAM_API_BASE', 'https://api.telegram.org')
+
+    # --- UI ---
+    ui_base_url = _Env('UI_BASE_URL', 'https://app.aifromspace.com/')
+    ui_auth_storage_key = _Env('UI_AUTH_STORAGE_KEY', 'accessToken')
+    ui_auth_cookie_name = _Env('UI_AUTH_COOKIE_NAME')
+    ui_wait_poll = _Env('UI_WAIT_POLL', 0.1, float)
+    ui_wait_mode = _Env('UI_WAIT_MODE', 'js')
+    ui_action_mode = _Env('UI_ACTION_MODE', 'native')
+
+    def __init__(self, env_file=None):
+        self.env_file = env_file
+        self._loaded = False
+
+    def load(self):
+        """Подгружает .env в окружение (один раз, уже заданное не меняет)."""
+        if not self._loaded:
+            from dotenv import load_dotenv
+
+            load_dotenv(self.env_file)
+            self._loaded = True
+
+    def get(self, name, default=None):
+        """Любая переменная окружения с учётом .env."""
+        self.load()
+        return os.environ.get(name, default)
+
+    @property
+    def ui_dashboard_url(self):
+        return self.ui_base_url + 'dashboard'
+
+    @property
+    def telegram_api_url(self):
+        return f"{self.telegram_api_base}/bot{self.telegram_bot_token}"
+
+
+class setting:
+    """
+    Атрибут класса, который каждый раз берёт значение из settings.
+    Переопределяется как обычный атрибут (monkeypatch.setattr).
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        return getattr(settings, self.name)
+
+
+settings = Settings()
@@ -1,11 +1,126 @@
+import os
 import re
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool
+
+# Валидаторы работают за линейное время при любом входе: вместо одного
+# регулярного выражения с пересекающимися квантификаторами каждая проверка
+# делается отдельным однозначным шаблоном (один класс символов) или
+# методами str. Результаты совпадают с прежними шаблонами
+#   пароль: ^(?=.*[\d])(?=.*[A-Z])(?=.*[a-z])[\w]{8,}$
+#   email:  ^[\w.-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$
+_WORD_CHARS = re.compile(r'\w+')
+_DIGIT = re.compile(r'\d')
+_UPPER = re.compile(r'[A-Z]')
+_LOWER = re.compile(r'[a-z]')
+_LOCAL_PART_CHARS = re.compile(r'[\w.-]+')
+_DOMAIN_CHARS = re.compile(r'[a-zA-Z0-9.-]+')
+
+
+def _strip_final_newline(text):
+    # `$` в прежних шаблонах допускал один перевод строки в конце
+    return text[:-1] if text.endswith('\n') else text
 
 
 def is_password_strong(password):
-    pattern = r'^(?=.*[\d])(?=.*[A-Z])(?=.*[a-z])[\w]{8,}$'
-    return re.search(pattern, password) is not None
+    body = _strip_final_newline(password)
+    return (
+        len(body) >= 8
+        and _WORD_CHARS.fullmatch(body) is not None
+        and _DIGIT.search(body) is not None
+        and _UPPER.search(body) is not None
+        and _LOWER.search(body) is not None
+    )
 
 
 def is_email_valid(email):
-    pattern = r'^[\w.-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.search(pattern, email) is not None
+    local, at, domain = _strip_final_newline(email).partition('@')
+    if not at or not local or not domain:
+        return False
+    if _LOCAL_PART_CHARS.fullmatch(local) is None:
+        return False
+    if _DOMAIN_CHARS.fullmatch(domain) is None:
+        return False
+    # Зона верхнего уровня — всё после последней точки
+    host, dot, tld = domain.rpartition('.')
+    return bool(dot and host and len(tld) >= 2
+                and tld.isascii() and tld.isalpha())
+
+
+# --- Пакетная проверка ---
+
+def iter_rows(source):
+    """
+    Отдаёт строки по одной из итерируемого объекта, открытого файла
+    или пути к файлу. У строк из файла отрезается перевод строки.
+    """
+    if isinstance(source, str):
+        with open(source, encoding='utf-8') as f:
+            yield from iter_rows(f)
+        return
+    if hasattr(source, 'readline'):
+        for line in source:
+            yield line.rstrip('\r\n')
+        return
+    yield from source
+
+
+def validate_many(source, validator):
+    """Лениво отдаёт результат validator для каждой строки source."""
+    return map(validator, iter_rows(source))
+
+
+def count_valid(source, validator):
+    """Возвращает (сколько прошло проверку, сколько всего строк)."""
+    valid = total = 0
+    for result in validate_many(source, validator):
+        valid += result
+        total += 1
+    return valid, total
+
+
+def _count_chunk(args):
+    validator, rows = args
+    return sum(map(validator, rows)), len(rows)
+
+
+def _chunks(rows, validator, chunk_size):
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield validator, chunk
+
+
+def count_valid_parallel(source, validator, processes=None,
+                         chunk_size=50_000):
+    """
+    То же, что count_valid, но на нескольких процессах.
+    Имеет смысл для файлов в миллионы строк: в работе одновременно
+    не больше двух чанков по chunk_size строк на процесс.
+    validator должен быть функцией уровня модуля (передаётся через pickle).
+    """
+    processes = processes or os.cpu_count() or 1
+    valid = total = 0
+    in_flight = deque()
+    with Pool(processes) as pool:
+        for chunk in _chunks(iter_rows(source), validator, chunk_size):
+            in_flight.append(pool.apply_async(_count_chunk, (chunk,)))
+            if len(in_flight) >= 2 * processes:
+                chunk_valid, chunk_total = in_flight.popleft().get()
+                valid += chunk_valid
+                total += chunk_total
+        for result in in_flight:
+            chunk_valid, chunk_total = result.get()
+            valid += chunk_valid
+            total += chunk_total
+    return valid, total
+
+
+def percentile(sorted_values, q):
+    """Перцентиль по методу ближайшего ранга (q от 0 до 100)."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * q // 100))
+    return sorted_values[int(rank) - 1]